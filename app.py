@@ -1,7 +1,7 @@
 from flask import Flask, render_template, session, redirect, url_for, request, jsonify
-from config import SECRET_KEY, PERMANENT_SESSION_LIFETIME
-from database.models import create_table
+from config import SECRET_KEY, PERMANENT_SESSION_LIFETIME, DB_QUERY_AUDIT_ON_STARTUP, REQUEST_CACHE_DEBUG_HEADER
 from database.db import init_db
+from database.migrations import run_migrations
 from routes.user_routes import user_bp
 from routes.admin_routes import admin_bp
 from routes.auth_routes import auth_bp
@@ -12,6 +12,7 @@ from routes.contact_routes import contact_bp
 from routes.resume_builder_routes import resume_builder_bp
 import sys
 import io
+import os
 from datetime import timedelta
 
 if sys.platform == 'win32':
@@ -32,11 +33,22 @@ app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
 
 @app.before_request
 def before_request():
+    # Static assets are cached publicly: leave the session (and its cookie) alone
+    if request.endpoint == 'static':
+        return
     session.permanent = True
     app.permanent_session_lifetime = PERMANENT_SESSION_LIFETIME
 
 @app.after_request
 def add_header(response):
+    from services.http_cache import owns_cache_policy
+    if REQUEST_CACHE_DEBUG_HEADER:
+        from database.request_cache import debug_header_value
+        response.headers['X-Request-Cache'] = debug_header_value()
+    # Static files and conditional API responses carry their own policy
+    # (services.static_assets, services.http_cache)
+    if request.endpoint == 'static' or owns_cache_policy():
+        return response
     response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '-1'
@@ -44,38 +56,9 @@ def add_header(response):
 
 @app.context_processor
 def inject_user():
-    """Make current_user available in all templates."""
-    from database.db import get_db
-    user = None
-    if 'user_id' in session:
-        db = get_db()
-        user = db.execute(
-            'SELECT * FROM users WHERE id = ?', (session['user_id'],)
-        ).fetchone()
-    
-    # Create a simple user object for templates
-    class CurrentUser:
-        def __init__(self, user=None):
-            self.user = user
-        
-        @property
-        def is_authenticated(self):
-            return self.user is not None
-        
-        @property
-        def name(self):
-            return self.user['full_name'] if self.user else None
-        
-        @property
-        def email(self):
-            return self.user['email'] if self.user else None
-        
-        def __getattr__(self, name):
-            if self.user and name in self.user:
-                return self.user[name]
-            return None
-    
-    return {'current_user': CurrentUser(user)}
+    """Make current_user available in all templates (loaded only if a template reads it)."""
+    from services.current_user import get_current_user
+    return {'current_user': get_current_user()}
 
 # Register blueprints
 app.register_blueprint(user_bp)
@@ -103,8 +86,9 @@ def target_role_feature():
 def api_analyze_resume():
     """Analyze resume text in-page without file upload, save to DB, return JSON."""
     from database.db import get_db
-    from services.ats_scorer import get_ats_score
-    import re, json
+    from services.resume_cache import make_cache_key, get_cached_analysis, store_analysis
+    from services.resume_engine import ANALYZER_VERSION, analyze_quick_text
+    import json
     from datetime import datetime
 
     data = request.get_json(silent=True) or {}
@@ -114,90 +98,25 @@ def api_analyze_resume():
     if not resume_text and not role_text:
         return jsonify({'success': False, 'message': 'Please provide resume text or target role.'}), 400
 
-    SKILL_KEYWORDS = [
-        'python','java','javascript','typescript','react','angular','vue','node',
-        'sql','mysql','postgresql','mongodb','redis','aws','azure','gcp','docker',
-        'kubernetes','git','linux','machine learning','deep learning','tensorflow',
-        'pytorch','data analysis','excel','power bi','tableau','html','css',
-        'c++','c#','ruby','php','swift','kotlin','rust','go','scala',
-        'communication','leadership','project management','agile','scrum',
-        'problem solving','teamwork','analytical','critical thinking',
-    ]
-    text_lower = resume_text.lower() + ' ' + role_text.lower()
-    found_skills = [s for s in SKILL_KEYWORDS if s in text_lower]
-
-    has_experience = any(kw in text_lower for kw in
-                         ['work experience','professional experience','employment',
-                          'position','role','internship','job'])
-    education = ['degree'] if any(kw in text_lower for kw in
-                                  ['bachelor','master','phd','degree','university','college']) else []
-
-    ats_result = get_ats_score({
-        'skills': found_skills,
-        'has_experience': has_experience,
-        'education': education,
-        'text_length': len(resume_text),
-        'text': resume_text,
-    })
-
-    ats_score = int(ats_result.get('ats_score', 0))
-
-    # Score and feedback
-    word_count = len(resume_text.split()) if resume_text else 0
-    has_metrics = bool(re.search(r'\d+[%$]|\d+\s*(percent|million|billion|k\b)', resume_text, re.I))
-    has_action_verbs = any(v in text_lower for v in
-                           ['led','managed','built','designed','implemented','delivered',
-                            'improved','increased','reduced','created','developed'])
-
-    overall_score = min(100, max(10,
-        ats_score * 0.6 +
-        (20 if has_metrics else 0) +
-        (10 if has_action_verbs else 0) +
-        (10 if len(found_skills) >= 5 else len(found_skills) * 2)
-    ))
-
-    feedback = {
-        'ats_score': ats_score,
-        'overall_score': round(overall_score),
-        'word_count': word_count,
-        'skills_found': found_skills,
-        'skills_count': len(found_skills),
-        'has_metrics': has_metrics,
-        'has_action_verbs': has_action_verbs,
-        'has_experience': has_experience,
-        'education_found': len(education) > 0,
-        'target_role': role_text,
-        'recommendations': ats_result.get('recommendations', []),
-        'strengths': ats_result.get('strengths', []),
-        'blockers': ats_result.get('blockers', []),
-        'categories': ats_result.get('categories', {}),
-    }
+    # Identical text + role is served from the content-hash cache
+    cache_key = make_cache_key('quick', resume_text + '\x00' + role_text, ANALYZER_VERSION)
+    feedback = get_cached_analysis(cache_key)
+    if feedback is None:
+        feedback = analyze_quick_text(resume_text, role_text)
+        store_analysis(cache_key, feedback, ANALYZER_VERSION)
 
     # Save to DB
     try:
         db = get_db()
         now = datetime.utcnow().isoformat()
         user_id = session.get('user_id', 'anonymous')
-        db.execute(
-            '''CREATE TABLE IF NOT EXISTS quick_analyses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT,
-                resume_text TEXT,
-                target_role TEXT,
-                ats_score INTEGER,
-                overall_score INTEGER,
-                skills_found TEXT,
-                recommendations TEXT,
-                created_at TEXT NOT NULL
-            )'''
-        )
         db.execute(
             '''INSERT INTO quick_analyses
                (user_id, resume_text, target_role, ats_score, overall_score,
                 skills_found, recommendations, created_at)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-            (user_id, resume_text[:5000], role_text, ats_score,
-             round(overall_score), json.dumps(found_skills),
+            (user_id, resume_text[:5000], role_text, feedback['ats_score'],
+             feedback['overall_score'], json.dumps(feedback['skills_found']),
              json.dumps(feedback['recommendations']), now)
         )
         db.commit()
@@ -273,14 +192,42 @@ def server_error(error):
 from database.db import close_db
 app.teardown_appcontext(close_db)
 
-# Initialize database and models on startup
-with app.app_context():
-    init_db()
-    create_table()
-    print("✓ Application initialized successfully")
-    print("✓ Database connection established")
-    print("✓ All blueprints registered")
-    print("→ Ready to serve requests")
+def _serves_requests():
+    """False in the debug reloader's watcher process, which only restarts the server."""
+    # `python app.py` runs with the reloader: the first process watches files
+    # and re-runs this script in a child (WERKZEUG_RUN_MAIN=true) that serves
+    if __name__ == '__main__':
+        return os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    return True
+
+# Initialize database and models on startup.  Extraction and batch worker
+# processes use the spawn start method, which re-imports this module as
+# __mp_main__; they only run service functions and must not repeat any of it.
+if __name__ != '__mp_main__':
+    with app.app_context():
+        init_db()
+        run_migrations()
+        from services.analysis_jobs import init_job_worker
+        init_job_worker(app, start=_serves_requests())
+        from services.refresh_queue import init_refresh_queue
+        init_refresh_queue(app)
+        from services.static_assets import init_static_assets
+        init_static_assets(app)
+        from services.response_compression import init_response_compression
+        init_response_compression(app)
+        if DB_QUERY_AUDIT_ON_STARTUP:
+            from database.db import get_db
+            from database.query_audit import audit_query_plans
+            plan_failures = audit_query_plans(get_db())
+            if plan_failures:
+                raise RuntimeError(
+                    "Query plan audit failed: " + ", ".join(f['name'] for f in plan_failures)
+                )
+            print("✓ Query plan audit passed")
+        print("✓ Application initialized successfully")
+        print("✓ Database connection established")
+        print("✓ All blueprints registered")
+        print("→ Ready to serve requests")
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Regression benchmark for SkillsAnalyzer._analyze_skill_depth.
+
+Builds a ~50 KB resume with every core skill of the field scattered
+through it and times the depth analysis.  Exits non-zero when the median
+run exceeds the budget, so a return to per-skill ``.*`` regex scans
+(quadratic in resume length) shows up immediately.
+
+Usage:
+    python benchmarks/bench_skill_depth.py
+    python benchmarks/bench_skill_depth.py --field data_science --budget-ms 25
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.skills_experience_analyzer import SkillsAnalyzer  # noqa: E402
+
+TARGET_BYTES = 50 * 1024
+
+FILLER_LINES = [
+    'Collaborated with cross-functional partners on quarterly planning and reviews.',
+    'Mentored two junior engineers and ran weekly knowledge-sharing sessions.',
+    'Participated in on-call rotation and wrote postmortems for incidents.',
+    'Presented roadmap updates to stakeholders across three departments.',
+]
+
+
+def build_resume(analyzer: SkillsAnalyzer, target_bytes: int = TARGET_BYTES) -> str:
+    """Bullets that mention skills far from project verbs, padded to size."""
+    skills = sorted(analyzer.field_config.core_keywords)
+    lines = ['EXPERIENCE', 'Senior Engineer, Example Corp, 2018 - 2024']
+    i = 0
+    while sum(len(line) + 1 for line in lines) < target_bytes:
+        lines.append(FILLER_LINES[i % len(FILLER_LINES)])
+        if i % 7 == 0:
+            skill = skills[i % len(skills)]
+            lines.append(f'Worked daily with {skill} in a large team setting for 3 years.')
+        i += 1
+    # One real evidence hit at the very end
+    lines.append(f'Designed and built a platform on {skills[0]} serving 2M users.')
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--field', default='software_backend')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help='fail if the median run is slower than this')
+    args = parser.parse_args(argv)
+
+    analyzer = SkillsAnalyzer(args.field, 'mid')
+    text = build_resume(analyzer)
+    core_skills = set(analyzer.field_config.core_keywords)
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        score = analyzer._analyze_skill_depth(text, core_skills)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(timings)
+    print(f"resume: {len(text) / 1024:.1f} KB, {len(core_skills)} core skills, depth score {score}")
+    print(f"median {median:.2f} ms, max {max(timings):.2f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        print("FAIL: skill depth analysis is over budget")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
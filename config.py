@@ -17,6 +17,20 @@ ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'admin123')
 # Database
 DATABASE_PATH = os.environ.get('DATABASE_PATH', 'career_data.db')
 
+# Database connection pool (per worker process)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '10'))  # seconds to wait for a free connection
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', '10000'))
+DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', '16384'))
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', str(128 * 1024 * 1024)))
+# Refuse to boot if a hot query plan degrades to a full table scan
+DB_QUERY_AUDIT_ON_STARTUP = os.environ.get('DB_QUERY_AUDIT_ON_STARTUP', 'false').lower() == 'true'
+# Request-scoped memoization of read-only lookups (database.request_cache)
+REQUEST_CACHE_ENABLED = os.environ.get('REQUEST_CACHE_ENABLED', 'true').lower() == 'true'
+REQUEST_CACHE_DEBUG_HEADER = os.environ.get('REQUEST_CACHE_DEBUG_HEADER', 'false').lower() == 'true'
+# Process-local cache of slim user records behind templates' current_user (0 = off)
+CURRENT_USER_CACHE_TTL = float(os.environ.get('CURRENT_USER_CACHE_TTL', '30'))
+
 # API Keys
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
@@ -35,6 +49,42 @@ UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
 ALLOWED_RESUME_EXTENSIONS = {'pdf', 'docx', 'txt'}
 MAX_RESUME_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Static assets: content-hashed URLs served as immutable (services.static_assets)
+STATIC_FINGERPRINT = os.environ.get('STATIC_FINGERPRINT', 'true').lower() == 'true'
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', str(365 * 24 * 3600)))  # seconds
+STATIC_PRECOMPRESS = os.environ.get('STATIC_PRECOMPRESS', 'true').lower() == 'true'  # .gz/.br siblings
+
+# gzip for dynamic responses (services.response_compression); level 0 = off
+RESPONSE_COMPRESS_LEVEL = int(os.environ.get('RESPONSE_COMPRESS_LEVEL', '6'))
+RESPONSE_COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+RESUME_CACHE_SIZE = int(os.environ.get('RESUME_CACHE_SIZE', '256'))  # in-process LRU entries
+
+# Resume text extraction worker pool (0 workers = extract in the request thread)
+EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', '2'))
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', '15'))  # seconds per file
+EXTRACTION_MAX_TASKS_PER_CHILD = int(os.environ.get('EXTRACTION_MAX_TASKS_PER_CHILD', '50'))
+EXTRACTION_MEMORY_LIMIT_MB = int(os.environ.get('EXTRACTION_MEMORY_LIMIT_MB', '1024'))
+
+# Background resume analysis jobs (POST /resume/api/jobs)
+ANALYSIS_JOB_WORKERS = int(os.environ.get('ANALYSIS_JOB_WORKERS', '2'))  # threads per process
+ANALYSIS_JOB_POLL_INTERVAL = float(os.environ.get('ANALYSIS_JOB_POLL_INTERVAL', '1.0'))  # seconds
+ANALYSIS_JOB_STALE_AFTER = int(os.environ.get('ANALYSIS_JOB_STALE_AFTER', '600'))  # requeue running jobs older than this
+ANALYSIS_JOB_RETENTION_HOURS = int(os.environ.get('ANALYSIS_JOB_RETENTION_HOURS', '24'))
+ANALYSIS_JOB_DIR = os.environ.get('ANALYSIS_JOB_DIR', os.path.join(os.path.dirname(__file__), 'uploads', 'jobs'))
+
+# Bulk resume scoring (python -m services.batch_analyze, POST /api/resume/batch)
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', str(min(4, os.cpu_count() or 1))))
+BATCH_WRITE_CHUNK = int(os.environ.get('BATCH_WRITE_CHUNK', '100'))  # rows per transaction
+BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', '500'))  # per API request
+
+# Resume score history (services.score_history)
+SCORE_TREND_WINDOW = int(os.environ.get('SCORE_TREND_WINDOW', '5'))  # past scores averaged for the trend
+SCORE_HISTORY_MAX_POINTS = int(os.environ.get('SCORE_HISTORY_MAX_POINTS', '365'))  # per API response
+
+# Debounced profile refresh cascade (services.refresh_queue); 0 = refresh inline
+REFRESH_DEBOUNCE_SECONDS = float(os.environ.get('REFRESH_DEBOUNCE_SECONDS', '2.0'))
+REFRESH_MAX_DELAY_SECONDS = float(os.environ.get('REFRESH_MAX_DELAY_SECONDS', '10.0'))
+
 # Feature flags
 FEATURE_FLAGS = {
     'resume_upload': True,
@@ -1,34 +1,183 @@
 """Database connection and initialization."""
+import os
+import queue
 import sqlite3
+import threading
+import time
 from flask import g
-from config import DATABASE_PATH
+from config import (
+    DATABASE_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE_KB, DB_MMAP_SIZE,
+)
+from database.request_cache import TrackedConnection
 
 DATABASE = DATABASE_PATH
 
+
+def _connect():
+    """Open a new connection and apply the per-connection pragmas once."""
+    db = sqlite3.connect(
+        DATABASE,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,  # connections move between request threads
+        factory=TrackedConnection,  # writes evict request-cached reads
+    )
+    db.row_factory = sqlite3.Row
+    # WAL lets readers run alongside a single writer
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute(f'PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute(f'PRAGMA cache_size=-{int(DB_CACHE_SIZE_KB)}')  # negative = KiB
+    db.execute(f'PRAGMA mmap_size={int(DB_MMAP_SIZE)}')
+    return db
+
+
+class ConnectionPool:
+    """Bounded pool of pre-configured SQLite connections for one worker process."""
+
+    def __init__(self, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.max_size = max(1, int(max_size))
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def acquire(self):
+        """Check out a connection, opening a new one while under max_size."""
+        start = time.perf_counter()
+        try:
+            db = self._idle.get_nowait()
+        except queue.Empty:
+            db = None
+
+        if db is None:
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    db = _connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    db = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise sqlite3.OperationalError(
+                        f'Database pool exhausted ({self.max_size} connections busy)'
+                    )
+                with self._lock:
+                    self._waits += 1
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return db
+
+    def release(self, db):
+        """Return a connection, discarding any work the request did not commit."""
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if db.in_transaction:
+                db.rollback()
+        except sqlite3.Error:
+            self._discard(db)
+            return
+        self._idle.put(db)
+
+    def _discard(self, db):
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def close_all(self):
+        """Close every idle connection (used on shutdown / after fork)."""
+        while True:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(db)
+
+    def stats(self):
+        """Pool size, checkout counts and wait-time metrics."""
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                'max_size': self.max_size,
+                'open_connections': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'checkouts': checkouts,
+                'waited_checkouts': self._waits,
+                'timeouts': self._timeouts,
+                'wait_avg_ms': round(self._wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                'wait_max_ms': round(self._wait_max * 1000, 3),
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return this process's pool, rebuilding it after a fork (gunicorn --preload)."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                # Connections inherited from a parent process must not be reused
+                _pool = ConnectionPool()
+                _pool_pid = pid
+    return _pool
+
+
+def get_pool_stats():
+    """Metrics for the current worker's connection pool."""
+    stats = get_pool().stats()
+    stats['pid'] = os.getpid()
+    return stats
+
+
 def get_db():
     """Get database connection."""
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect(DATABASE)
-        db.row_factory = sqlite3.Row
-        # Enable WAL mode to prevent database locking issues
-        db.execute('PRAGMA journal_mode=WAL')
-        db.execute('PRAGMA timeout=10000')  # 10 second timeout for locks
+        db = g._database = get_pool().acquire()
     return db
 
 def init_db():
     """Initialize database connection."""
-    import os
     db_dir = os.path.dirname(DATABASE)
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
-    
+
     with sqlite3.connect(DATABASE) as db:
         db.row_factory = sqlite3.Row
         print(f"Database initialized at {DATABASE}")
 
 def close_db(e=None):
-    """Close database connection."""
-    db = getattr(g, '_database', None)
+    """Return the request's connection to the pool."""
+    db = g.pop('_database', None)
     if db is not None:
-        db.close()
\ No newline at end of file
+        get_pool().release(db)
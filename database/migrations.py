@@ -0,0 +1,269 @@
+"""Versioned schema migrations.
+
+Each step runs at most once per database and is recorded in the
+``schema_version`` table.  On a warm database ``run_migrations()`` is a
+single SELECT, so workers booting together skip all DDL and never contend
+for the write lock.
+
+To change the schema, append a new ``(version, name, function)`` entry to
+MIGRATIONS.  Never edit or reorder a step that has already shipped.
+"""
+import sqlite3
+import time
+from datetime import datetime
+from database.db import get_db
+
+
+def _baseline_schema(db):
+    """All tables, indexes, column patches and tier seeds from models.py."""
+    from database.models import create_table
+    create_table(commit=False)
+
+
+def _per_user_indexes(db):
+    """Indexes for the per-user dashboard tables.
+
+    Tables with ``user_id UNIQUE`` (resume_health, skill_gap_analysis,
+    confidence_index, user_stats, skill_progress) already get an automatic
+    index and need nothing here.  The composite indexes end in the sort
+    column so "latest row" reads (ORDER BY created_at DESC LIMIT 1) walk
+    the index backwards instead of sorting.
+    """
+    # quick_analyses used to be created lazily by the analyze endpoints
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS quick_analyses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT,
+            resume_text TEXT,
+            target_role TEXT,
+            ats_score INTEGER,
+            overall_score INTEGER,
+            skills_found TEXT,
+            recommendations TEXT,
+            created_at TEXT NOT NULL
+        )
+    ''')
+
+    indexes = [
+        'CREATE INDEX IF NOT EXISTS idx_quick_analyses_user_created ON quick_analyses(user_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_submissions_user_created ON submissions(user_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_activity_log_user_created ON activity_log(user_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_activity_log_created ON activity_log(created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_action_plans_user_status ON action_plans(user_id, status, order_num, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_user_interactions_user_ts ON user_interactions(user_id, timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_learning_paths_user_order ON learning_paths(user_id, learning_order)',
+        'CREATE INDEX IF NOT EXISTS idx_user_roadmap_user_order ON user_roadmap(user_id, order_num)',
+        'CREATE INDEX IF NOT EXISTS idx_user_insights_user_order ON user_insights(user_id, order_num)',
+        'CREATE INDEX IF NOT EXISTS idx_data_sync_log_user ON data_sync_log(user_id, last_sync)',
+    ]
+    for idx in indexes:
+        db.execute(idx)
+
+
+def _resume_cache_analysis(db):
+    """Store full, versioned analyses in resume_cache with hit counters."""
+    db.execute('ALTER TABLE resume_cache ADD COLUMN analysis_json TEXT')
+    db.execute('ALTER TABLE resume_cache ADD COLUMN analyzer_version TEXT')
+    db.execute('ALTER TABLE resume_cache ADD COLUMN hit_count INTEGER DEFAULT 0')
+    db.execute('ALTER TABLE resume_cache ADD COLUMN last_hit_at TEXT')
+
+
+def _analysis_jobs(db):
+    """Queue table for background resume analysis (services.analysis_jobs)."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_jobs (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            stage TEXT NOT NULL DEFAULT 'queued',
+            progress INTEGER NOT NULL DEFAULT 0,
+            file_name TEXT,
+            file_path TEXT,
+            result_json TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            updated_at TEXT NOT NULL,
+            finished_at TEXT
+        )
+    ''')
+    # Workers claim the oldest queued job; users list their own jobs
+    db.execute('CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status_created ON analysis_jobs(status, created_at)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_analysis_jobs_user_created ON analysis_jobs(user_id, created_at)')
+
+
+def _has_unique_user_index(db, table):
+    for index in db.execute(f'PRAGMA index_list({table})').fetchall():
+        if not index['unique'] or index['partial']:
+            continue
+        columns = [col['name'] for col in db.execute(f"PRAGMA index_info('{index['name']}')").fetchall()]
+        if columns == ['user_id']:
+            return True
+    return False
+
+
+def _satellite_upsert_keys(db):
+    """Unique user_id keys so analysis_pipeline can write with ON CONFLICT upserts.
+
+    Databases created before the columns were declared UNIQUE may hold
+    duplicate rows; the newest row per user is kept.  user_goals allows
+    many goals per user, so only the pipeline's career_development goal is
+    made unique (a partial index).
+    """
+    for table in ('resume_health', 'skill_gap_analysis', 'confidence_index'):
+        if _has_unique_user_index(db, table):
+            continue
+        db.execute(f'DELETE FROM {table} WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY user_id)')
+        db.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_user ON {table}(user_id)')
+
+    db.execute('''
+        DELETE FROM user_goals
+        WHERE category = 'career_development'
+          AND id NOT IN (SELECT MAX(id) FROM user_goals WHERE category = 'career_development' GROUP BY user_id)
+    ''')
+    db.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_user_goals_user_career
+        ON user_goals(user_id) WHERE category = 'career_development'
+    ''')
+
+
+def _resume_score_history(db):
+    """Append-only score series (services.score_history), seeded from resume_health."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS resume_score_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            overall INTEGER NOT NULL,
+            ats INTEGER,
+            keyword INTEGER,
+            formatting INTEGER,
+            content INTEGER,
+            source TEXT,
+            created_at INTEGER NOT NULL
+        )
+    ''')
+    # created_at is epoch seconds; series reads are range scans on this index
+    db.execute('CREATE INDEX IF NOT EXISTS idx_resume_score_history_user_created ON resume_score_history(user_id, created_at)')
+    # Percentile counts on either side of a score
+    db.execute('CREATE INDEX IF NOT EXISTS idx_resume_health_overall ON resume_health(overall_health)')
+    db.execute('''
+        INSERT INTO resume_score_history
+        (user_id, overall, ats, keyword, formatting, content, source, created_at)
+        SELECT user_id, overall_health, ats_score, keyword_score, formatting_score,
+               content_completeness, 'backfill',
+               CAST(strftime('%s', COALESCE(last_analyzed_at, updated_at, created_at)) AS INTEGER)
+        FROM resume_health
+        WHERE overall_health IS NOT NULL
+          AND COALESCE(last_analyzed_at, updated_at, created_at) IS NOT NULL
+    ''')
+
+
+def _data_sync_log_timings(db):
+    """Queue latency, run time and coalesced mark count per refresh (services.refresh_queue)."""
+    db.execute('ALTER TABLE data_sync_log ADD COLUMN queue_latency_ms INTEGER')
+    db.execute('ALTER TABLE data_sync_log ADD COLUMN duration_ms INTEGER')
+    db.execute('ALTER TABLE data_sync_log ADD COLUMN coalesced INTEGER DEFAULT 1')
+
+
+def _derived_state(db):
+    """Input fingerprints of each user's derived modules (services.derived_state)."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS derived_state (
+            user_id TEXT NOT NULL,
+            artifact TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (user_id, artifact)
+        )
+    ''')
+
+
+def _user_snapshot(db):
+    """Materialized /api/app-state payload per user (services.user_snapshot)."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS user_snapshot (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 1,
+            etag TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            stale INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+
+
+def _drop_anonymous_score_history(db):
+    """The shared 'anonymous' user has no history of its own (services.score_history)."""
+    db.execute("DELETE FROM resume_score_history WHERE user_id = 'anonymous'")
+
+
+# Ordered (version, name, step) tuples. Steps receive the open connection
+# and must not commit; the runner commits each batch atomically.
+MIGRATIONS = [
+    (1, 'baseline_schema', _baseline_schema),
+    (2, 'per_user_indexes', _per_user_indexes),
+    (3, 'resume_cache_analysis', _resume_cache_analysis),
+    (4, 'analysis_jobs', _analysis_jobs),
+    (5, 'satellite_upsert_keys', _satellite_upsert_keys),
+    (6, 'resume_score_history', _resume_score_history),
+    (7, 'data_sync_log_timings', _data_sync_log_timings),
+    (8, 'derived_state', _derived_state),
+    (9, 'user_snapshot', _user_snapshot),
+    (10, 'drop_anonymous_score_history', _drop_anonymous_score_history),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(db=None):
+    """Return the highest applied migration version (0 for a fresh database)."""
+    db = db or get_db()
+    try:
+        row = db.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0  # schema_version table does not exist yet
+    return row[0] or 0
+
+
+def run_migrations():
+    """Apply pending migrations; a no-op on an up-to-date database."""
+    db = get_db()
+    current = get_schema_version(db)
+    if current >= LATEST_VERSION:
+        print(f"Database schema up to date (v{current})")
+        return current
+
+    # Take the write lock up front so concurrent workers queue here and
+    # re-check the version instead of racing through the same DDL.
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        db.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL,
+                duration_ms INTEGER
+            )
+        ''')
+        current = get_schema_version(db)
+
+        for version, name, step in MIGRATIONS:
+            if version <= current:
+                continue
+            started = time.perf_counter()
+            step(db)
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            db.execute(
+                'INSERT INTO schema_version (version, name, applied_at, duration_ms) VALUES (?, ?, ?, ?)',
+                (version, name, datetime.utcnow().isoformat(), duration_ms)
+            )
+            print(f"Applied migration {version:03d}_{name} ({duration_ms} ms)")
+            current = version
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    print(f"Database schema migrated to v{current}")
+    return current
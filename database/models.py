@@ -2,8 +2,13 @@ from database.db import get_db
 import json
 from datetime import datetime
 
-def create_table():
-    """Create or migrate database tables."""
+def create_table(commit=True):
+    """Create or migrate database tables.
+
+    This is the baseline schema (migration 1 in database/migrations.py);
+    the migration runner calls it with commit=False so the DDL and the
+    schema_version row land in one transaction.
+    """
     db = get_db()
     
     # Main submissions table with enhanced schema
@@ -682,8 +687,9 @@ def create_table():
     except:
         pass
     
-    db.commit()
-    print("Database schema initialized")
+    if commit:
+        db.commit()
+        print("Database schema initialized")
 
 
 def insert_submission(user_id, name, email, interest, level, known_skills, 
@@ -0,0 +1,116 @@
+"""EXPLAIN QUERY PLAN audit for the hot per-user queries.
+
+Every query here runs on dashboard or API hot paths and must be answered
+from an index.  The audit fails when SQLite reports a full table scan.
+
+Usage:
+    python -m database.query_audit            # audit DATABASE_PATH
+    python -m database.query_audit path.db    # audit another database
+"""
+import sqlite3
+import sys
+
+# (name, sql, params) — params only need the right arity for EXPLAIN
+AUDITED_QUERIES = [
+    ('resume_health.by_user',
+     'SELECT * FROM resume_health WHERE user_id = ?', ('u',)),
+    ('skill_gap_analysis.by_user',
+     'SELECT * FROM skill_gap_analysis WHERE user_id = ?', ('u',)),
+    ('confidence_index.by_user',
+     'SELECT * FROM confidence_index WHERE user_id = ?', ('u',)),
+    ('user_stats.by_user',
+     'SELECT total_xp, tasks_completed, career_readiness, current_streak FROM user_stats WHERE user_id = ?', ('u',)),
+    ('skill_progress.by_user_skill',
+     'SELECT proficiency_level, tasks_completed, total_xp FROM skill_progress WHERE user_id = ? AND skill_name = ?', ('u', 's')),
+    ('activity_log.by_user_latest',
+     'SELECT * FROM activity_log WHERE user_id = ? ORDER BY created_at DESC LIMIT 1', ('u',)),
+    ('activity_log.heatmap',
+     'SELECT DATE(created_at), COUNT(*) FROM activity_log WHERE created_at >= ? GROUP BY DATE(created_at)', ('2000-01-01',)),
+    ('action_plans.pending',
+     "SELECT id, action_title FROM action_plans WHERE user_id = ? AND status = 'pending' ORDER BY order_num, created_at LIMIT 10", ('u',)),
+    ('action_plans.by_user',
+     'SELECT * FROM action_plans WHERE user_id = ? ORDER BY action_category, priority DESC, action_title', ('u',)),
+    ('user_interactions.last_active',
+     'SELECT timestamp FROM user_interactions WHERE user_id = ? ORDER BY timestamp DESC LIMIT 1', ('u',)),
+    ('user_interactions.recent_count',
+     "SELECT COUNT(*) FROM user_interactions WHERE user_id = ? AND timestamp > datetime('now', '-7 days')", ('u',)),
+    ('quick_analyses.latest',
+     'SELECT ats_score, overall_score, skills_found, recommendations FROM quick_analyses WHERE user_id = ? ORDER BY created_at DESC LIMIT 1', ('u',)),
+    ('analysis_jobs.next_queued',
+     "SELECT id FROM analysis_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1", ()),
+    ('learning_paths.by_user',
+     'SELECT * FROM learning_paths WHERE user_id = ? ORDER BY learning_order ASC', ('u',)),
+    ('submissions.by_user',
+     'SELECT * FROM submissions WHERE user_id = ? ORDER BY created_at DESC LIMIT 50', ('u',)),
+    ('user_roadmap.by_user',
+     'SELECT * FROM user_roadmap WHERE user_id = ? ORDER BY order_num', ('u',)),
+    ('user_insights.by_user',
+     'SELECT * FROM user_insights WHERE user_id = ? ORDER BY order_num', ('u',)),
+    ('resume_score_history.range',
+     'SELECT overall, created_at FROM resume_score_history WHERE user_id = ? AND created_at >= ? ORDER BY created_at DESC LIMIT 30', ('u', 0)),
+    ('user_snapshot.by_user',
+     'SELECT version, etag, payload, stale FROM user_snapshot WHERE user_id = ?', ('u',)),
+    ('user_profiles.version',
+     'SELECT updated_at FROM user_profiles WHERE user_id = ?', ('u',)),
+    ('action_plans.version',
+     'SELECT COUNT(*), MAX(id), MAX(updated_at), MAX(completed_date) FROM action_plans WHERE user_id = ?', ('u',)),
+    ('skill_progress.version',
+     'SELECT MAX(last_updated) FROM skill_progress WHERE user_id = ?', ('u',)),
+    ('resume_health.percentile',
+     "SELECT COUNT(*) FROM resume_health WHERE overall_health < ? AND user_id != ? AND user_id NOT LIKE ?",
+     (50, 'anonymous', 'batch:%')),
+]
+
+
+def _is_full_scan(detail):
+    """True for plan steps like 'SCAN action_plans' (no index, no rowid range)."""
+    # Every audited query filters on an indexed column, so any SCAN
+    # (even "SCAN t USING INDEX") means the planner missed the index.
+    detail = detail.upper()
+    return detail.startswith('SCAN ') and 'CONSTANT ROW' not in detail
+
+
+def audit_query_plans(db):
+    """Run EXPLAIN QUERY PLAN over AUDITED_QUERIES.
+
+    Returns a list of {'name', 'plan', 'problem'} dicts; empty means every
+    query is index-backed.
+    """
+    failures = []
+    for name, sql, params in AUDITED_QUERIES:
+        try:
+            rows = db.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+        except sqlite3.Error as e:
+            failures.append({'name': name, 'plan': [], 'problem': str(e)})
+            continue
+        plan = [row[3] for row in rows]
+        scans = [step for step in plan if _is_full_scan(step)]
+        if scans:
+            failures.append({'name': name, 'plan': plan, 'problem': 'full table scan: ' + '; '.join(scans)})
+    return failures
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        path = argv[0]
+    else:
+        from config import DATABASE_PATH
+        path = DATABASE_PATH
+
+    db = sqlite3.connect(path)
+    try:
+        failures = audit_query_plans(db)
+    finally:
+        db.close()
+
+    for failure in failures:
+        print(f"FAIL {failure['name']}: {failure['problem']}")
+        for step in failure['plan']:
+            print(f"    {step}")
+    print(f"{len(AUDITED_QUERIES) - len(failures)}/{len(AUDITED_QUERIES)} queries index-backed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Request-scoped memoization for read-only service lookups.
+
+One dashboard render used to run ``SELECT ... FROM users WHERE id = ?``
+four times (inject_user, get_user_by_id, get_user_tier, get_usage_context).
+Functions decorated with ``@request_cached('users')`` now hit the database
+once per distinct argument tuple per request; results live on flask.g and
+die with the request (or app context, for background work).
+
+Writes invalidate automatically: connections from database.db are
+TrackedConnection instances, and every INSERT/UPDATE/DELETE/REPLACE run
+through ``db.execute``/``executemany`` drops the cached entries that
+depend on that table; a rollback drops everything.  Writes through a bare
+cursor (``db.cursor().execute``) are not seen, so do not write through
+one in a request that also reads cached functions.
+
+Cached values are shared between callers in the request: treat them as
+read-only.  Outside an app context the decorator is a no-op.
+"""
+
+import re
+import sqlite3
+from functools import wraps
+
+from flask import g
+
+from config import REQUEST_CACHE_ENABLED
+
+_WRITE_RE = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)'
+    r'\s+["`\[]?(\w+)',
+    re.IGNORECASE,
+)
+
+
+def _state(create=False):
+    try:
+        state = getattr(g, '_request_cache', None)
+        if state is None and create:
+            state = g._request_cache = {'entries': {}, 'hits': 0, 'misses': 0, 'invalidations': 0}
+        return state
+    except RuntimeError:  # no app context
+        return None
+
+
+def request_cached(*tables):
+    """
+    Memoize a read-only function for the rest of the request.
+
+    ``tables`` lists the tables the function reads; a write to any of them
+    in the same request evicts its entries.  Arguments must be hashable
+    (unhashable calls simply bypass the cache).
+    """
+    dependencies = frozenset(table.lower() for table in tables)
+
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REQUEST_CACHE_ENABLED:
+                return func(*args, **kwargs)
+            state = _state(create=True)
+            if state is None:
+                return func(*args, **kwargs)
+            try:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                entry = state['entries'].get(key)
+            except TypeError:
+                return func(*args, **kwargs)
+            if entry is not None:
+                state['hits'] += 1
+                return entry[1]
+            state['misses'] += 1
+            value = func(*args, **kwargs)
+            state['entries'][key] = (dependencies, value)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
+
+
+def invalidate(table=None):
+    """Drop cached entries that read ``table`` (every entry when None)."""
+    state = _state()
+    if not state or not state['entries']:
+        return
+    entries = state['entries']
+    if table is None:
+        dropped = list(entries)
+    else:
+        table = table.lower()
+        dropped = [key for key, (deps, _) in entries.items() if table in deps]
+    for key in dropped:
+        del entries[key]
+    state['invalidations'] += len(dropped)
+
+
+def note_statement(sql):
+    """Invalidate for ``sql`` if it writes a table."""
+    match = _WRITE_RE.match(sql)
+    if match:
+        invalidate(match.group(1))
+
+
+def get_request_cache_stats():
+    """Hit/miss counts for the current request."""
+    state = _state() or {'entries': {}, 'hits': 0, 'misses': 0, 'invalidations': 0}
+    return {
+        'hits': state['hits'],
+        'misses': state['misses'],
+        'invalidations': state['invalidations'],
+        'entries': len(state['entries']),
+    }
+
+
+def debug_header_value():
+    stats = get_request_cache_stats()
+    return 'hits={hits}; misses={misses}; invalidations={invalidations}'.format(**stats)
+
+
+class TrackedConnection(sqlite3.Connection):
+    """sqlite3 connection that reports writes to the request cache."""
+
+    def execute(self, sql, *args):
+        note_statement(sql)
+        return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        note_statement(sql)
+        return super().executemany(sql, *args)
+
+    def rollback(self):
+        invalidate()
+        return super().rollback()
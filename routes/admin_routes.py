@@ -1,5 +1,11 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session
+from flask import Blueprint, render_template, request, redirect, url_for, session, jsonify
+from database.db import get_pool_stats
 from database.models import fetch_all_logs, get_database_stats
+from services.resume_cache import get_cache_stats
+from services.extraction_pool import get_extraction_stats
+from services.analysis_jobs import get_job_stats
+from services.refresh_queue import get_refresh_stats
+from services.response_compression import get_compression_stats
 from services.analytics import get_dashboard_analytics
 from config import ADMIN_USERNAME, ADMIN_PASSWORD
 import traceback
@@ -73,6 +79,24 @@ def dashboard():
         )
 
 
+# =========================
+# Runtime Metrics
+# =========================
+@admin_bp.route("/api/metrics", methods=["GET"])
+def metrics():
+    if session.get("admin") is not True:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return jsonify({
+        "db_pool": get_pool_stats(),
+        "resume_cache": get_cache_stats(),
+        "extraction": get_extraction_stats(),
+        "analysis_jobs": get_job_stats(),
+        "refresh_queue": get_refresh_stats(),
+        "response_compression": get_compression_stats(),
+    })
+
+
 # =========================
 # Admin Logout
 # =========================
@@ -1,6 +1,10 @@
 from flask import Blueprint, render_template, session, redirect, request, jsonify
 import json
 from datetime import datetime
+from services.http_cache import (
+    conditional, profile_validator, roadmap_validator, insights_validator, actions_validator,
+    skip_cache_policy,
+)
 
 career_ai_bp = Blueprint('career_ai', __name__)
 
@@ -19,12 +23,8 @@ def login_required(f):
 def _get_current_user():
     """Get current user data for templates."""
     try:
-        from database.db import get_db
-        db = get_db()
-        user = db.execute(
-            "SELECT id, full_name, email FROM users WHERE id = ?",
-            (session.get('user_id'),)
-        ).fetchone()
+        from services.current_user import load_slim_user
+        user = load_slim_user(session.get('user_id'))
         return dict(user) if user else {'full_name': 'Profile', 'email': ''}
     except Exception:
         return {'full_name': 'Profile', 'email': ''}
@@ -244,6 +244,7 @@ def get_user_profile_api():
 
 @career_ai_bp.route('/api/insights', methods=['GET'])
 @login_required
+@conditional(insights_validator)
 def get_insights():
     """
     Generate personalized career insights based on user progress.
@@ -277,6 +278,7 @@ def get_insights():
 
 @career_ai_bp.route('/api/roadmap', methods=['GET'])
 @login_required
+@conditional(roadmap_validator)
 def get_roadmap():
     """Get personalized learning roadmap from user's profile data."""
     from services.profile_service import get_user_profile
@@ -299,7 +301,8 @@ def get_roadmap():
         import traceback
         print(f"ERROR in /api/roadmap: {str(e)}")
         print(traceback.format_exc())
-        # Fallback: still return guidance instead of breaking
+        # Fallback: still return guidance instead of breaking (never cached)
+        skip_cache_policy()
         return jsonify({'success': True, 'roadmap': [
             {'title': 'Complete Your Profile', 'description': 'Set up your skills, interests, and goals to generate a personalized roadmap.', 'duration': '5 minutes', 'xp': 50},
         ]}), 200
@@ -309,14 +312,14 @@ def get_roadmap():
 @login_required
 def refresh_roadmap():
     """Recalculate roadmap and all dependent data."""
-    from services.data_sync import refresh_user_data
+    from services.refresh_queue import refresh_now
     
     try:
         user_id = session.get('user_id')
         print(f"DEBUG: /api/roadmap/refresh triggered for user {user_id}")
         
-        # Trigger full sync across all modules
-        profile = refresh_user_data(user_id)
+        # Trigger full sync across all modules (absorbs any queued refresh)
+        profile = refresh_now(user_id)
         
         return jsonify({
             'success': True,
@@ -331,6 +334,7 @@ def refresh_roadmap():
 
 @career_ai_bp.route('/api/actions', methods=['GET'])
 @login_required
+@conditional(actions_validator)
 def get_actions():
     """
     Get personalized action items for the user.
@@ -408,7 +412,8 @@ def get_actions():
         import traceback
         print(f"ERROR in /api/actions: {str(e)}")
         print(traceback.format_exc())
-        # Return empty actions instead of breaking
+        # Return empty actions instead of breaking (never cached)
+        skip_cache_policy()
         return jsonify({'success': True, 'actions': []}), 200
 
 
@@ -445,6 +450,7 @@ def complete_action(action_id):
 
 @career_ai_bp.route('/api/projects', methods=['GET'])
 @login_required
+@conditional(profile_validator)
 def get_projects():
     """Get AI-recommended projects based on user's skills and level."""
     try:
@@ -643,6 +649,7 @@ def get_tasks():
 
 @career_ai_bp.route('/api/journey', methods=['GET'])
 @login_required
+@conditional(profile_validator)
 def get_journey():
     """Get phase-specific journey and milestones."""
     try:
@@ -746,36 +753,31 @@ def get_stats():
 @career_ai_bp.route('/api/app-state', methods=['GET'])
 @login_required
 def get_app_state():
-    """Get complete app state for client initialization. Uses unified profile_service."""
-    from services.profile_service import get_user_profile
-    from services.roadmap_service import generate_roadmap
+    """
+    Get complete app state for client initialization.
+
+    Served from the materialized user_snapshot row (services.user_snapshot)
+    with a strong ETag; a matching If-None-Match gets 304 Not Modified.
+    """
+    from flask import Response
+    from database.db import get_db
+    from services.http_cache import apply_cache_policy, is_not_modified
+    from services.user_snapshot import get_snapshot
     
     try:
         user_id = session.get('user_id')
+        snapshot = get_snapshot(get_db(), user_id)
         
-        # Use single source of truth
-        profile = get_user_profile(user_id)
-        
-        # Generate roadmap from profile
-        try:
-            roadmap = generate_roadmap(profile['profile'], profile['stats'])
-        except Exception:
-            roadmap = []
-        
-        appState = {
-            'user': profile['user'],
-            'profile': profile['profile'],
-            'stats': profile['stats'],
-            'skills': profile['skills'],
-            'roadmap': {
-                'items': roadmap,
-            },
-        }
-        
-        return jsonify({
-            'success': True,
-            'appState': appState,
-        }), 200
+        if is_not_modified(snapshot['etag']):
+            response = Response(status=304)
+        else:
+            # The stored payload is already JSON; splice it in rather than re-encoding
+            response = Response(
+                '{"success":true,"version":%d,"appState":%s}' % (snapshot['version'], snapshot['payload']),
+                status=200,
+                mimetype='application/json',
+            )
+        return apply_cache_policy(response, snapshot['etag'])
         
     except Exception as e:
         print(f"Error getting app state: {str(e)}")
@@ -884,6 +886,8 @@ def complete_task():
             except Exception as e:
                 print(f"Warning: skill sync failed: {e}")
         
+        from services.user_snapshot import invalidate
+        invalidate(db, user_id)
         db.commit()
         
         # Get updated stats to return
@@ -960,6 +964,40 @@ def get_user_stats():
         }), 200
 
 
+def _validate_resume_upload():
+    """Return (file, None) for a valid 'resume' upload, else (None, error response)."""
+    import os
+
+    if 'resume' not in request.files:
+        return None, (jsonify({'success': False, 'error': 'No file uploaded. Please select a resume file.'}), 400)
+    
+    file = request.files['resume']
+    if not file or file.filename == '':
+        return None, (jsonify({'success': False, 'error': 'Please select a file to upload.'}), 400)
+    
+    # Validate file extension
+    allowed_extensions = {'pdf', 'docx', 'txt'}
+    file_ext = os.path.splitext(file.filename)[1].lower().strip('.')
+    
+    if file_ext not in allowed_extensions:
+        return None, (jsonify({
+            'success': False,
+            'error': f'File type ".{file_ext}" not supported. Use PDF, DOCX, or TXT.'
+        }), 400)
+    
+    # Validate file size
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    file.seek(0)
+    
+    if file_size == 0:
+        return None, (jsonify({'success': False, 'error': 'File is empty. Please check and try again.'}), 400)
+    if file_size > 5 * 1024 * 1024:
+        return None, (jsonify({'success': False, 'error': f'File too large ({file_size/1024/1024:.1f}MB). Max is 5MB.'}), 400)
+    
+    return file, None
+
+
 @career_ai_bp.route('/resume/api/extract', methods=['POST'])
 def extract_resume():
     """
@@ -969,159 +1007,55 @@ def extract_resume():
     import os
     import tempfile
     from werkzeug.utils import secure_filename
-    from services.resume_analysis_enhanced import ResumeAnalyzer, ResumeTextExtractor
-    from services.resume_detailed_analyzer import DetailedResumeAnalyzer
-    from services.profile_service import update_user_profile
+    from services.extraction_pool import extract_text, is_partial
+    from services.resume_engine import (
+        ANALYZER_VERSION, analyze_resume_text, mark_truncated, save_resume_analysis,
+    )
+    from services.resume_cache import make_cache_key, get_cached_analysis, store_analysis
     
     try:
-        # File validation
-        if 'resume' not in request.files:
-            return jsonify({'success': False, 'error': 'No file uploaded. Please select a resume file.'}), 400
-        
-        file = request.files['resume']
-        if not file or file.filename == '':
-            return jsonify({'success': False, 'error': 'Please select a file to upload.'}), 400
-        
-        # Validate file extension
-        allowed_extensions = {'pdf', 'docx', 'txt'}
-        file_ext = os.path.splitext(file.filename)[1].lower().strip('.')
-        
-        if file_ext not in allowed_extensions:
-            return jsonify({
-                'success': False,
-                'error': f'File type ".{file_ext}" not supported. Use PDF, DOCX, or TXT.'
-            }), 400
+        file, error_response = _validate_resume_upload()
+        if error_response:
+            return error_response
         
-        # Validate file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
+        user_id = session.get('user_id', 'anonymous')
         
-        if file_size == 0:
-            return jsonify({'success': False, 'error': 'File is empty. Please check and try again.'}), 400
-        if file_size > 5 * 1024 * 1024:
-            return jsonify({'success': False, 'error': f'File too large ({file_size/1024/1024:.1f}MB). Max is 5MB.'}), 400
+        # Byte-identical re-uploads skip extraction and scoring entirely
+        file_bytes = file.read()
+        cache_key = make_cache_key('extract', file_bytes, ANALYZER_VERSION)
+        analysis = get_cached_analysis(cache_key)
+        if analysis is not None:
+            save_resume_analysis(user_id, analysis)
+            return jsonify(analysis['response']), 200
         
         # Save file temporarily
         temp_dir = tempfile.gettempdir()
         filename = secure_filename(file.filename)
         timestamp = __import__('datetime').datetime.utcnow().strftime('%Y%m%d_%H%M%S_')
-        user_id = session.get('user_id', 'anonymous')
         temp_filename = f"{user_id}_{timestamp}{filename}"
         temp_path = os.path.join(temp_dir, temp_filename)
-        file.save(temp_path)
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(file_bytes)
         
         try:
-            # Extract text from file
-            text, extract_warnings = ResumeTextExtractor.extract_from_file(temp_path)
+            # Extract text in the worker pool (bounded time and memory)
+            text, extract_warnings = extract_text(temp_path)
             if not text:
                 return jsonify({
                     'success': False,
                     'error': 'Could not extract text from file. Try a different format.'
                 }), 400
             
-            # Run comprehensive analysis
-            detailed_analysis = DetailedResumeAnalyzer.analyze_resume_detailed(text)
-            
-            # Run basic analysis for ATS scores
-            basic_analysis = ResumeAnalyzer.analyze_resume(temp_path, user_id=user_id)
-            
-            # Build enhanced response
-            response_data = {
-                'success': True,
-                
-                # Basic scores (for template compatibility)
-                'ats_score': detailed_analysis['scores']['overall'],
-                'quality_score': detailed_analysis['scores']['content_quality'],
-                'overall_score': detailed_analysis['scores']['overall'],
-                
-                # Section-wise analysis
-                'sections': {
-                    'education': {
-                        'status': detailed_analysis['sections']['education']['status'],
-                        'explanation': detailed_analysis['sections']['education']['explanation'],
-                        'tips': detailed_analysis['sections']['education']['tips'],
-                        'score': detailed_analysis['sections']['education']['score']
-                    },
-                    'skills': {
-                        'status': detailed_analysis['sections']['skills']['status'],
-                        'count': detailed_analysis['sections']['skills']['count'],
-                        'list': detailed_analysis['sections']['skills']['skills'],
-                        'explanation': detailed_analysis['sections']['skills']['explanation'],
-                        'tips': detailed_analysis['sections']['skills']['tips'],
-                        'score': detailed_analysis['sections']['skills']['score']
-                    },
-                    'experience': {
-                        'status': detailed_analysis['sections']['experience']['status'],
-                        'count': detailed_analysis['sections']['experience']['count'],
-                        'has_dates': detailed_analysis['sections']['experience']['has_dates'],
-                        'has_metrics': detailed_analysis['sections']['experience']['has_metrics'],
-                        'explanation': detailed_analysis['sections']['experience']['explanation'],
-                        'tips': detailed_analysis['sections']['experience']['tips'],
-                        'score': detailed_analysis['sections']['experience']['score']
-                    },
-                    'projects': {
-                        'status': detailed_analysis['sections']['projects']['status'],
-                        'count': detailed_analysis['sections']['projects']['count'],
-                        'explanation': detailed_analysis['sections']['projects']['explanation'],
-                        'tips': detailed_analysis['sections']['projects']['tips'],
-                        'score': detailed_analysis['sections']['projects']['score']
-                    },
-                    'achievements': {
-                        'status': detailed_analysis['sections']['achievements']['status'],
-                        'count': detailed_analysis['sections']['achievements']['count'],
-                        'has_metrics': detailed_analysis['sections']['achievements']['has_metrics'],
-                        'explanation': detailed_analysis['sections']['achievements']['explanation'],
-                        'tips': detailed_analysis['sections']['achievements']['tips'],
-                        'score': detailed_analysis['sections']['achievements']['score']
-                    }
-                },
-                
-                # Category scores breakdown
-                'scores': {
-                    'format': detailed_analysis['scores']['format'],
-                    'keywords': detailed_analysis['scores']['keywords'],
-                    'completeness': detailed_analysis['scores']['completeness'],
-                    'content_quality': detailed_analysis['scores']['content_quality'],
-                    'overall': detailed_analysis['scores']['overall']
-                },
-                
-                # Insights (gaps, strengths, role-based)
-                'insights': detailed_analysis['insights'],
-                
-                # Evolution recommendations
-                'evolution': detailed_analysis['evolution'],
-                
-                # Professional level and readiness
-                'professional_level': detailed_analysis['professional_level'],
-                'readiness_for_role': detailed_analysis.get('readiness_for_role'),
-                
-                # Skills for UI display
-                'skills': detailed_analysis['sections']['skills']['skills'][:15],
-                'has_experience': detailed_analysis['sections']['experience']['present'],
-                'education': detailed_analysis['sections']['education']['degrees'],
-                
-                # Personalized suggestions
-                'suggestions': detailed_analysis['suggestions'],
-                'ats_strengths': [insight['message'] for insight in detailed_analysis['insights'] if insight.get('type') == 'strength'][:3]
-            }
-            
-            # Save to profile if user is logged in
-            if user_id and user_id != 'anonymous':
-                try:
-                    update_user_profile(user_id, {
-                        'resume_data': {
-                            'ats_score': response_data['ats_score'],
-                            'quality_score': response_data['quality_score'],
-                            'skills': response_data['skills'],
-                            'professional_level': response_data['professional_level'],
-                            'last_analyzed': __import__('datetime').datetime.utcnow().isoformat()
-                        }
-                    })
-                except Exception as sync_err:
-                    print(f"Warning: Could not sync resume data: {sync_err}")
+            # Score the extracted text once; every scorer shares one document
+            analysis = analyze_resume_text(text, warnings=extract_warnings)
+            if is_partial(extract_warnings):
+                # Never cache a truncated analysis under the whole file's hash
+                analysis = mark_truncated(analysis, extract_warnings)
+            else:
+                store_analysis(cache_key, analysis, ANALYZER_VERSION)
+            save_resume_analysis(user_id, analysis)
             
-            return jsonify(response_data), 200
+            return jsonify(analysis['response']), 200
             
         finally:
             # Clean up
@@ -1140,11 +1074,145 @@ def extract_resume():
         }), 500
 
 
+@career_ai_bp.route('/resume/api/jobs', methods=['POST'])
+def submit_resume_job():
+    """
+    Queue a resume for background analysis and return immediately.
+    Poll /resume/api/jobs/<job_id> or follow /resume/api/jobs/<job_id>/stream.
+    """
+    from werkzeug.utils import secure_filename
+    from services.analysis_jobs import submit_job
+    
+    try:
+        file, error_response = _validate_resume_upload()
+        if error_response:
+            return error_response
+        
+        user_id = session.get('user_id', 'anonymous')
+        job_id = submit_job(user_id, file.read(), secure_filename(file.filename))
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/resume/api/jobs/{job_id}',
+            'stream_url': f'/resume/api/jobs/{job_id}/stream',
+        }), 202
+    
+    except Exception as e:
+        print(f"Error in /resume/api/jobs: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Could not queue resume for analysis. Please try again.'
+        }), 500
+
+
+@career_ai_bp.route('/resume/api/jobs/<job_id>', methods=['GET'])
+def get_resume_job(job_id):
+    """Stage, progress and (once done) the /resume/api/extract payload."""
+    from services.analysis_jobs import get_job
+    
+    try:
+        job = get_job(job_id, session.get('user_id', 'anonymous'))
+        if job is None:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'job': job}), 200
+    
+    except Exception as e:
+        print(f"Error getting analysis job {job_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Could not load job status'}), 500
+
+
+@career_ai_bp.route('/resume/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_resume_job(job_id):
+    """Server-sent events: one 'progress' event per stage, then 'done' or 'failed'."""
+    from flask import Response
+    from services.analysis_jobs import get_job, iter_job_events
+    
+    user_id = session.get('user_id', 'anonymous')
+    if get_job(job_id, user_id) is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    def generate():
+        for job in iter_job_events(job_id, user_id):
+            if job is None:
+                yield ': keepalive\n\n'
+                continue
+            event = job['status'] if job['status'] in ('done', 'failed') else 'progress'
+            yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'X-Accel-Buffering': 'no',  # let nginx flush each event
+    })
+
+
+@career_ai_bp.route('/api/resume/batch', methods=['POST'])
+def batch_analyze_resumes():
+    """
+    Score many resumes in one request (career-center imports, admin only).
+    Multipart 'resumes' files, optional 'user_map' JSON (file name -> user id)
+    and 'target_role'.  Streams one NDJSON line per file, then a summary.
+    """
+    import os
+    import shutil
+    import tempfile
+    from flask import Response, stream_with_context
+    from werkzeug.utils import secure_filename
+    from config import ALLOWED_RESUME_EXTENSIONS, BATCH_MAX_FILES
+    from services.batch_analyze import iter_batch
+    
+    if session.get('admin') is not True:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    
+    files = [f for f in request.files.getlist('resumes') if f and f.filename]
+    if not files:
+        return jsonify({'success': False, 'error': 'No files uploaded.'}), 400
+    if len(files) > BATCH_MAX_FILES:
+        return jsonify({'success': False, 'error': f'Too many files ({len(files)}). Max is {BATCH_MAX_FILES}.'}), 400
+    
+    try:
+        user_map = json.loads(request.form.get('user_map') or '{}')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'user_map must be a JSON object.'}), 400
+    if not isinstance(user_map, dict):
+        return jsonify({'success': False, 'error': 'user_map must be a JSON object.'}), 400
+    target_role = (request.form.get('target_role') or '').strip()
+    
+    batch_dir = tempfile.mkdtemp(prefix='resume_batch_')
+    paths = []
+    for file in files:
+        name = secure_filename(file.filename)
+        ext = os.path.splitext(name)[1].lower().strip('.')
+        if ext not in ALLOWED_RESUME_EXTENSIONS:
+            continue
+        path = os.path.join(batch_dir, name)
+        if os.path.exists(path):
+            path = os.path.join(batch_dir, f"{len(paths)}_{name}")
+        file.save(path)
+        paths.append(path)
+    
+    if not paths:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        return jsonify({'success': False, 'error': 'No PDF, DOCX, or TXT files in upload.'}), 400
+    
+    def generate():
+        try:
+            for item in iter_batch(paths, user_map=user_map, target_role=target_role):
+                yield json.dumps(item) + '\n'
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'X-Accel-Buffering': 'no',
+    })
+
+
 def extract_skills_from_resume(file_path):
     """Extract detected skills from resume file."""
     try:
         from services.resume_parser_saas import parse_resume_text
         from services.resume_analysis_enhanced import ResumeTextExtractor
+        from services.skill_matcher import match_skills
         
         # Extract text using the same method as analyzer
         text, _ = ResumeTextExtractor.extract_from_file(file_path)
@@ -1156,15 +1224,8 @@ def extract_skills_from_resume(file_path):
             parsed = parse_resume_text(text)
             return parsed.get('skills', [])
         except:
-            # Fallback: look for common skill keywords
-            common_skills = [
-                'python', 'javascript', 'java', 'c++', 'sql', 'react', 'node',
-                'html', 'css', 'git', 'aws', 'docker', 'kubernetes', 'api',
-                'database', 'linux', 'typescript', 'golang', 'rust', 'mongodb'
-            ]
-            text_lower = text.lower()
-            found_skills = [skill for skill in common_skills if skill in text_lower]
-            return found_skills[:10]  # Return top 10
+            # Fallback: any lexicon skill, in order of appearance
+            return match_skills(text)[:10]  # Return top 10
     except:
         return []
 
@@ -38,7 +38,20 @@ def _get_user_resume_snapshot(db, user_id):
 
 
 def _get_resume_history(db, user_id, limit=10):
-    """Return a user's resume submission history (score over time)."""
+    """Return a user's resume score history (score over time), oldest first."""
+    from services.score_history import get_history
+    points = get_history(db, user_id, limit=limit)
+    if points:
+        return [
+            {
+                "readiness_score": p["overall"],
+                "confidence_score": None,
+                "created_at": datetime.utcfromtimestamp(p["created_at"]).isoformat(),
+            }
+            for p in points
+        ]
+
+    # Users analysed before resume_score_history existed
     rows = db.execute(
         """
         SELECT id, name, readiness_score, confidence_score, created_at
@@ -85,20 +98,6 @@ def _get_resume_health(db, user_id):
 def _get_quick_analysis(db, user_id):
     """Return most recent quick (text-paste) analysis."""
     try:
-        # Ensure the table exists (created lazily by the analyze endpoint)
-        db.execute(
-            """CREATE TABLE IF NOT EXISTS quick_analyses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT,
-                resume_text TEXT,
-                target_role TEXT,
-                ats_score INTEGER,
-                overall_score INTEGER,
-                skills_found TEXT,
-                recommendations TEXT,
-                created_at TEXT NOT NULL
-            )"""
-        )
         row = db.execute(
             """
             SELECT ats_score, overall_score, skills_found, recommendations,
@@ -567,3 +566,63 @@ def api_user_snapshot():
             if r.get("readiness_score") is not None
         ],
     })
+
+
+def _bounded_int(name, default, low, high):
+    try:
+        value = int(request.args.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(low, min(value, high))
+
+
+@features_bp.route("/api/score-history")
+def api_score_history():
+    """Raw score series: ?days=90&limit=100."""
+    from services.score_history import get_history
+    from config import SCORE_HISTORY_MAX_POINTS
+
+    uid = _uid()
+    if not uid:
+        return jsonify({"authenticated": False}), 401
+
+    days = _bounded_int("days", 90, 1, 3650)
+    limit = _bounded_int("limit", 100, 1, SCORE_HISTORY_MAX_POINTS)
+    since = int(datetime.utcnow().timestamp()) - days * 86400
+    return jsonify({"points": get_history(get_db(), uid, since=since, limit=limit)})
+
+
+@features_bp.route("/api/score-trend")
+def api_score_trend():
+    """Score change over the last ?days=30."""
+    from services.score_history import get_trend
+
+    uid = _uid()
+    if not uid:
+        return jsonify({"authenticated": False}), 401
+    return jsonify(get_trend(get_db(), uid, days=_bounded_int("days", 30, 1, 3650)))
+
+
+@features_bp.route("/api/score-sparkline")
+def api_score_sparkline():
+    """Last ?points=20 scores for inline charts."""
+    from services.score_history import get_sparkline
+
+    uid = _uid()
+    if not uid:
+        return jsonify({"authenticated": False}), 401
+    return jsonify(get_sparkline(get_db(), uid, points=_bounded_int("points", 20, 2, 100)))
+
+
+@features_bp.route("/api/score-percentile")
+def api_score_percentile():
+    """Where the user's current overall health sits among all users."""
+    from services.score_history import get_percentile
+
+    uid = _uid()
+    if not uid:
+        return jsonify({"authenticated": False}), 401
+    db = get_db()
+    health = _get_resume_health(db, uid)
+    score = health["overall_health"] if health else None
+    return jsonify(get_percentile(db, score))
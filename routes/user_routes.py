@@ -8,6 +8,7 @@ from services.career_engine import (
 from services.action_guidance_service import ActionGuidanceService
 from services.saas_service import check_usage_limit, increment_usage, get_usage_context
 from database.models import insert_submission, get_user_submissions
+from services.http_cache import conditional, static_data_validator
 import traceback
 import json
 import uuid
@@ -190,6 +191,7 @@ def check_limit():
 
 
 @user_bp.route("/api/career-options", methods=["GET"])
+@conditional(static_data_validator, per_user=False)
 def get_career_options():
     """API endpoint for career options."""
     interest = request.args.get('interest', '').lower()
@@ -213,6 +215,7 @@ def get_career_options():
 
 
 @user_bp.route("/api/role-skills", methods=["GET"])
+@conditional(static_data_validator, per_user=False)
 def get_role_skills_api():
     """API endpoint for role-specific skills."""
     role = request.args.get('role', '')
@@ -205,6 +205,9 @@ class GDPRCompliance:
         
         db.commit()
         
+        from services.current_user import invalidate_user
+        invalidate_user(user_id)
+        
         return True
     
     @staticmethod
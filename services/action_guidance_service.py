@@ -124,16 +124,21 @@ class ActionGuidanceService:
     def generate_action_plan(user_id, profile, skill_gaps, learning_path):
         """Generate immediate, clear action items."""
         
-        actions = {
+        actions = ActionGuidanceService.build_action_plan(profile, skill_gaps, learning_path)
+        
+        ActionGuidanceService._save_action_plan(user_id, actions)
+        
+        return actions
+    
+    @staticmethod
+    def build_action_plan(profile, skill_gaps, learning_path):
+        """Generate action items without saving them."""
+        return {
             'today': ActionGuidanceService._generate_today_actions(profile, skill_gaps),
             'this_week': ActionGuidanceService._generate_week_actions(profile, learning_path),
             'this_month': ActionGuidanceService._generate_month_actions(profile, learning_path),
             'summary': ActionGuidanceService._generate_action_summary(profile, skill_gaps)
         }
-        
-        ActionGuidanceService._save_action_plan(user_id, actions)
-        
-        return actions
     
     @staticmethod
     def _generate_today_actions(profile, skill_gaps):
@@ -297,75 +302,55 @@ class ActionGuidanceService:
         }
     
     @staticmethod
-    def _save_action_plan(user_id, actions):
-        """Save action plan to database."""
+    def _save_action_plan(user_id, actions, commit=True):
+        """
+        Save action plan to database as a row diff.
+
+        Rows are keyed on (category, title): unchanged actions keep their id,
+        status and completed_date; pending actions that dropped out of the
+        plan are removed, started or completed ones are kept.  With
+        ``commit=False`` the caller owns the transaction and errors propagate.
+        """
+        from services.derived_state import apply_row_diff
         db = get_db()
         now = datetime.utcnow().isoformat()
+        target_dates = {
+            'Today': None,
+            'This Week': (datetime.utcnow() + timedelta(days=7)).strftime('%Y-%m-%d'),
+            'This Month': (datetime.utcnow() + timedelta(days=30)).strftime('%Y-%m-%d'),
+        }
+        
+        rows = []
+        for key, category in (('today', 'Today'), ('this_week', 'This Week'), ('this_month', 'This Month')):
+            for action in actions.get(key, []):
+                rows.append({
+                    'action_category': category,
+                    'action_title': action.get('action'),
+                    'action_description': action.get('description'),
+                    'time_commitment': action.get('time_needed'),
+                    'priority': 'high' if action.get('is_critical') else 'medium',
+                    'target_date': target_dates[category],
+                    'created_at': now,
+                    'updated_at': now,
+                })
         
         try:
-            # Clear existing action plans
-            db.execute('DELETE FROM action_plans WHERE user_id = ?', (user_id,))
-            
-            # Today's actions
-            for action in actions.get('today', []):
-                db.execute('''
-                    INSERT INTO action_plans
-                    (user_id, action_category, action_title, action_description,
-                     time_commitment, priority, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    user_id,
-                    'Today',
-                    action.get('action'),
-                    action.get('description'),
-                    action.get('time_needed'),
-                    'high' if action.get('is_critical') else 'medium',
-                    now,
-                    now
-                ))
-            
-            # This week
-            for action in actions.get('this_week', []):
-                db.execute('''
-                    INSERT INTO action_plans
-                    (user_id, action_category, action_title, action_description,
-                     time_commitment, priority, target_date, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    user_id,
-                    'This Week',
-                    action.get('action'),
-                    action.get('description'),
-                    action.get('time_needed'),
-                    'high' if action.get('is_critical') else 'medium',
-                    (datetime.utcnow() + timedelta(days=7)).strftime('%Y-%m-%d'),
-                    now,
-                    now
-                ))
-            
-            # This month
-            for action in actions.get('this_month', []):
-                db.execute('''
-                    INSERT INTO action_plans
-                    (user_id, action_category, action_title, action_description,
-                     time_commitment, priority, target_date, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    user_id,
-                    'This Month',
-                    action.get('action'),
-                    action.get('description'),
-                    action.get('time_needed'),
-                    'high' if action.get('is_critical') else 'medium',
-                    (datetime.utcnow() + timedelta(days=30)).strftime('%Y-%m-%d'),
-                    now,
-                    now
-                ))
-            
-            db.commit()
+            counts = apply_row_diff(
+                db, 'action_plans', user_id, rows,
+                key=('action_category', 'action_title'),
+                fields=('action_description', 'time_commitment', 'priority'),
+                touch='updated_at',
+                deletable=lambda row: row.get('status') in (None, 'pending'),
+            )
+            if commit:
+                db.commit()
+            return counts
         except Exception as e:
+            if not commit:
+                raise
             print(f"Error saving action plan: {e}")
             db.rollback()
+            return None
     
     @staticmethod
     def get_action_plan(user_id):
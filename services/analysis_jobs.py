@@ -0,0 +1,391 @@
+"""
+Background resume analysis jobs.
+
+POST /resume/api/jobs spools the upload to ANALYSIS_JOB_DIR, inserts a row
+into analysis_jobs and returns at once.  Worker threads in each app
+process claim queued rows (BEGIN IMMEDIATE, so two processes never take
+the same job), run extraction, scoring, the resume_health write and the
+profile refresh cascade, and record stage/progress on the row as they go.
+Clients poll get_job() or follow iter_job_events() over SSE.
+
+Because the queue lives in SQLite, a job submitted to one gunicorn worker
+can be picked up by any other, and jobs left 'running' by a process that
+died are requeued after ANALYSIS_JOB_STALE_AFTER seconds.
+
+Workers only run in processes that serve requests: never in spawned
+extraction or batch pool workers, and not in the debug reloader's watcher
+process (app.py decides which processes serve).
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional
+
+from config import (
+    ANALYSIS_JOB_WORKERS, ANALYSIS_JOB_POLL_INTERVAL, ANALYSIS_JOB_STALE_AFTER,
+    ANALYSIS_JOB_RETENTION_HOURS, ANALYSIS_JOB_DIR,
+)
+from database.db import get_db, get_pool
+
+# Stage -> progress percentage reported to the client
+STAGES = {
+    'queued': 0,
+    'extracting': 10,
+    'analyzing': 40,
+    'saving': 70,
+    'syncing': 85,
+    'done': 100,
+}
+TERMINAL_STATUSES = ('done', 'failed')
+
+# SSE streams give up after this long; the client can fall back to polling
+STREAM_MAX_SECONDS = 300
+_MAINTENANCE_INTERVAL = 3600
+
+_app = None
+_workers = []
+_workers_pid = None
+_workers_lock = threading.Lock()
+_wake = threading.Event()
+_last_maintenance = None
+
+_stats_lock = threading.Lock()
+_stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'requeued': 0, 'run_seconds_total': 0.0}
+
+
+def _count(name: str, amount=1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+# ==================== SUBMIT / READ ====================
+
+def submit_job(user_id: str, file_bytes: bytes, file_name: str) -> str:
+    """Spool an upload and queue it for analysis. Returns the job id."""
+    job_id = uuid.uuid4().hex
+    ext = os.path.splitext(file_name)[1].lower()
+    os.makedirs(ANALYSIS_JOB_DIR, exist_ok=True)
+    # Keep the extension: extraction dispatches on it
+    file_path = os.path.join(ANALYSIS_JOB_DIR, job_id + ext)
+    with open(file_path, 'wb') as f:
+        f.write(file_bytes)
+
+    now = _now()
+    db = get_db()
+    try:
+        db.execute(
+            '''INSERT INTO analysis_jobs
+               (id, user_id, status, stage, progress, file_name, file_path, created_at, updated_at)
+               VALUES (?, ?, 'queued', 'queued', 0, ?, ?, ?, ?)''',
+            (job_id, user_id, file_name, file_path, now, now)
+        )
+        db.commit()
+    except Exception:
+        _remove_file(file_path)
+        raise
+
+    _count('submitted')
+    _ensure_workers()
+    _wake.set()
+    return job_id
+
+
+def _row_to_job(row) -> Dict:
+    job = {
+        'job_id': row['id'],
+        'status': row['status'],
+        'stage': row['stage'],
+        'progress': row['progress'],
+        'file_name': row['file_name'],
+        'created_at': row['created_at'],
+        'started_at': row['started_at'],
+        'finished_at': row['finished_at'],
+    }
+    if row['status'] == 'done' and row['result_json']:
+        job['result'] = json.loads(row['result_json'])
+    if row['status'] == 'failed':
+        job['error'] = row['error']
+    return job
+
+
+def _read_job(db, job_id: str, user_id: str) -> Optional[Dict]:
+    row = db.execute('SELECT * FROM analysis_jobs WHERE id = ?', (job_id,)).fetchone()
+    # Someone else's job looks the same as a missing one
+    if row is None or row['user_id'] != user_id:
+        return None
+    return _row_to_job(row)
+
+
+def get_job(job_id: str, user_id: str) -> Optional[Dict]:
+    """Job status for its owner, or None."""
+    return _read_job(get_db(), job_id, user_id)
+
+
+def iter_job_events(job_id: str, user_id: str, poll_interval: float = 0.5) -> Iterator[Optional[Dict]]:
+    """
+    Yield the job each time its stage or status changes, ending after a
+    terminal state.  Yields None periodically as a keepalive.
+
+    Runs outside the request context (streamed response), so it borrows a
+    pooled connection per poll instead of pinning one for the whole stream.
+    """
+    pool = get_pool()
+    deadline = time.monotonic() + STREAM_MAX_SECONDS
+    last_state = None
+    last_sent = time.monotonic()
+
+    while time.monotonic() < deadline:
+        db = pool.acquire()
+        try:
+            job = _read_job(db, job_id, user_id)
+        finally:
+            pool.release(db)
+
+        if job is None:
+            return
+        state = (job['status'], job['stage'], job['progress'])
+        if state != last_state:
+            last_state = state
+            last_sent = time.monotonic()
+            yield job
+            if job['status'] in TERMINAL_STATUSES:
+                return
+        elif time.monotonic() - last_sent >= 15:
+            last_sent = time.monotonic()
+            yield None
+
+        time.sleep(poll_interval)
+
+
+# ==================== WORKER ====================
+
+def init_job_worker(app, start: bool = True) -> None:
+    """
+    Remember the app (workers need an app context for get_db) and, when
+    ``start`` is set, start workers.  Otherwise the first submit_job() in
+    this process starts them.
+    """
+    global _app
+    _app = app
+    if start and ANALYSIS_JOB_WORKERS > 0:
+        _ensure_workers()
+
+
+def _in_pool_worker() -> bool:
+    """True inside a multiprocessing child (extraction/batch pool worker)."""
+    return multiprocessing.parent_process() is not None
+
+
+def _ensure_workers() -> None:
+    """Start worker threads in this process; threads do not survive a fork."""
+    global _workers, _workers_pid
+    if _app is None or ANALYSIS_JOB_WORKERS <= 0 or _in_pool_worker():
+        return
+    pid = os.getpid()
+    with _workers_lock:
+        if _workers_pid == pid and all(t.is_alive() for t in _workers):
+            return
+        if _workers_pid != pid:
+            _workers = []
+        _workers = [t for t in _workers if t.is_alive()]
+        while len(_workers) < ANALYSIS_JOB_WORKERS:
+            thread = threading.Thread(
+                target=_worker_loop,
+                name=f'analysis-job-{len(_workers)}',
+                daemon=True,
+            )
+            thread.start()
+            _workers.append(thread)
+        _workers_pid = pid
+
+
+def _worker_loop() -> None:
+    while True:
+        job = None
+        try:
+            with _app.app_context():
+                _maybe_run_maintenance()
+                job = _claim_next_job()
+                if job is not None:
+                    _run_job(job)
+        except Exception as e:
+            print(f"Analysis job worker error: {e}")
+            print(traceback.format_exc())
+        if job is None:
+            _wake.wait(ANALYSIS_JOB_POLL_INTERVAL)
+            _wake.clear()
+
+
+def _claim_next_job() -> Optional[Dict]:
+    """Atomically move the oldest queued job to running."""
+    db = get_db()
+    # Cheap read first so idle polling never takes the write lock
+    if db.execute("SELECT 1 FROM analysis_jobs WHERE status = 'queued' LIMIT 1").fetchone() is None:
+        return None
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        row = db.execute(
+            "SELECT id, user_id, file_path FROM analysis_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+        ).fetchone()
+        if row is None:
+            db.rollback()
+            return None
+        now = _now()
+        db.execute(
+            '''UPDATE analysis_jobs
+               SET status = 'running', stage = 'extracting', progress = ?, started_at = ?, updated_at = ?
+               WHERE id = ?''',
+            (STAGES['extracting'], now, now, row['id'])
+        )
+        db.commit()
+        return dict(row)
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _set_stage(job_id: str, stage: str) -> None:
+    db = get_db()
+    db.execute(
+        'UPDATE analysis_jobs SET stage = ?, progress = ?, updated_at = ? WHERE id = ?',
+        (stage, STAGES[stage], _now(), job_id)
+    )
+    db.commit()
+
+
+def _finish_job(job_id: str, result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+    db = get_db()
+    # A step may have failed mid-transaction
+    if db.in_transaction:
+        db.rollback()
+    now = _now()
+    if error is None:
+        db.execute(
+            '''UPDATE analysis_jobs
+               SET status = 'done', stage = 'done', progress = 100, result_json = ?,
+                   file_path = NULL, updated_at = ?, finished_at = ?
+               WHERE id = ?''',
+            (json.dumps(result), now, now, job_id)
+        )
+    else:
+        db.execute(
+            '''UPDATE analysis_jobs
+               SET status = 'failed', error = ?, file_path = NULL, updated_at = ?, finished_at = ?
+               WHERE id = ?''',
+            (error, now, now, job_id)
+        )
+    db.commit()
+
+
+def _run_job(job: Dict) -> None:
+    """Same work as /resume/api/extract, with stage reporting."""
+    from services.extraction_pool import extract_text, is_partial
+    from services.resume_cache import make_cache_key, get_cached_analysis, store_analysis
+    from services.resume_engine import (
+        ANALYZER_VERSION, analyze_resume_text, mark_truncated, save_resume_health, sync_resume_profile,
+    )
+
+    job_id, user_id, file_path = job['id'], job['user_id'], job['file_path']
+    started = time.perf_counter()
+    try:
+        with open(file_path, 'rb') as f:
+            file_bytes = f.read()
+
+        cache_key = make_cache_key('extract', file_bytes, ANALYZER_VERSION)
+        analysis = get_cached_analysis(cache_key)
+        if analysis is None:
+            text, extract_warnings = extract_text(file_path)
+            if not text:
+                _finish_job(job_id, error='Could not extract text from file. Try a different format.')
+                _count('failed')
+                return
+
+            _set_stage(job_id, 'analyzing')
+            analysis = analyze_resume_text(text, warnings=extract_warnings)
+            if is_partial(extract_warnings):
+                # Never cache a truncated analysis under the whole file's hash
+                analysis = mark_truncated(analysis, extract_warnings)
+            else:
+                store_analysis(cache_key, analysis, ANALYZER_VERSION)
+
+        _set_stage(job_id, 'saving')
+        save_resume_health(user_id, analysis)
+
+        _set_stage(job_id, 'syncing')
+        sync_resume_profile(user_id, analysis)
+
+        _finish_job(job_id, result=analysis['response'])
+        _count('completed')
+    except Exception as e:
+        print(f"Error in analysis job {job_id}: {e}")
+        print(traceback.format_exc())
+        _finish_job(job_id, error='Error analyzing resume. Please try again.')
+        _count('failed')
+    finally:
+        _remove_file(file_path)
+        _count('run_seconds_total', time.perf_counter() - started)
+
+
+def _remove_file(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _maybe_run_maintenance() -> None:
+    """Requeue jobs orphaned by a dead process and prune old finished jobs."""
+    global _last_maintenance
+    with _workers_lock:
+        if _last_maintenance is not None and time.monotonic() - _last_maintenance < _MAINTENANCE_INTERVAL:
+            return
+        _last_maintenance = time.monotonic()
+
+    db = get_db()
+    stale_cutoff = (datetime.utcnow() - timedelta(seconds=ANALYSIS_JOB_STALE_AFTER)).isoformat()
+    cursor = db.execute(
+        '''UPDATE analysis_jobs
+           SET status = 'queued', stage = 'queued', progress = 0, started_at = NULL, updated_at = ?
+           WHERE status = 'running' AND started_at < ? AND file_path IS NOT NULL''',
+        (_now(), stale_cutoff)
+    )
+    if cursor.rowcount:
+        _count('requeued', cursor.rowcount)
+        print(f"Requeued {cursor.rowcount} stale analysis job(s)")
+
+    retention_cutoff = (datetime.utcnow() - timedelta(hours=ANALYSIS_JOB_RETENTION_HOURS)).isoformat()
+    db.execute(
+        "DELETE FROM analysis_jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+        (retention_cutoff,)
+    )
+    db.commit()
+
+
+def get_job_stats() -> Dict:
+    """Queue depth (all processes) plus this process's worker counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    finished = stats['completed'] + stats['failed']
+    stats['avg_run_seconds'] = round(stats.pop('run_seconds_total') / finished, 3) if finished else 0.0
+    stats['workers_alive'] = sum(1 for t in _workers if t.is_alive()) if _workers_pid == os.getpid() else 0
+    try:
+        rows = get_db().execute(
+            "SELECT status, COUNT(*) AS n FROM analysis_jobs WHERE status IN ('queued', 'running') GROUP BY status"
+        ).fetchall()
+        stats['queue'] = {row['status']: row['n'] for row in rows}
+    except Exception as e:
+        print(f"Error reading analysis job queue: {e}")
+        stats['queue'] = {}
+    return stats
@@ -9,6 +9,7 @@ satellite tables that Phases 2 & 3 depend on:
   • skill_gap_analysis     (current skills, required skills, priority gaps)
   • confidence_index       (overall readiness + per-dimension scores + trend)
   • user_goals             (created on first upload if missing; kept up-to-date)
+  • resume_score_history   (one appended row per run; drives the trend)
 
 Usage (in resume_routes.py, after a successful parse):
 
@@ -20,9 +21,15 @@ from __future__ import annotations
 
 import json
 import re
+import sqlite3
+import time
 from datetime import datetime
 from typing import Any
 
+from services.skill_matcher import match_skills, skill_scope
+from services.score_history import recent_scores, record_score, trend_direction
+from services.skill_registry import SkillSet
+
 # helpers 
 
 def _now() -> str:
@@ -151,69 +158,45 @@ def _compute_content_completeness(parse_result: dict, ats_result: dict) -> int:
     return _clamp(score)
 
 
+# Skills and tech terms worth surfacing as gaps, keyed by lowercase term with
+# their display spelling. Generic words like 'Create' or 'Add' are excluded.
+_GAP_SKILL_KEYWORDS = {kw.lower(): kw for kw in (
+    # Languages (avoid single letters like 'R', 'C' that match in other words)
+    "Python", "Java", "JavaScript", "TypeScript", "Ruby", "Go",
+    "Rust", "PHP", "Kotlin", "Swift", "MATLAB", "SQL",
+    # Web/Frontend
+    "React", "Vue", "Angular", "HTML", "CSS", "Node", "Django",
+    "Flask", "Spring", "Laravel", "Express", "Next",
+    # Data/Cloud
+    "AWS", "Azure", "GCP", "Kubernetes", "Docker", "Terraform", "Jenkins",
+    "PostgreSQL", "MongoDB", "Redis", "Elasticsearch", "Spark", "Hadoop",
+    # Professional
+    "Agile", "Scrum", "Git", "GitHub", "GitLab", "DevOps",
+    "Microservices", "REST", "GraphQL", "API", "CI/CD",
+    # Soft skills
+    "Leadership", "Communication", "Management", "Analysis", "Project Management",
+    # Others
+    "Blockchain", "ML", "AI",
+    "Machine Learning", "Deep Learning", "Data Science", "Analytics", "Statistics",
+)}
+_GAP_SKILL_SCOPE = skill_scope(_GAP_SKILL_KEYWORDS)
+
+
 def _derive_priority_gaps(current_skills: list, ats_result: dict, parse_result: dict) -> list:
     """Derive a short list of priority skill gaps from context.
     
     Extracts technical/professional skills from recommendations & blockers,
     filtering out generic words like 'Create', 'Add', 'Improve'.
     """
-    # Common skills and tech terms to look for - organized by category
-    # Only single words or well-known multi-word terms to avoid partial matches
-    SKILL_KEYWORDS = {
-        # Languages (avoid single letters like 'R', 'C' that match in other words)
-        "Python", "Java", "JavaScript", "TypeScript", "Ruby", "Go",
-        "Rust", "PHP", "Kotlin", "Swift", "MATLAB", "SQL",
-        # Web/Frontend
-        "React", "Vue", "Angular", "HTML", "CSS", "Node", "Django",
-        "Flask", "Spring", "Laravel", "Express", "Next",
-        # Data/Cloud
-        "AWS", "Azure", "GCP", "Kubernetes", "Docker", "Terraform", "Jenkins",
-        "PostgreSQL", "MongoDB", "Redis", "Elasticsearch", "Spark", "Hadoop",
-        # Professional
-        "Agile", "Scrum", "Git", "GitHub", "GitLab", "DevOps",
-        "Microservices", "REST", "GraphQL", "API", "CI/CD",
-        # Soft skills
-        "Leadership", "Communication", "Management", "Analysis", "Project Management",
-        # Others
-        "Blockchain", "ML", "AI", "Kubernetes", "Terraform",
-        "Machine Learning", "Deep Learning", "Data Science", "Analytics", "Statistics",
-    }
-    
-    current_skills_lower = [s.lower() for s in current_skills]
+    held = SkillSet(current_skills)
     priority = []
     
-    # Extract from recommendations using word-aware matching
-    recs = ats_result.get("recommendations", []) or []
-    for rec in recs:
-        rec_lower = rec.lower()
-        for skill_kw in SKILL_KEYWORDS:
-            skill_lower = skill_kw.lower()
-            # Use word boundaries: match as whole word or as part of phrase
-            # For multi-word terms, just do substring match
-            # For single-word terms, check word boundaries
-            if " " in skill_kw:
-                # Multi-word term: substring match is fine
-                if skill_lower in rec_lower and skill_lower not in current_skills_lower:
-                    priority.append(skill_kw)
-            else:
-                # Single-word term: use word boundary check with regex
-                pattern = r"\b" + re.escape(skill_lower) + r"\b"
-                if re.search(pattern, rec_lower) and skill_lower not in current_skills_lower:
-                    priority.append(skill_kw)
-    
-    # Also check blockers for skills
-    blockers = ats_result.get("blockers", []) or []
-    for blocker in blockers:
-        blocker_lower = blocker.lower()
-        for skill_kw in SKILL_KEYWORDS:
-            skill_lower = skill_kw.lower()
-            if " " in skill_kw:
-                if skill_lower in blocker_lower and skill_lower not in current_skills_lower:
-                    priority.append(skill_kw)
-            else:
-                pattern = r"\b" + re.escape(skill_lower) + r"\b"
-                if re.search(pattern, blocker_lower) and skill_lower not in current_skills_lower:
-                    priority.append(skill_kw)
+    # Recommendations first, then blockers; one automaton pass per string
+    texts = (ats_result.get("recommendations", []) or []) + (ats_result.get("blockers", []) or [])
+    for text in texts:
+        for term in match_skills(str(text), scope=_GAP_SKILL_SCOPE):
+            if not held.has(term):
+                priority.append(_GAP_SKILL_KEYWORDS[term])
     
     # De-duplicate while preserving order and limiting to 8
     seen = set()
@@ -257,6 +240,79 @@ _COMMON_REQUIRED_SKILLS = [
 ]
 
 
+# upserts (one statement per satellite table; see migration 5) 
+
+_HEALTH_UPSERT = """
+    INSERT INTO resume_health
+      (user_id, ats_score, formatting_score, keyword_score,
+       content_completeness, overall_health, suggestions, last_analyzed_at,
+       created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+      ats_score            = excluded.ats_score,
+      formatting_score     = excluded.formatting_score,
+      keyword_score        = excluded.keyword_score,
+      content_completeness = excluded.content_completeness,
+      overall_health       = excluded.overall_health,
+      suggestions          = excluded.suggestions,
+      last_analyzed_at     = excluded.last_analyzed_at,
+      updated_at           = excluded.updated_at
+"""
+
+_GAP_UPSERT = """
+    INSERT INTO skill_gap_analysis
+      (user_id, current_skills, required_skills, priority_gaps,
+       estimated_learning_weeks, target_role, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+      current_skills           = excluded.current_skills,
+      required_skills          = excluded.required_skills,
+      priority_gaps            = excluded.priority_gaps,
+      estimated_learning_weeks = excluded.estimated_learning_weeks,
+      target_role              = excluded.target_role,
+      updated_at               = excluded.updated_at
+"""
+
+_CONFIDENCE_UPSERT = """
+    INSERT INTO confidence_index
+      (user_id, overall_score, resume_strength, skill_readiness,
+       market_alignment, trend, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+      overall_score    = excluded.overall_score,
+      resume_strength  = excluded.resume_strength,
+      skill_readiness  = excluded.skill_readiness,
+      market_alignment = excluded.market_alignment,
+      trend            = excluded.trend,
+      updated_at       = excluded.updated_at
+"""
+
+# The pipeline owns one 'career_development' goal per user; the title is
+# only set on first insert
+_GOAL_UPSERT = """
+    INSERT INTO user_goals
+      (user_id, goal_title, goal_description, category, status,
+       completion_percentage, created_at, updated_at)
+    VALUES (?, ?, ?, 'career_development', 'active', ?, ?, ?)
+    ON CONFLICT(user_id) WHERE category = 'career_development' DO UPDATE SET
+      goal_description      = excluded.goal_description,
+      completion_percentage = excluded.completion_percentage,
+      updated_at            = excluded.updated_at
+"""
+
+
+def _trend(previous_scores: list, overall: int) -> str:
+    """Compare against the mean of the recent scores, not just the last one."""
+    if not previous_scores:
+        return "stable"
+    baseline = sum(int(s) for s in previous_scores) / len(previous_scores)
+    return trend_direction(overall - baseline)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
 # main pipeline entry point 
 
 def run_full_pipeline(
@@ -272,16 +328,26 @@ def run_full_pipeline(
       - resume_health
       - skill_gap_analysis
       - confidence_index
-      - user_goals (upsert)
+      - user_goals (the pipeline's career_development goal)
+      - resume_score_history (appended)
+
+    Each table is written with a single upsert, all in one transaction
+    (BEGIN IMMEDIATE, so the previous confidence score read for the trend
+    cannot change underneath it).  When the caller already has a
+    transaction open the writes join it and the caller commits.
 
-    Returns a summary dict of what was persisted.
+    Returns a summary dict of what was persisted, with per-stage
+    ``timings_ms``.
     """
+    started = time.perf_counter()
+    timings: dict = {}
 
     now = _now()
     skills: list = parse_result.get("skills", []) or []
     ats_score: int = _clamp(ats_result.get("ats_score", quality_score))
 
     # 1. Derived scores 
+    stage = time.perf_counter()
     formatting_score = _compute_formatting_score(parse_result, ats_result)
     keyword_score    = _compute_keyword_score(parse_result, ats_result)
     content_score    = _compute_content_completeness(parse_result, ats_result)
@@ -297,50 +363,6 @@ def run_full_pipeline(
     suggestions_raw = ats_result.get("recommendations", [])
     suggestions_json = _jdump(suggestions_raw[:6])
 
-    # 2. Persist resume_health 
-    existing_health = db.execute(
-        "SELECT id FROM resume_health WHERE user_id = ?", (user_id,)
-    ).fetchone()
-
-    if existing_health:
-        db.execute(
-            """
-            UPDATE resume_health
-            SET ats_score          = ?,
-                formatting_score   = ?,
-                keyword_score      = ?,
-                content_completeness = ?,
-                overall_health     = ?,
-                suggestions        = ?,
-                last_analyzed_at   = ?,
-                updated_at         = ?
-            WHERE user_id = ?
-            """,
-            (
-                ats_score, formatting_score, keyword_score,
-                content_score, overall_health,
-                suggestions_json, now, now,
-                user_id,
-            ),
-        )
-    else:
-        db.execute(
-            """
-            INSERT INTO resume_health
-              (user_id, ats_score, formatting_score, keyword_score,
-               content_completeness, overall_health, suggestions, last_analyzed_at,
-               created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                user_id, ats_score, formatting_score, keyword_score,
-                content_score, overall_health,
-                suggestions_json, now,
-                now, now,
-            ),
-        )
-
-    # 3. Persist skill_gap_analysis 
     priority_gaps    = _derive_priority_gaps(skills, ats_result, parse_result)
     current_skills_j = _jdump(skills)
     required_j       = _jdump(_COMMON_REQUIRED_SKILLS)
@@ -349,86 +371,52 @@ def run_full_pipeline(
     # Estimated weeks: 2 weeks per priority gap (rough but consistent)
     estimated_weeks = len(priority_gaps) * 2
 
-    existing_gap = db.execute(
-        "SELECT id FROM skill_gap_analysis WHERE user_id = ?", (user_id,)
-    ).fetchone()
+    dims = _compute_confidence_dimensions(
+        overall_health, formatting_score, keyword_score, content_score
+    )
+    goal_desc = f"Health: {overall_health}/100, Target: {target_role or 'TBD'}"
+    timings["scores"] = _elapsed_ms(stage)
 
-    if existing_gap:
+    # 2. Persist everything in one transaction 
+    owns_transaction = not db.in_transaction
+    if owns_transaction:
+        db.execute("BEGIN IMMEDIATE")
+    try:
+        stage = time.perf_counter()
         db.execute(
-            """
-            UPDATE skill_gap_analysis
-            SET current_skills          = ?,
-                required_skills         = ?,
-                priority_gaps           = ?,
-                estimated_learning_weeks = ?,
-                target_role             = ?,
-                updated_at              = ?
-            WHERE user_id = ?
-            """,
+            _HEALTH_UPSERT,
             (
-                current_skills_j, required_j, gaps_j,
-                estimated_weeks, target_role, now,
-                user_id,
+                user_id, ats_score, formatting_score, keyword_score,
+                content_score, overall_health,
+                suggestions_json, now,
+                now, now,
             ),
         )
-    else:
+        timings["resume_health"] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
         db.execute(
-            """
-            INSERT INTO skill_gap_analysis
-              (user_id, current_skills, required_skills, priority_gaps,
-               estimated_learning_weeks, target_role, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _GAP_UPSERT,
             (
                 user_id, current_skills_j, required_j, gaps_j,
                 estimated_weeks, target_role, now, now,
             ),
         )
-
-    # 4. Persist confidence_index 
-    dims = _compute_confidence_dimensions(
-        overall_health, formatting_score, keyword_score, content_score
-    )
-
-    # Determine trend by comparing to previous score
-    prev = db.execute(
-        "SELECT overall_score FROM confidence_index WHERE user_id = ?", (user_id,)
-    ).fetchone()
-
-    trend = "stable"
-    if prev and prev["overall_score"] is not None:
-        delta = overall_health - int(prev["overall_score"])
-        trend = "improving" if delta > 3 else "declining" if delta < -3 else "stable"
-
-    if prev:
+        timings["skill_gap_analysis"] = _elapsed_ms(stage)
+
+        # Trend compares against the recent score history (a range scan);
+        # users analysed before the history existed fall back to the last score
+        stage = time.perf_counter()
+        previous = recent_scores(db, user_id)
+        if not previous:
+            prev = db.execute(
+                "SELECT overall_score FROM confidence_index WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if prev and prev["overall_score"] is not None:
+                previous = [prev["overall_score"]]
+        trend = _trend(previous, overall_health)
         db.execute(
-            """
-            UPDATE confidence_index
-            SET overall_score    = ?,
-                resume_strength  = ?,
-                skill_readiness  = ?,
-                market_alignment = ?,
-                trend            = ?,
-                updated_at       = ?
-            WHERE user_id = ?
-            """,
-            (
-                overall_health,
-                dims["resume_strength"],
-                dims["skill_readiness"],
-                dims["market_alignment"],
-                trend, now,
-                user_id,
-            ),
-        )
-    else:
-        db.execute(
-            """
-            INSERT INTO confidence_index
-              (user_id, overall_score, resume_strength, skill_readiness,
-               market_alignment, trend, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _CONFIDENCE_UPSERT,
             (
                 user_id, overall_health,
                 dims["resume_strength"],
@@ -437,49 +425,42 @@ def run_full_pipeline(
                 trend, now, now,
             ),
         )
+        timings["confidence_index"] = _elapsed_ms(stage)
 
-    # 5. Upsert user_goals (first upload baseline) 
-    try:
-        existing_goal = db.execute(
-            "SELECT id FROM user_goals WHERE user_id = ?", (user_id,)
-        ).fetchone()
-        goal_desc = f"Health: {overall_health}/100, Target: {target_role or 'TBD'}"
-        
-        if not existing_goal:
+        stage = time.perf_counter()
+        record_score(
+            db, user_id, overall_health, ats=ats_score, keyword=keyword_score,
+            formatting=formatting_score, content=content_score, source="pipeline",
+        )
+        timings["score_history"] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        try:
             db.execute(
-                """
-                INSERT INTO user_goals
-                  (user_id, goal_title, goal_description, category, status,
-                   completion_percentage, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _GOAL_UPSERT,
                 (
                     user_id,
                     f"Improve career readiness for {target_role or 'target role'}",
                     goal_desc,
-                    "career_development",
-                    "active",
                     min(100, overall_health),  # use current health as completion %
                     now, now,
                 ),
             )
-        else:
-            # Update completion_percentage based on current health score
-            db.execute(
-                """UPDATE user_goals 
-                   SET goal_description = ?, completion_percentage = ?, updated_at = ? 
-                   WHERE user_id = ?""",
-                (goal_desc, min(100, overall_health), now, user_id),
-            )
-    except Exception as _goal_err:
-        pass  # user_goals table may not exist in older DBs — non-fatal
-
-    db.connection.commit() if hasattr(db, "connection") else None
-
-    try:
-        db.execute("SELECT 1")   # triggers implicit commit in sqlite3 Row
+        except sqlite3.OperationalError as goal_err:
+            # user_goals is optional on databases that predate it
+            print(f"Pipeline skipped user_goals: {goal_err}")
+        timings["user_goals"] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        if owns_transaction:
+            db.commit()
+        timings["commit"] = _elapsed_ms(stage)
     except Exception:
-        pass
+        if owns_transaction:
+            db.rollback()
+        raise
+
+    timings["total"] = _elapsed_ms(started)
 
     return {
         "ats_score": ats_score,
@@ -491,4 +472,5 @@ def run_full_pipeline(
         "priority_gaps": priority_gaps,
         "trend": trend,
         **dims,
+        "timings_ms": timings,
     }
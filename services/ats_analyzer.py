@@ -6,33 +6,39 @@ Not generic scoring - grounded in how recruiters and ATS systems actually work.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Set
-from services.field_config import get_field_config, FieldConfig
+from services.field_registry import SECTION_HEADERS, get_compiled_field
+
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b|\(\d{3}\)\s*\d{3}[-.\s]?\d{4}')
+_LINKEDIN_RE = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
+_GITHUB_RE = re.compile(r'github\.com/[\w-]+', re.IGNORECASE)
+_LOCATION_RE = re.compile(r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b')
+_DATE_RE = re.compile(r'\b\d{1,2}/\d{4}\b|\b\d{4}\b|\b[A-Z][a-z]+ \d{4}\b')
+_SECTION_HEADER_RE = re.compile(r'\n[A-Z\s]{3,}\n|^[A-Z\s]{3,}\n', re.MULTILINE)
+_BULLET_RE = re.compile(r'[•\-\*]\s*(.+)')
 
 
 class ATSAnalyzer:
     """
     Analyzes resume ATS compatibility based on field-specific criteria.
     Focuses on real ATS behavior, not myths.
+    
+    Instances hold no per-resume state; use get_ats_analyzer() to share one
+    per field and experience level.
     """
     
     # Common ATS parsing blockers
     ATS_BLOCKERS = {
-        'tables': r'<table|\\begin{tabular}',
-        'images': r'<img|\\includegraphics',
-        'text_boxes': r'<textbox',
-        'columns_indicator': r'\\begin{multicols}',
+        'tables': re.compile(r'<table|\\begin{tabular}', re.IGNORECASE),
+        'images': re.compile(r'<img|\\includegraphics', re.IGNORECASE),
+        'text_boxes': re.compile(r'<textbox', re.IGNORECASE),
+        'columns_indicator': re.compile(r'\\begin{multicols}', re.IGNORECASE),
     }
     
     # Standard section headers ATS systems look for
-    STANDARD_SECTIONS = {
-        'contact': ['contact', 'personal information'],
-        'summary': ['summary', 'profile', 'objective', 'about'],
-        'experience': ['experience', 'work history', 'employment', 'professional experience'],
-        'education': ['education', 'academic', 'qualifications'],
-        'skills': ['skills', 'technical skills', 'competencies', 'expertise'],
-        'projects': ['projects', 'portfolio', 'work samples']
-    }
+    STANDARD_SECTIONS = SECTION_HEADERS
     
     def __init__(self, field_key: str = 'software_backend', experience_level: str = 'mid'):
         """
@@ -42,7 +48,8 @@ class ATSAnalyzer:
             field_key: Target career field
             experience_level: 'entry', 'mid', or 'senior'
         """
-        self.field_config = get_field_config(field_key)
+        self.field = get_compiled_field(field_key)
+        self.field_config = self.field.config
         self.experience_level = experience_level
     
     def analyze(self, resume_text: str, parsed_data: Dict) -> Dict:
@@ -108,17 +115,17 @@ class ATSAnalyzer:
         score = 100
         
         # Check for parsing blockers
-        if re.search(self.ATS_BLOCKERS['tables'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['tables'].search(text):
             score -= 15
-        if re.search(self.ATS_BLOCKERS['images'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['images'].search(text):
             score -= 10
-        if re.search(self.ATS_BLOCKERS['text_boxes'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['text_boxes'].search(text):
             score -= 10
-        if re.search(self.ATS_BLOCKERS['columns_indicator'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['columns_indicator'].search(text):
             score -= 10
         
         # Check for consistent date formatting
-        date_patterns = re.findall(r'\b\d{1,2}/\d{4}\b|\b\d{4}\b|\b[A-Z][a-z]+ \d{4}\b', text)
+        date_patterns = _DATE_RE.findall(text)
         if date_patterns:
             # Check consistency
             formats = set()
@@ -151,19 +158,16 @@ class ATSAnalyzer:
         text_lower = text.lower()
         
         # Check for required sections based on field
-        required_sections = self.field_config.required_sections
+        required_sections = self.field.required_sections
         sections_found = []
         
-        for section_type, headers in self.STANDARD_SECTIONS.items():
-            if section_type in required_sections:
-                found = any(header in text_lower for header in headers)
-                if found:
-                    sections_found.append(section_type)
-                    score += 25 // len(required_sections)  # Distribute points
+        for section_type, pattern in self.field.section_patterns.items():
+            if pattern.search(text_lower):
+                sections_found.append(section_type)
+                score += 25 // len(required_sections)  # Distribute points
         
         # Bonus for clear section headers (all caps or bold indicators)
-        section_header_pattern = r'\n[A-Z\s]{3,}\n|^[A-Z\s]{3,}\n'
-        clear_headers = re.findall(section_header_pattern, text, re.MULTILINE)
+        clear_headers = _SECTION_HEADER_RE.findall(text)
         if len(clear_headers) >= 3:
             score += 10
         
@@ -185,34 +189,31 @@ class ATSAnalyzer:
         Based on field-specific core and supporting keywords.
         """
         text_lower = text.lower()
+        field = self.field
+        hits = field.keyword_hits(text_lower)
         
         # Count core keywords
-        core_keywords = self.field_config.core_keywords
-        core_found = sum(1 for keyword in core_keywords if keyword in text_lower)
-        core_coverage = (core_found / len(core_keywords)) * 100 if core_keywords else 0
+        core_keywords = field.core_keywords
+        core_coverage = (len(hits.core) / len(core_keywords)) * 100 if core_keywords else 0
         
         # Count supporting keywords
-        supporting_keywords = self.field_config.supporting_keywords
-        supporting_found = sum(1 for keyword in supporting_keywords if keyword in text_lower)
-        supporting_coverage = (supporting_found / len(supporting_keywords)) * 100 if supporting_keywords else 0
+        supporting_keywords = field.supporting_keywords
+        supporting_coverage = (len(hits.supporting) / len(supporting_keywords)) * 100 if supporting_keywords else 0
         
         # Core keywords are more important (70% weight)
         keyword_score = int(core_coverage * 0.70 + supporting_coverage * 0.30)
         
         # Penalize keyword stuffing (same keyword repeated too many times)
-        for keyword in list(core_keywords)[:10]:  # Check top keywords
-            count = text_lower.count(keyword)
-            if count > 8:  # Excessive repetition
+        for keyword in field.stuffing_keywords:  # Check top keywords
+            if hits.counts.get(keyword, 0) > 8:  # Excessive repetition
                 keyword_score -= 5
         
         # Bonus for keyword context (in bullet points, not just listed)
-        bullet_pattern = r'[•\-\*]\s*(.+)'
-        bullets = re.findall(bullet_pattern, text)
+        bullets = _BULLET_RE.findall(text)
         if bullets:
             keywords_in_context = sum(
-                1 for bullet in bullets
-                for keyword in list(core_keywords)[:20]
-                if keyword in bullet.lower()
+                len(field.keyword_hits(bullet.lower()).core & field.context_keywords)
+                for bullet in bullets
             )
             if keywords_in_context > 5:
                 keyword_score += 10
@@ -227,24 +228,20 @@ class ATSAnalyzer:
         score = 0
         
         # Email (required)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        if re.search(email_pattern, text):
+        if _EMAIL_RE.search(text):
             score += 30
         
         # Phone (required)
-        phone_pattern = r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b|\(\d{3}\)\s*\d{3}[-.\s]?\d{4}'
-        if re.search(phone_pattern, text):
+        if _PHONE_RE.search(text):
             score += 25
         
         # LinkedIn (highly recommended)
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        if re.search(linkedin_pattern, text, re.IGNORECASE):
+        if _LINKEDIN_RE.search(text):
             score += 25
         
         # GitHub/Portfolio (field-specific)
         if self.field_config.name.startswith('Software') or 'Data Science' in self.field_config.name:
-            github_pattern = r'github\.com/[\w-]+'
-            if re.search(github_pattern, text, re.IGNORECASE):
+            if _GITHUB_RE.search(text):
                 score += 20
         elif 'Design' in self.field_config.name:
             portfolio_keywords = ['portfolio', 'behance', 'dribbble']
@@ -254,8 +251,7 @@ class ATSAnalyzer:
             score += 10  # Partial credit for other fields
         
         # Location (city, state) - not full address
-        location_pattern = r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b'
-        if re.search(location_pattern, text):
+        if _LOCATION_RE.search(text):
             score += 10
         
         return min(100, score)
@@ -264,13 +260,13 @@ class ATSAnalyzer:
         """Identify specific ATS parsing blockers."""
         blockers = []
         
-        if re.search(self.ATS_BLOCKERS['tables'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['tables'].search(text):
             blockers.append("Table-based layout detected - ATS may misread content order")
         
-        if re.search(self.ATS_BLOCKERS['images'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['images'].search(text):
             blockers.append("Images or graphics detected - ATS cannot parse visual content")
         
-        if re.search(self.ATS_BLOCKERS['columns_indicator'], text, re.IGNORECASE):
+        if self.ATS_BLOCKERS['columns_indicator'].search(text):
             blockers.append("Multi-column layout detected - text order may be scrambled by ATS")
         
         # Check for contact info in header/footer (common mistake)
@@ -313,11 +309,11 @@ class ATSAnalyzer:
         
         # Format improvements
         if format_score < 80:
-            if re.search(self.ATS_BLOCKERS['tables'], text, re.IGNORECASE):
+            if self.ATS_BLOCKERS['tables'].search(text):
                 improvements.append(
                     "Remove table-based layout - use simple text formatting with clear section breaks"
                 )
-            if re.search(self.ATS_BLOCKERS['columns_indicator'], text, re.IGNORECASE):
+            if self.ATS_BLOCKERS['columns_indicator'].search(text):
                 improvements.append(
                     "Convert multi-column layout to single column - ATS reads left-to-right, top-to-bottom"
                 )
@@ -326,9 +322,8 @@ class ATSAnalyzer:
         if section_score < 70:
             missing_sections = []
             text_lower = text.lower()
-            for section in self.field_config.required_sections:
-                headers = self.STANDARD_SECTIONS.get(section, [])
-                if not any(header in text_lower for header in headers):
+            for section in self.field.required_sections:
+                if not self.field.has_section(section, text_lower):
                     missing_sections.append(section.title())
             
             if missing_sections:
@@ -342,7 +337,7 @@ class ATSAnalyzer:
         
         # Keyword improvements
         if keyword_score < 60:
-            core_keywords = list(self.field_config.core_keywords)[:10]
+            core_keywords = sorted(self.field.stuffing_keywords)
             improvements.append(
                 f"Increase relevant keyword coverage - consider adding: {', '.join(core_keywords[:5])}"
             )
@@ -355,7 +350,7 @@ class ATSAnalyzer:
             if not re.search(r'linkedin\.com', text, re.IGNORECASE):
                 improvements.append("Add LinkedIn profile URL")
             
-            if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+            if not _EMAIL_RE.search(text):
                 improvements.append("Ensure email address is clearly visible")
             
             if self.field_config.name.startswith('Software') and not re.search(r'github\.com', text, re.IGNORECASE):
@@ -382,5 +377,11 @@ def analyze_ats_compatibility(
     Returns:
         ATS analysis results
     """
-    analyzer = ATSAnalyzer(field_key, experience_level)
+    analyzer = get_ats_analyzer(field_key, experience_level)
     return analyzer.analyze(resume_text, parsed_data)
+
+
+@lru_cache(maxsize=64)
+def get_ats_analyzer(field_key: str = 'software_backend', experience_level: str = 'mid') -> ATSAnalyzer:
+    """Shared, stateless ATSAnalyzer for a field and experience level."""
+    return ATSAnalyzer(field_key, experience_level)
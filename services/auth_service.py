@@ -3,6 +3,7 @@ import bcrypt
 import re
 from datetime import datetime
 from database.db import get_db
+from database.request_cache import request_cached
 
 
 def hash_password(password):
@@ -108,6 +109,7 @@ def authenticate_user(email, password):
     return None
 
 
+@request_cached('users')
 def get_user_by_id(user_id):
     """Get user by ID."""
     if not user_id:
@@ -135,4 +137,9 @@ def update_user_profile(user_id, full_name=None, profile_image_path=None):
             (profile_image_path, now, user_id)
         )
     
-    db.commit()
\ No newline at end of file
+    from services.user_snapshot import invalidate
+    invalidate(db, user_id)
+    db.commit()
+    
+    from services.current_user import invalidate_user
+    invalidate_user(user_id)
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""
+Bulk resume scoring for career-center imports.
+
+iter_batch() hashes every file, serves byte-identical resumes from the
+content-hash cache, fans the rest out across a process pool and yields one
+result record per file as it finishes.  Like services.extraction_pool, each
+file gets EXTRACTION_TIMEOUT seconds; a file that overruns is reported and
+the pool is rebuilt.  When a worker dies, the files it may have been running
+are retried one at a time, so only the file that kills a worker on its own
+is reported as crashed.  Workers are spawned, so they import the main
+script as __mp_main__ and skip app.py's startup; a rebuilt pool is warmed
+up before its files' deadlines start.  Scores are written to
+quick_analyses and resume_health with executemany, BATCH_WRITE_CHUNK rows
+per transaction, instead of one commit per resume.
+
+Files are attributed to the user ids in ``user_map`` (file name -> user id);
+unmapped files get a synthetic ``batch:<batch_id>:<file name>`` id.
+
+Usage:
+    python -m services.batch_analyze resumes/                      # NDJSON on stdout
+    python -m services.batch_analyze resumes/ --user-map map.json --role "Data Analyst"
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config import (
+    ALLOWED_RESUME_EXTENSIONS, MAX_RESUME_FILE_SIZE, BATCH_WORKERS, BATCH_WRITE_CHUNK,
+    EXTRACTION_MAX_TASKS_PER_CHILD, EXTRACTION_MEMORY_LIMIT_MB, EXTRACTION_TIMEOUT,
+)
+from database.db import get_db
+
+
+# ==================== WORKER SIDE ====================
+
+def _analyze_path(file_path: str) -> Dict:
+    """Extract and score one file. Runs in a pool process."""
+    from services.resume_analysis_enhanced import ResumeTextExtractor
+    from services.resume_engine import analyze_resume_text
+
+    try:
+        text, warnings = ResumeTextExtractor.extract_from_file(file_path)
+    except MemoryError:
+        return {'error': f"File needs more than {EXTRACTION_MEMORY_LIMIT_MB} MB to parse"}
+    if not text:
+        return {'error': '; '.join(warnings) or 'Could not extract text from file'}
+    return {'analysis': analyze_resume_text(text, warnings=warnings)}
+
+
+# ==================== PARENT SIDE ====================
+
+def list_resume_files(directory: str) -> List[str]:
+    """Resume files directly inside ``directory``, sorted by name."""
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        ext = os.path.splitext(name)[1].lower().strip('.')
+        if os.path.isfile(path) and ext in ALLOWED_RESUME_EXTENSIONS:
+            paths.append(path)
+    return paths
+
+
+def _file_key(path: str) -> str:
+    from services.resume_cache import make_cache_key
+    from services.resume_engine import ANALYZER_VERSION
+
+    with open(path, 'rb') as f:
+        return make_cache_key('extract', f.read(), ANALYZER_VERSION)
+
+
+class _BatchWriter:
+    """Buffers result rows and flushes them in chunked transactions."""
+
+    def __init__(self, target_role: str, chunk_size: int = BATCH_WRITE_CHUNK):
+        self.target_role = target_role
+        self.chunk_size = max(1, chunk_size)
+        self.quick_rows = []
+        self.health_rows = []
+        self.written = 0
+
+    def add(self, user_id: str, analysis: Dict) -> None:
+        from services.resume_analysis_enhanced import ResumeAnalyzer
+
+        now = datetime.utcnow().isoformat()
+        response = analysis['response']
+        # Extracted text is not retained for bulk imports
+        self.quick_rows.append((
+            user_id, None, self.target_role, response['ats_score'], response['overall_score'],
+            json.dumps(response['skills']), json.dumps(response['suggestions']), now,
+        ))
+        basic = analysis.get('basic') or {}
+        if basic.get('success'):
+            self.health_rows.append(ResumeAnalyzer.health_row(user_id, basic, now))
+        if len(self.quick_rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.quick_rows and not self.health_rows:
+            return
+        from services.resume_analysis_enhanced import ResumeAnalyzer
+        from services.score_history import HISTORY_INSERT_SQL, history_row_from_health, keeps_history
+
+        db = get_db()
+        try:
+            db.executemany(
+                '''INSERT INTO quick_analyses
+                   (user_id, resume_text, target_role, ats_score, overall_score,
+                    skills_found, recommendations, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                self.quick_rows
+            )
+            db.executemany(ResumeAnalyzer.HEALTH_UPSERT_SQL, self.health_rows)
+            db.executemany(HISTORY_INSERT_SQL, [history_row_from_health(row, 'batch')
+                                                for row in self.health_rows if keeps_history(row[0])])
+            db.commit()
+            self.written += len(self.quick_rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            self.quick_rows = []
+            self.health_rows = []
+
+
+def _ready() -> None:
+    """No-op task that makes the pool start a worker."""
+
+
+def _new_executor(max_workers: int, timeout: float = EXTRACTION_TIMEOUT) -> ProcessPoolExecutor:
+    """A started pool: spawn and import time is not charged to the first files."""
+    from services.extraction_pool import _init_worker
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(EXTRACTION_MEMORY_LIMIT_MB,),
+        max_tasks_per_child=EXTRACTION_MAX_TASKS_PER_CHILD,
+    )
+    # A broken or slow start surfaces on the first real submit instead
+    wait([executor.submit(_ready) for _ in range(max_workers)], timeout=timeout)
+    return executor
+
+
+def _analyze_misses(misses: Dict[str, List[str]], workers: int,
+                    timeout: float = EXTRACTION_TIMEOUT) -> Iterator[tuple]:
+    """
+    Yield (cache key, outcome) for each key in ``misses`` as it finishes.
+
+    Only as many files as there are workers are in flight, so a file's
+    deadline starts when it can actually run.  A file past its deadline is
+    reported as timed out and the pool (whose worker is stuck) is rebuilt;
+    the other in-flight files are resubmitted.  On BrokenProcessPool the
+    in-flight files become suspects and are retried one at a time.
+    """
+    from services.extraction_pool import terminate_executor
+
+    if not misses:
+        return
+    max_workers = max(1, min(workers, len(misses)))
+    queue = list(misses)
+    suspects = []  # keys in flight when a worker died; rerun alone
+    inflight = {}  # future -> (key, deadline, isolated)
+    executor = _new_executor(max_workers, timeout)
+    try:
+        while queue or suspects or inflight:
+            # A suspect only runs alone, so a crash can be attributed to it
+            if suspects and not inflight:
+                key = suspects.pop(0)
+                inflight[executor.submit(_analyze_path, misses[key][0])] = (key, time.monotonic() + timeout, True)
+            isolating = suspects or any(isolated for _, _, isolated in inflight.values())
+            while queue and not isolating and len(inflight) < max_workers:
+                key = queue.pop(0)
+                inflight[executor.submit(_analyze_path, misses[key][0])] = (key, time.monotonic() + timeout, False)
+
+            next_deadline = min(deadline for _, deadline, _ in inflight.values())
+            done, _ = wait(inflight, timeout=max(0.0, next_deadline - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+
+            broken = False
+            for future in done:
+                key, _, isolated = inflight.pop(future)
+                try:
+                    outcome = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if not isolated:
+                        suspects.append(key)
+                        continue
+                    outcome = {'error': 'Analysis worker crashed (file too large or malformed)'}
+                except Exception as e:
+                    outcome = {'error': f"Analysis failed: {e}"}
+                yield key, outcome
+
+            now = time.monotonic()
+            expired = [future for future, (_, deadline, _) in inflight.items() if deadline <= now]
+            for future in expired:
+                key, _, _ = inflight.pop(future)
+                yield key, {'error': f"Analysis timed out after {timeout:g}s"}
+
+            if broken or expired:
+                # Stuck or dead worker: rebuild the pool and rerun what was in flight
+                for key, _, isolated in inflight.values():
+                    (suspects if broken or isolated else queue).insert(0, key)
+                inflight.clear()
+                terminate_executor(executor)
+                executor = _new_executor(max_workers, timeout)
+    finally:
+        if inflight:
+            terminate_executor(executor)
+        else:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_batch(paths: Iterable[str], user_map: Optional[Dict[str, str]] = None,
+               target_role: str = '', workers: int = BATCH_WORKERS,
+               batch_id: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Score every file and yield one record per file (completion order),
+    then a final {'summary': ...} record.  Needs an app context for get_db.
+    """
+    from services.resume_cache import get_cached_analysis, store_analysis
+    from services.resume_engine import ANALYZER_VERSION
+
+    batch_id = batch_id or uuid.uuid4().hex[:12]
+    user_map = user_map or {}
+    writer = _BatchWriter(target_role)
+    started = time.perf_counter()
+    counts = {'files': 0, 'ok': 0, 'cached': 0, 'errors': 0}
+
+    def record(path, cache_key, analysis=None, error=None, cached=False):
+        name = os.path.basename(path)
+        user_id = user_map.get(name) or f"batch:{batch_id}:{name}"
+        if error is not None:
+            counts['errors'] += 1
+            return {'file': name, 'user_id': user_id, 'status': 'error', 'error': error}
+        writer.add(user_id, analysis)
+        counts['ok'] += 1
+        counts['cached'] += int(cached)
+        response = analysis['response']
+        return {
+            'file': name,
+            'user_id': user_id,
+            'status': 'ok',
+            'cached': cached,
+            'content_hash': cache_key.rsplit(':', 1)[-1],
+            'ats_score': response['ats_score'],
+            'quality_score': response['quality_score'],
+            'overall_score': response['overall_score'],
+            'professional_level': response['professional_level'],
+            'skills': response['skills'],
+            'warnings': analysis.get('warnings', []),
+        }
+
+    # Hash everything first; identical files are analyzed once
+    pending = {}  # cache key -> [paths]
+    for path in paths:
+        counts['files'] += 1
+        try:
+            if os.path.getsize(path) > MAX_RESUME_FILE_SIZE:
+                yield record(path, '', error='File too large')
+                continue
+            key = _file_key(path)
+        except OSError as e:
+            yield record(path, '', error=f"Could not read file: {e}")
+            continue
+        pending.setdefault(key, []).append(path)
+
+    misses = {}
+    for key, group in pending.items():
+        analysis = get_cached_analysis(key)
+        if analysis is None:
+            misses[key] = group
+            continue
+        for path in group:
+            yield record(path, key, analysis, cached=True)
+
+    for key, outcome in _analyze_misses(misses, workers):
+        if 'analysis' in outcome:
+            store_analysis(key, outcome['analysis'], ANALYZER_VERSION)
+        for i, path in enumerate(misses[key]):
+            if 'analysis' in outcome:
+                # Duplicates after the first are effectively cache hits
+                yield record(path, key, outcome['analysis'], cached=i > 0)
+            else:
+                yield record(path, key, error=outcome['error'])
+
+    writer.flush()
+    yield {'summary': {
+        'batch_id': batch_id,
+        'files': counts['files'],
+        'ok': counts['ok'],
+        'cached': counts['cached'],
+        'errors': counts['errors'],
+        'rows_written': writer.written,
+        'seconds': round(time.perf_counter() - started, 3),
+    }}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Score a directory of resumes; NDJSON on stdout.')
+    parser.add_argument('directory')
+    parser.add_argument('--user-map', help='JSON file mapping file name -> user id')
+    parser.add_argument('--role', default='', help='target role recorded with each result')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS)
+    args = parser.parse_args(argv)
+
+    from flask import Flask
+    from database.db import close_db
+    from database.migrations import run_migrations
+
+    user_map = {}
+    if args.user_map:
+        with open(args.user_map, 'r', encoding='utf-8') as f:
+            user_map = json.load(f)
+
+    out = sys.stdout
+    app = Flask(__name__)
+    app.teardown_appcontext(close_db)
+    # Service code logs with print(); keep stdout clean for the NDJSON stream
+    with redirect_stdout(sys.stderr), app.app_context():
+        run_migrations()
+        errors = 0
+        for item in iter_batch(list_resume_files(args.directory), user_map=user_map,
+                               target_role=args.role, workers=args.workers):
+            out.write(json.dumps(item) + '\n')
+            out.flush()
+            if item.get('status') == 'error':
+                errors += 1
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -494,6 +494,12 @@ def get_role_skills(role):
     return ROLE_SKILL_REQUIREMENTS.get(role, {})
 
 
+def recommend_roles(user_skills, k=5, level=None):
+    """Top-k roles across all interests by TF-IDF similarity to the user's skills."""
+    from services.role_index import recommend_roles as _recommend_roles
+    return _recommend_roles(user_skills, k=k, level=level)
+
+
 def get_all_roles():
     """Get all available roles."""
     roles = []
@@ -523,11 +529,11 @@ def calculate_career_confidence(interest, level, user_skills):
     if user_skills:
         role_data = get_career_recommendation(interest, level)
         if role_data and 'role' in role_data:
-            role_skills = get_role_skills(role_data['role'])
-            matched_skills = len([s for s in user_skills if any(
-                s.lower() in skill.lower() for skill in 
-                role_skills.get('core', []) + role_skills.get('technical', [])
-            )])
+            from services.role_index import ROLE_INDEX
+            _, matched_user = ROLE_INDEX.match_skills(
+                role_data['role'], user_skills, tiers=('core', 'technical')
+            )
+            matched_skills = len(matched_user)
             
             if matched_skills > 0:
                 adjustment = min(matched_skills * 2, 10)
@@ -670,13 +676,15 @@ def get_career_guidance(interest, level, user_skills):
     missing_skills = []
     
     if role_skills:
+        from services.role_index import ROLE_INDEX
         core_skills = role_skills.get('core', [])
         supporting_skills = role_skills.get('supporting', [])
         optional_skills = role_skills.get('optional', [])
         all_required = core_skills + supporting_skills + optional_skills
+        matched, _ = ROLE_INDEX.match_skills(role, user_skills)
         
         for skill in all_required:
-            if any(s.lower() in skill.lower() or skill.lower() in s.lower() for s in user_skills):
+            if skill in matched:
                 matched_skills.append(skill)
             else:
                 missing_skills.append(skill)
@@ -0,0 +1,106 @@
+"""
+The logged-in user as templates see it.
+
+inject_user used to query ``users`` and define a new CurrentUser class on
+every render_template call, so even static pages hit the database for a
+logged-in visitor.  Templates now get one lazy CurrentUser per request
+(kept on flask.g) that loads nothing until a template reads an attribute.
+
+Loads go through a small process-local TTL cache of slim user records
+(the columns pages actually show), so most requests never touch SQLite
+for the header.  update_user_profile and tier changes call
+invalidate_user(); other worker processes see those changes within
+CURRENT_USER_CACHE_TTL seconds.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import g, session
+
+from config import CURRENT_USER_CACHE_TTL
+
+_SLIM_COLUMNS = 'id, full_name, email, tier, is_premium, profile_image_path, created_at'
+_MAX_ENTRIES = 10000
+
+_cache: Dict[str, tuple] = {}  # str(user_id) -> (expires monotonic, record or None)
+_lock = threading.Lock()
+
+
+def load_slim_user(user_id) -> Optional[Dict]:
+    """Slim user record (dict) for ``user_id``, or None if there is no such user."""
+    if user_id is None:
+        return None
+    key = str(user_id)
+    now = time.monotonic()
+    if CURRENT_USER_CACHE_TTL > 0:
+        with _lock:
+            entry = _cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+    from database.db import get_db
+    row = get_db().execute(f'SELECT {_SLIM_COLUMNS} FROM users WHERE id = ?', (user_id,)).fetchone()
+    record = dict(row) if row else None
+
+    if CURRENT_USER_CACHE_TTL > 0:
+        with _lock:
+            if len(_cache) >= _MAX_ENTRIES:
+                for stale in [k for k, (expires, _) in _cache.items() if expires <= now]:
+                    del _cache[stale]
+                if len(_cache) >= _MAX_ENTRIES:
+                    _cache.clear()
+            _cache[key] = (now + CURRENT_USER_CACHE_TTL, record)
+    return record
+
+
+def invalidate_user(user_id) -> None:
+    """Forget the cached record after the user's row changes (this process only)."""
+    with _lock:
+        _cache.pop(str(user_id), None)
+
+
+class CurrentUser:
+    """Lazy template view of the logged-in user; loads on first attribute access."""
+
+    _UNLOADED = object()
+
+    def __init__(self, user_id=None):
+        self._user_id = user_id
+        self._user = self._UNLOADED if user_id is not None else None
+
+    @property
+    def user(self) -> Optional[Dict]:
+        if self._user is self._UNLOADED:
+            self._user = load_slim_user(self._user_id)
+        return self._user
+
+    @property
+    def is_authenticated(self):
+        return self.user is not None
+
+    @property
+    def name(self):
+        return self.user['full_name'] if self.user else None
+
+    @property
+    def email(self):
+        return self.user['email'] if self.user else None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        user = self.user
+        if user and name in user:
+            return user[name]
+        return None
+
+
+def get_current_user() -> CurrentUser:
+    """This request's CurrentUser (created once, loaded lazily)."""
+    user_id = session.get('user_id')
+    current = getattr(g, '_current_user', None)
+    if current is None or current._user_id != user_id:  # login/logout mid-request
+        current = g._current_user = CurrentUser(user_id)
+    return current
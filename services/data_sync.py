@@ -1,67 +1,101 @@
 """Keeps dependent modules in sync when user data changes."""
 
 import json
+import time
 from datetime import datetime
 from database.db import get_db
+from services import user_snapshot
+from services.score_history import record_score
 
 
-def refresh_user_data(user_id):
-    """Reload profile and regenerate roadmap, insights, and actions."""
+def refresh_user_data(user_id, queued_at=None, coalesced=1, sync_type='FULL_REFRESH',
+                      return_profile=True, force=False):
+    """
+    Reload profile and regenerate roadmap, insights, and actions.
+
+    Only artifacts whose declared inputs changed since the last refresh
+    are regenerated (services.derived_state), and their rows are written
+    as diffs.  ``force`` regenerates everything.
+
+    Usually run by services.refresh_queue; ``queued_at`` (epoch seconds of
+    the first pending mark) and ``coalesced`` (marks folded into this run)
+    are recorded on the data_sync_log row with the run's duration.
+    """
     from services.profile_service import get_user_profile
     from services.roadmap_service import generate_roadmap
     from services.insight_service import generate_insights
     from services.action_guidance_service import ActionGuidanceService
+    from services.derived_state import (
+        artifact_fingerprints, describe_diff, save_fingerprint, stale_artifacts,
+    )
     
     db = get_db()
+    started = time.time()
+    queue_latency_ms = int((started - queued_at) * 1000) if queued_at else 0
     
     try:
         profile = get_user_profile(user_id)
         profile_data = profile['profile']
         stats = profile['stats']
         
+        fingerprints = artifact_fingerprints(profile_data, stats)
+        stale = stale_artifacts(db, user_id, fingerprints, force=force)
+        diffs = {}
+        
         # Regenerate roadmap
-        roadmap_items = generate_roadmap(profile_data, stats)
-        _save_roadmap(db, user_id, roadmap_items)
+        if 'roadmap' in stale:
+            roadmap_items = generate_roadmap(profile_data, stats)
+            diffs['roadmap'] = _save_roadmap(db, user_id, roadmap_items)
         
         # Regenerate insights
-        insights_result = generate_insights(
-            profile_data, 
-            stats, 
-            profile.get('skills', {}),
-            resume_data=None
-        )
+        if 'insights' in stale:
+            insights_result = generate_insights(
+                profile_data, 
+                stats, 
+                profile.get('skills', {}),
+                resume_data=None
+            )
 
-        # Convert recommendations to the list format _save_insights expects
-        insight_items = []
-        for rec in insights_result.get('recommendations', []):
-            insight_items.append({
-                'text': rec.get('description', rec.get('title', '')),
-                'category': 'recommendation',
-                'priority': 1,
-            })
-        _save_insights(db, user_id, insight_items)
+            # Convert recommendations to the list format _save_insights expects
+            insight_items = []
+            for rec in insights_result.get('recommendations', []):
+                insight_items.append({
+                    'text': rec.get('description', rec.get('title', '')),
+                    'category': 'recommendation',
+                    'priority': 1,
+                })
+            diffs['insights'] = _save_insights(db, user_id, insight_items)
         
         # 4. Generate action items from profile
-        # ActionGuidanceService expects skill_gaps as a dict with 'core_gaps' key
-        skill_gaps = profile_data.get('skill_gaps', {'core_gaps': []})
-        if isinstance(skill_gaps, list):
-            skill_gaps = {'core_gaps': [{'skill': g} for g in skill_gaps]}
-        learning_path = profile_data.get('learning_path', [])
-        # generate_action_plan saves to DB internally via _save_action_plan
-        # so we do NOT call _save_actions on its result
-        ActionGuidanceService.generate_action_plan(user_id, profile_data, skill_gaps, learning_path)
+        if 'actions' in stale:
+            # ActionGuidanceService expects skill_gaps as a dict with 'core_gaps' key
+            skill_gaps = profile_data.get('skill_gaps', {'core_gaps': []})
+            if isinstance(skill_gaps, list):
+                skill_gaps = {'core_gaps': [{'skill': g} for g in skill_gaps]}
+            learning_path = profile_data.get('learning_path', [])
+            actions = ActionGuidanceService.build_action_plan(profile_data, skill_gaps, learning_path)
+            diffs['actions'] = ActionGuidanceService._save_action_plan(user_id, actions, commit=False)
+        
+        for name in stale:
+            save_fingerprint(db, user_id, name, fingerprints[name])
         
         # 5. Update sync metadata
         now = datetime.utcnow().isoformat()
+        modules_updated = ','.join(describe_diff(name, counts) for name, counts in diffs.items()) or 'none'
         db.execute('''
             INSERT OR REPLACE INTO data_sync_log 
-            (user_id, last_sync, sync_type, modules_updated)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, now, 'FULL_REFRESH', 'roadmap,insights,actions'))
+            (user_id, last_sync, sync_type, modules_updated, queue_latency_ms, duration_ms, coalesced)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (user_id, now, sync_type, modules_updated,
+              queue_latency_ms, int((time.time() - started) * 1000), coalesced))
+        
+        # Re-read inside the write transaction so no profile write can land between
+        # building the snapshot and clearing its stale flag
+        user_snapshot.rebuild(db, user_id)
         
         db.commit()
         
-        return get_user_profile(user_id)
+        return get_user_profile(user_id) if return_profile else None
         
     except Exception as e:
         print(f"Error refreshing user data for {user_id}: {e}")
@@ -128,11 +162,17 @@ def sync_resume_analysis(user_id, analysis_result):
                 now,
                 now
             ))
+            record_score(db, user_id, metrics.get('overall_health', 0),
+                         ats=metrics.get('ats_score'), keyword=metrics.get('keyword_score'),
+                         formatting=metrics.get('formatting_score'), source='sync')
         
         db.commit()
         
-        # Refresh all modules with new data
-        return refresh_user_data(user_id)
+        # Refresh all modules with new data (debounced, off the request path)
+        from services.profile_service import get_user_profile
+        from services.refresh_queue import schedule_refresh
+        schedule_refresh(user_id, 'resume')
+        return get_user_profile(user_id)
         
     except Exception as e:
         print(f"Error syncing resume analysis for {user_id}: {e}")
@@ -186,10 +226,14 @@ def sync_skill_update(user_id, skill_name, proficiency_level, tasks_completed=No
             WHERE user_id = ?
         ''', (xp_earned, 1, now, user_id))
         
+        user_snapshot.invalidate(db, user_id)
         db.commit()
         
         # Refresh modules - new skill progress may unlock new actions
-        return refresh_user_data(user_id)
+        from services.profile_service import get_user_profile
+        from services.refresh_queue import schedule_refresh
+        schedule_refresh(user_id, 'skill')
+        return get_user_profile(user_id)
         
     except Exception as e:
         print(f"Error syncing skill update for {user_id}: {e}")
@@ -243,10 +287,14 @@ def sync_action_completion(user_id, action_id):
             WHERE user_id = ?
         ''', (xp_reward, now, user_id))
         
+        user_snapshot.invalidate(db, user_id)
         db.commit()
         
         # Regenerate actions - previous one is done, new ones should be available
-        return refresh_user_data(user_id)
+        from services.profile_service import get_user_profile
+        from services.refresh_queue import schedule_refresh
+        schedule_refresh(user_id, 'action')
+        return get_user_profile(user_id)
         
     except Exception as e:
         print(f"Error syncing action completion for {user_id}: {e}")
@@ -260,50 +308,34 @@ def sync_action_completion(user_id, action_id):
 # ============================================================================
 
 def _save_roadmap(db, user_id, roadmap_items):
-    """Store generated roadmap in database."""
+    """Store generated roadmap in database as a row diff keyed on title."""
+    from services.derived_state import apply_row_diff
     now = datetime.utcnow().isoformat()
-    
-    # Clear old roadmap items for this user
-    db.execute('DELETE FROM user_roadmap WHERE user_id = ?', (user_id,))
-    
-    # Insert new items
-    for idx, item in enumerate(roadmap_items):
-        db.execute('''
-            INSERT INTO user_roadmap 
-            (user_id, title, description, duration, xp, order_num, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            user_id,
-            item.get('title', ''),
-            item.get('description', ''),
-            item.get('duration', ''),
-            item.get('xp', 0),
-            idx,
-            now
-        ))
+    rows = [{
+        'title': item.get('title', ''),
+        'description': item.get('description', ''),
+        'duration': item.get('duration', ''),
+        'xp': item.get('xp', 0),
+        'order_num': idx,
+        'created_at': now,
+    } for idx, item in enumerate(roadmap_items)]
+    return apply_row_diff(db, 'user_roadmap', user_id, rows,
+                          key=('title',), fields=('description', 'duration', 'xp', 'order_num'))
 
 
 def _save_insights(db, user_id, insights):
-    """Store generated insights in database."""
+    """Store generated insights in database as a row diff keyed on text."""
+    from services.derived_state import apply_row_diff
     now = datetime.utcnow().isoformat()
-    
-    # Clear old insights
-    db.execute('DELETE FROM user_insights WHERE user_id = ?', (user_id,))
-    
-    # Insert new insights
-    for idx, insight in enumerate(insights or []):
-        db.execute('''
-            INSERT INTO user_insights 
-            (user_id, insight_text, category, priority, order_num, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            user_id,
-            insight.get('text', ''),
-            insight.get('category', 'general'),
-            insight.get('priority', 1),
-            idx,
-            now
-        ))
+    rows = [{
+        'insight_text': insight.get('text', ''),
+        'category': insight.get('category', 'general'),
+        'priority': insight.get('priority', 1),
+        'order_num': idx,
+        'created_at': now,
+    } for idx, insight in enumerate(insights or [])]
+    return apply_row_diff(db, 'user_insights', user_id, rows,
+                          key=('insight_text',), fields=('category', 'priority', 'order_num'))
 
 
 def _save_actions(db, user_id, actions):
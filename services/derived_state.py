@@ -0,0 +1,155 @@
+"""
+Input fingerprints and row diffs for the derived per-user modules.
+
+Each derived artifact (roadmap, insights, actions) declares the profile
+and stats fields its generator actually reads.  refresh_user_data hashes
+those inputs, compares the hash with the one stored in derived_state, and
+regenerates only the artifacts whose inputs changed: saving a new daily
+goal no longer rebuilds insights, and earning XP below a level threshold
+rebuilds nothing.
+
+Regenerated rows are written with apply_row_diff(): rows are matched on a
+natural key, changed rows are updated in place, new rows inserted and
+stale rows deleted.  Row ids stay stable, and per-row state the generator
+does not own (action_plans.status, completed_date) survives a refresh.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+
+def _roadmap_inputs(profile_data: Dict, stats: Dict) -> Dict:
+    from services.roadmap_service import _infer_experience_level
+    phase = profile_data.get('phase', 'college')
+    return {
+        'skills': profile_data.get('skills', []),
+        'goals': profile_data.get('goals', []),
+        'interests': profile_data.get('interests', []),
+        'phase': phase,
+        'daily_time': profile_data.get('daily_time', 1),
+        # Raw XP/task counts only matter through the level they map to
+        'experience_level': _infer_experience_level(phase, stats),
+    }
+
+
+def _insights_inputs(profile_data: Dict, stats: Dict) -> Dict:
+    return {
+        'skills': profile_data.get('skills', []),
+        'goals': profile_data.get('goals', []),
+        'stats': {key: stats.get(key, 0) for key in ('career_readiness', 'current_streak', 'tasks_completed')},
+        'resume_data': None,  # refresh_user_data does not feed resume data to insights
+    }
+
+
+def _actions_inputs(profile_data: Dict, stats: Dict) -> Dict:
+    return {
+        'skill_gaps': profile_data.get('skill_gaps', {'core_gaps': []}),
+        'learning_path': profile_data.get('learning_path', []),
+        'available_hours_per_week': profile_data.get('available_hours_per_week', 10),
+        'target_timeline_months': profile_data.get('target_timeline_months', 6),
+    }
+
+
+# Artifact -> function(profile_data, stats) returning exactly what its generator reads
+ARTIFACT_INPUTS: Dict[str, Callable[[Dict, Dict], Dict]] = {
+    'roadmap': _roadmap_inputs,
+    'insights': _insights_inputs,
+    'actions': _actions_inputs,
+}
+
+
+def fingerprint(inputs: Dict) -> str:
+    payload = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def artifact_fingerprints(profile_data: Dict, stats: Dict) -> Dict[str, str]:
+    return {name: fingerprint(inputs(profile_data, stats or {})) for name, inputs in ARTIFACT_INPUTS.items()}
+
+
+def load_fingerprints(db, user_id: str) -> Dict[str, str]:
+    rows = db.execute(
+        'SELECT artifact, fingerprint FROM derived_state WHERE user_id = ?', (user_id,)
+    ).fetchall()
+    return {row['artifact']: row['fingerprint'] for row in rows}
+
+
+def save_fingerprint(db, user_id: str, artifact: str, value: str) -> None:
+    db.execute('''
+        INSERT INTO derived_state (user_id, artifact, fingerprint, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id, artifact) DO UPDATE SET
+            fingerprint = excluded.fingerprint,
+            updated_at = excluded.updated_at
+    ''', (user_id, artifact, value, datetime.utcnow().isoformat()))
+
+
+def stale_artifacts(db, user_id: str, current: Dict[str, str], force: bool = False) -> List[str]:
+    """Artifacts whose stored fingerprint differs from ``current`` (all of them when forced)."""
+    if force:
+        return list(current)
+    stored = load_fingerprints(db, user_id)
+    return [name for name, value in current.items() if stored.get(name) != value]
+
+
+def apply_row_diff(db, table: str, user_id: str, rows: Iterable[Dict],
+                   key: Sequence[str], fields: Sequence[str],
+                   touch: Optional[str] = None,
+                   deletable: Optional[Callable[[Dict], bool]] = None) -> Dict[str, int]:
+    """
+    Make ``table``'s rows for ``user_id`` match ``rows`` with minimal writes.
+
+    Rows match on the ``key`` columns (repeated keys pair up in order).
+    A matched row is updated only when one of ``fields`` differs; ``touch``
+    names a timestamp column set on update.  New rows are inserted with
+    every column in their dict, so insert-only columns (created_at,
+    target_date) ride along.  Unmatched existing rows are deleted unless
+    ``deletable`` says to keep them.
+
+    Returns {'inserted', 'updated', 'deleted', 'unchanged'} counts.
+    """
+    existing = db.execute(
+        f'SELECT * FROM {table} WHERE user_id = ? ORDER BY id', (user_id,)
+    ).fetchall()
+    by_key: Dict[tuple, List] = {}
+    for row in existing:
+        by_key.setdefault(tuple(row[k] for k in key), []).append(row)
+
+    counts = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    now = datetime.utcnow().isoformat()
+    for new in rows:
+        matches = by_key.get(tuple(new[k] for k in key))
+        if matches:
+            current = matches.pop(0)
+            changed = [f for f in fields if current[f] != new[f]]
+            if not changed:
+                counts['unchanged'] += 1
+                continue
+            assignments = [f'{f} = ?' for f in changed]
+            params = [new[f] for f in changed]
+            if touch:
+                assignments.append(f'{touch} = ?')
+                params.append(now)
+            db.execute(f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?", (*params, current['id']))
+            counts['updated'] += 1
+        else:
+            values = {'user_id': user_id, **new}
+            db.execute(
+                f"INSERT INTO {table} ({', '.join(values)}) VALUES ({', '.join('?' for _ in values)})",
+                tuple(values.values())
+            )
+            counts['inserted'] += 1
+
+    stale = [row['id'] for rows_left in by_key.values() for row in rows_left
+             if deletable is None or deletable(dict(row))]
+    if stale:
+        db.executemany(f'DELETE FROM {table} WHERE id = ?', [(row_id,) for row_id in stale])
+        counts['deleted'] = len(stale)
+    return counts
+
+
+def describe_diff(name: str, counts: Dict[str, int]) -> str:
+    """Compact log form: 'roadmap:+1~2-0'."""
+    return f"{name}:+{counts['inserted']}~{counts['updated']}-{counts['deleted']}"
@@ -0,0 +1,194 @@
+"""
+Process-pool resume text extraction.
+
+PyPDF2 and python-docx run in worker processes instead of the request
+thread, so one pathological file cannot pin a web worker or balloon its
+RSS.  Each job has a wall-clock timeout, workers run under an RLIMIT_AS
+cap, and each worker is recycled after EXTRACTION_MAX_TASKS_PER_CHILD jobs.
+
+Workers report every PDF page to a sidecar file as they go.  When a job
+times out, the request gets the pages extracted so far plus a
+TruncationWarning; callers must not cache analyses of partial text.
+A stuck worker cannot be cancelled, so the pool is torn down and rebuilt
+on the next call.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from config import (
+    EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, EXTRACTION_MAX_TASKS_PER_CHILD,
+    EXTRACTION_MEMORY_LIMIT_MB,
+)
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False  # Windows: no RLIMIT_AS, timeouts still apply
+
+# Cheap formats are not worth a process hop
+_INLINE_EXTENSIONS = {'.txt', '.text'}
+
+_executor = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {'jobs': 0, 'inline': 0, 'timeouts': 0, 'crashes': 0, 'pool_restarts': 0}
+
+
+class TruncationWarning(str):
+    """Warning text that marks extracted text as partial (timeout or crash)."""
+
+
+def is_partial(warnings) -> bool:
+    """True when extract_text() returned only part of the document."""
+    return any(isinstance(warning, TruncationWarning) for warning in warnings or ())
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+# ==================== WORKER SIDE ====================
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Cap the worker's address space so a runaway parse fails fast."""
+    if RESOURCE_AVAILABLE and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            print(f"Could not set extraction memory limit: {e}")
+
+
+def _extract_job(file_path: str, progress_path: str) -> Tuple[Optional[str], List[str]]:
+    """Runs in a worker process."""
+    from services.resume_analysis_enhanced import ResumeTextExtractor
+
+    def on_page(index, text):
+        with open(progress_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'page': index, 'text': text}) + '\n')
+
+    try:
+        return ResumeTextExtractor.extract_from_file(file_path, on_page=on_page)
+    except MemoryError:
+        return None, [f"File needs more than {EXTRACTION_MEMORY_LIMIT_MB} MB to parse"]
+
+
+# ==================== PARENT SIDE ====================
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=EXTRACTION_WORKERS,
+                # spawn: safe under threaded web servers and required for recycling.
+                # Workers re-import the main script as __mp_main__ (app.py skips its startup)
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(EXTRACTION_MEMORY_LIMIT_MB,),
+                max_tasks_per_child=EXTRACTION_MAX_TASKS_PER_CHILD,
+            )
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Kill a pool whose worker is stuck or dead; the next job builds a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not executor:
+            return  # another thread already replaced it
+        _executor = None
+    _count('pool_restarts')
+    terminate_executor(executor)
+
+
+def terminate_executor(executor: ProcessPoolExecutor) -> None:
+    """Shut a pool down without waiting on stuck or dead workers."""
+    # Running tasks cannot be cancelled, so stop the processes directly
+    for process in list((getattr(executor, '_processes', None) or {}).values()):
+        try:
+            process.kill()
+        except Exception:
+            pass
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_partial_pages(progress_path: str) -> List[str]:
+    pages = {}
+    try:
+        with open(progress_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # last line may be half-written
+                pages[entry['page']] = entry['text']
+    except OSError:
+        return []
+    return [pages[i] for i in sorted(pages)]
+
+
+def _partial_result(progress_path: str, reason: str) -> Tuple[Optional[str], List[str]]:
+    pages = _read_partial_pages(progress_path)
+    if not pages:
+        return None, [TruncationWarning(reason)]
+    return '\n'.join(pages), [TruncationWarning(f"{reason} - showing the first {len(pages)} page(s)")]
+
+
+def extract_text(file_path: str, timeout: float = EXTRACTION_TIMEOUT) -> Tuple[Optional[str], List[str]]:
+    """
+    Drop-in for ResumeTextExtractor.extract_from_file() that runs in the pool.
+
+    Returns (text, warnings); text may be partial if the timeout hit or the
+    worker crashed, in which case is_partial(warnings) is True.
+    """
+    from services.resume_analysis_enhanced import ResumeTextExtractor
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if EXTRACTION_WORKERS <= 0 or ext in _INLINE_EXTENSIONS:
+        _count('inline')
+        return ResumeTextExtractor.extract_from_file(file_path)
+
+    _count('jobs')
+    progress_path = file_path + '.pages'
+    try:
+        executor = _get_executor()
+        try:
+            future = executor.submit(_extract_job, file_path, progress_path)
+        except RuntimeError:
+            # Pool was discarded by another thread between get and submit
+            executor = _get_executor()
+            future = executor.submit(_extract_job, file_path, progress_path)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            _count('timeouts')
+            _discard_executor(executor)
+            return _partial_result(progress_path, f"Extraction timed out after {timeout:g}s")
+        except BrokenProcessPool:
+            # Worker died, usually from hitting the memory cap
+            _count('crashes')
+            _discard_executor(executor)
+            return _partial_result(progress_path, "Extraction worker crashed (file too large or malformed)")
+    finally:
+        try:
+            os.remove(progress_path)
+        except OSError:
+            pass
+
+
+def get_extraction_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['workers'] = EXTRACTION_WORKERS
+    stats['timeout_s'] = EXTRACTION_TIMEOUT
+    stats['memory_limit_mb'] = EXTRACTION_MEMORY_LIMIT_MB if RESOURCE_AVAILABLE else None
+    return stats
@@ -0,0 +1,108 @@
+"""
+Best-fit career fields for one resume in a single pass.
+
+FIELD_WEIGHTS is a field x keyword matrix built once at import: core
+keywords weigh 1.0, supporting keywords 0.5, and each row is normalised
+so a resume with every keyword scores 100.  rank_fields() runs the skill
+automaton over the resume once, turns the hits into a presence vector
+and multiplies it against the matrix, so scoring every field costs one
+matrix-vector product instead of one full ResumeAnalyzer run per field.
+
+NumPy is used when installed; otherwise the same product is computed
+over sparse per-field weight dicts.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from services.field_registry import COMPILED_FIELDS
+from services.skill_matcher import find_skills
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+CORE_WEIGHT = 1.0
+SUPPORTING_WEIGHT = 0.5
+
+FIELD_KEYS = list(COMPILED_FIELDS)
+# Column order shared by the matrix and resume vectors
+FIT_TERMS = sorted({
+    term
+    for field in COMPILED_FIELDS.values()
+    for term in field.core_keywords | field.supporting_keywords
+})
+_TERM_INDEX = {term: i for i, term in enumerate(FIT_TERMS)}
+
+# Sparse rows: field key -> {term index: weight}
+_ROWS: Dict[str, Dict[int, float]] = {}
+for _key, _field in COMPILED_FIELDS.items():
+    _row = {_TERM_INDEX[t]: SUPPORTING_WEIGHT for t in _field.supporting_keywords}
+    _row.update({_TERM_INDEX[t]: CORE_WEIGHT for t in _field.core_keywords})
+    _ROWS[_key] = _row
+_ROW_TOTALS = [sum(_ROWS[key].values()) or 1.0 for key in FIELD_KEYS]
+
+if NUMPY_AVAILABLE:
+    FIELD_WEIGHTS = np.zeros((len(FIELD_KEYS), len(FIT_TERMS)), dtype=np.float32)
+    for _f, _key in enumerate(FIELD_KEYS):
+        for _t, _w in _ROWS[_key].items():
+            FIELD_WEIGHTS[_f, _t] = _w
+    FIELD_WEIGHTS /= np.asarray(_ROW_TOTALS, dtype=np.float32)[:, None]
+else:
+    FIELD_WEIGHTS = None
+
+
+def resume_terms(resume_text: str, skills_list: Optional[Iterable[str]] = None) -> set:
+    """Field keywords present in the text (whole words) or in the declared skills."""
+    present = {m.term for m in find_skills(resume_text) if m.term in _TERM_INDEX}
+    for skill in skills_list or ():
+        skill = skill.lower().strip()
+        if skill in _TERM_INDEX:
+            present.add(skill)
+    return present
+
+
+def _scores(present: set) -> List[float]:
+    columns = [_TERM_INDEX[t] for t in present]
+    if NUMPY_AVAILABLE:
+        vector = np.zeros(len(FIT_TERMS), dtype=np.float32)
+        vector[columns] = 1.0
+        return (FIELD_WEIGHTS @ vector * 100).tolist()
+    return [
+        sum(_ROWS[key].get(c, 0.0) for c in columns) / _ROW_TOTALS[f] * 100
+        for f, key in enumerate(FIELD_KEYS)
+    ]
+
+
+def rank_fields(resume_text: str, skills_list: Optional[Iterable[str]] = None,
+                max_gaps: int = 5) -> List[Dict]:
+    """
+    Every field scored against the resume, best fit first.
+
+    Returns: [{
+        'field': key, 'name': display name, 'score': int (0-100),
+        'core_coverage': int (% of core keywords present),
+        'matched_core': [...], 'missing_core': [... up to max_gaps],
+        'missing_supporting': [... up to max_gaps]
+    }, ...]
+    """
+    present = resume_terms(resume_text, skills_list)
+    scores = _scores(present)
+
+    ranked = []
+    for f, key in enumerate(FIELD_KEYS):
+        field = COMPILED_FIELDS[key]
+        matched_core = field.core_keywords & present
+        ranked.append({
+            'field': key,
+            'name': field.name,
+            'score': int(round(scores[f])),
+            'core_coverage': int(len(matched_core) / len(field.core_keywords) * 100) if field.core_keywords else 0,
+            'matched_core': sorted(matched_core),
+            'missing_core': sorted(field.core_keywords - present)[:max_gaps],
+            'missing_supporting': sorted(field.supporting_keywords - present)[:max_gaps],
+        })
+
+    ranked.sort(key=lambda item: (-item['score'], item['field']))
+    return ranked
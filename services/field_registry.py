@@ -0,0 +1,96 @@
+"""
+Compiled field registry.
+
+Each FieldConfig is compiled once at import into a CompiledField: frozen
+keyword sets, an Aho-Corasick automaton over the core and supporting
+keywords, one over the impact-metric phrases, and a regex per standard
+section header.  The field-aware analyzers read these shared, read-only
+objects instead of re-scanning keyword lists with ``in`` loops on every
+resume, so they are safe to share across threads.
+"""
+
+import re
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+from services.field_config import FIELD_CONFIGS, FieldConfig
+from services.skill_matcher import AhoCorasick
+
+# Standard section headers ATS systems look for
+SECTION_HEADERS = {
+    'contact': ['contact', 'personal information'],
+    'summary': ['summary', 'profile', 'objective', 'about'],
+    'experience': ['experience', 'work history', 'employment', 'professional experience'],
+    'education': ['education', 'academic', 'qualifications'],
+    'skills': ['skills', 'technical skills', 'competencies', 'expertise'],
+    'projects': ['projects', 'portfolio', 'work samples']
+}
+
+# Substring match, like the original ``header in text_lower`` checks
+_SECTION_PATTERNS = {
+    section: re.compile('|'.join(re.escape(h) for h in headers))
+    for section, headers in SECTION_HEADERS.items()
+}
+
+DEFAULT_FIELD = 'software_backend'
+
+
+class KeywordHits:
+    """Field keywords found in one text, with whole-word occurrence counts."""
+
+    __slots__ = ('core', 'supporting', 'counts')
+
+    def __init__(self, core: Set[str], supporting: Set[str], counts: Dict[str, int]):
+        self.core = core
+        self.supporting = supporting
+        self.counts = counts
+
+
+class CompiledField:
+    """Immutable, precompiled matchers for one FieldConfig."""
+
+    def __init__(self, key: str, config: FieldConfig):
+        self.key = key
+        self.config = config
+        self.name = config.name
+        self.core_keywords: FrozenSet[str] = frozenset(k.lower() for k in config.core_keywords)
+        self.supporting_keywords: FrozenSet[str] = frozenset(k.lower() for k in config.supporting_keywords)
+        self.required_sections: Tuple[str, ...] = tuple(config.required_sections)
+        self.impact_metrics: Tuple[str, ...] = tuple(m.lower() for m in config.impact_metrics)
+
+        # Deterministic "top keyword" subsets (sets have no stable order)
+        ranked = sorted(self.core_keywords)
+        self.stuffing_keywords: FrozenSet[str] = frozenset(ranked[:10])
+        self.context_keywords: FrozenSet[str] = frozenset(ranked[:20])
+
+        self._keywords = AhoCorasick(self.core_keywords | self.supporting_keywords)
+        self._metrics = AhoCorasick(set(self.impact_metrics))
+        self.section_patterns = {
+            section: _SECTION_PATTERNS[section]
+            for section in self.required_sections if section in _SECTION_PATTERNS
+        }
+
+    def keyword_hits(self, text_lower: str) -> KeywordHits:
+        """Core and supporting keywords present in ``text_lower``, in one pass."""
+        counts: Dict[str, int] = {}
+        for match in self._keywords.find_words(text_lower):
+            counts[match.term] = counts.get(match.term, 0) + 1
+        found = set(counts)
+        return KeywordHits(found & self.core_keywords, found & self.supporting_keywords, counts)
+
+    def impact_metrics_found(self, text_lower: str) -> Set[str]:
+        """Impact-metric phrases that occur anywhere in ``text_lower``."""
+        return {term for _, _, term in self._metrics.iter_matches(text_lower)}
+
+    def has_section(self, section: str, text_lower: str) -> bool:
+        pattern = self.section_patterns.get(section) or _SECTION_PATTERNS.get(section)
+        return bool(pattern and pattern.search(text_lower))
+
+
+COMPILED_FIELDS: Dict[str, CompiledField] = {
+    key: CompiledField(key, config) for key, config in FIELD_CONFIGS.items()
+}
+
+
+def get_compiled_field(field_key: Optional[str]) -> CompiledField:
+    """Compiled field for a key; unknown keys fall back like get_field_config()."""
+    return COMPILED_FIELDS.get(field_key) or COMPILED_FIELDS[DEFAULT_FIELD]
@@ -0,0 +1,218 @@
+"""
+Conditional GET support for read-mostly API endpoints.
+
+``@conditional(validator)`` runs a cheap validator before the view.  The
+validator reads the ``updated_at`` columns (or other version markers) of
+the rows the view depends on and returns ``(parts, last_modified)``:
+``parts`` is any JSON-serialisable value that changes whenever the
+response would, and ``last_modified`` is an ISO timestamp or None.  The
+ETag hashes those parts together with the request path and query, the
+user (for per-user data) and a fingerprint of the application code, so a
+deploy that changes a generator also changes its ETags.
+
+A request whose If-None-Match (or, without one, If-Modified-Since)
+matches gets a 304 before the view body runs.  Otherwise the view runs
+and its 200 response carries the ETag, Last-Modified and a ``private,
+no-cache`` Cache-Control, which add_header leaves in place (see
+owns_cache_policy).  Responses stay private even when the ETag is not
+per-user (per_user=False): every dynamic response may carry the refreshed
+session cookie, so shared caches must not store it.
+A validator that returns None or raises disables caching for that request.
+A view that answers with a fallback body (e.g. after an error) calls
+skip_cache_policy() so the fallback gets no validators: otherwise clients
+would keep revalidating it with 304s until the underlying rows changed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from typing import Callable, Optional
+
+from flask import g, make_response, request, session
+
+_SOURCE_DIRS = ('routes', 'services', 'database')
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the app's Python sources, identical across workers of one deploy."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for directory in _SOURCE_DIRS:
+        for base, _, files in sorted(os.walk(os.path.join(root, directory))):
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(base, name)
+                    digest.update(os.path.relpath(path, root).encode('utf-8'))
+                    with open(path, 'rb') as handle:
+                        digest.update(handle.read())
+    return digest.hexdigest()[:16]
+
+
+def make_etag(parts, per_user: bool = True) -> str:
+    scope = {
+        'code': code_version(),
+        'path': request.path,
+        'query': sorted(request.args.items(multi=True)),
+        'user': str(session.get('user_id')) if per_user else None,
+        'parts': parts,
+    }
+    payload = json.dumps(scope, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)  # stored timestamps are utcnow()
+    return parsed.replace(microsecond=0)
+
+
+def apply_cache_policy(response, etag: str, last_modified: Optional[datetime] = None):
+    """Set validator and revalidate-every-time headers and mark them as this response's own."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'  # may carry the session cookie
+    g._owns_cache_policy = True
+    return response
+
+
+def skip_cache_policy() -> None:
+    """Send this request's response without validators (fallback bodies)."""
+    g._skip_cache_policy = True
+
+
+def owns_cache_policy() -> bool:
+    """True when the view set its own Cache-Control (add_header must not overwrite it)."""
+    return getattr(g, '_owns_cache_policy', False)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if request.if_none_match:
+        # Weak comparison: gzipped responses carry W/"<etag>"
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(validator: Callable, per_user: bool = True):
+    """
+    Answer conditional GETs from ``validator`` without running the view.
+
+    ``validator`` takes the view's arguments and returns
+    ``(parts, last_modified)`` or None (no caching for this request).
+    ``per_user=False`` shares one ETag across users; it does not make the
+    response publicly cacheable.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                state = validator(*args, **kwargs)
+            except Exception as e:
+                print(f"Validator error for {request.endpoint}: {e}")
+                state = None
+            if state is None:
+                return view(*args, **kwargs)
+
+            parts, last_modified = state
+            etag = make_etag(parts, per_user)
+            last_modified = _parse_timestamp(last_modified)
+            if is_not_modified(etag, last_modified):
+                return apply_cache_policy(make_response('', 304), etag, last_modified)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not getattr(g, '_skip_cache_policy', False):
+                apply_cache_policy(response, etag, last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# ==================== VALIDATORS ====================
+
+def _latest(*values):
+    present = [value for value in values if value]
+    return max(present) if present else None
+
+
+def _profile_versions(db, user_id):
+    """updated_at of the user's onboarding profile and stats rows."""
+    row = db.execute('''
+        SELECT (SELECT updated_at FROM user_profiles WHERE user_id = ?) AS profile_at,
+               (SELECT updated_at FROM user_stats WHERE user_id = ?) AS stats_at
+    ''', (user_id, user_id)).fetchone()
+    return row['profile_at'], row['stats_at']
+
+
+def profile_validator(*args, **kwargs):
+    """For views computed from the onboarding profile only (projects, journey)."""
+    from database.db import get_db
+    user_id = session.get('user_id')
+    if not user_id:
+        return None
+    profile_at, _ = _profile_versions(get_db(), user_id)
+    return [profile_at], profile_at
+
+
+def roadmap_validator(*args, **kwargs):
+    """generate_roadmap reads the profile and the stats."""
+    from database.db import get_db
+    user_id = session.get('user_id')
+    if not user_id:
+        return None
+    profile_at, stats_at = _profile_versions(get_db(), user_id)
+    return [profile_at, stats_at], _latest(profile_at, stats_at)
+
+
+def insights_validator(*args, **kwargs):
+    """Profile, stats, skill progress, latest resume analysis and the activity heatmap."""
+    from database.db import get_db
+    user_id = session.get('user_id')
+    if not user_id:
+        return None
+    db = get_db()
+    profile_at, stats_at = _profile_versions(db, user_id)
+    row = db.execute('''
+        SELECT (SELECT MAX(last_updated) FROM skill_progress WHERE user_id = ?) AS skills_at,
+               (SELECT created_at FROM quick_analyses WHERE user_id = ?
+                ORDER BY created_at DESC LIMIT 1) AS resume_at,
+               (SELECT MAX(id) FROM activity_log) AS activity_id
+    ''', (user_id, str(user_id))).fetchone()
+    # The heatmap covers every user's activity over a window ending today
+    parts = [profile_at, stats_at, row['skills_at'], row['resume_at'], row['activity_id'],
+             datetime.utcnow().date().isoformat()]
+    return parts, None
+
+
+def actions_validator(*args, **kwargs):
+    """Stored action plan rows (generated from the profile when there are none)."""
+    from database.db import get_db
+    user_id = session.get('user_id')
+    if not user_id:
+        return None
+    db = get_db()
+    profile_at, _ = _profile_versions(db, user_id)
+    row = db.execute('''
+        SELECT COUNT(*) AS total, MAX(id) AS last_id, MAX(updated_at) AS updated_at,
+               MAX(completed_date) AS completed_at
+        FROM action_plans WHERE user_id = ?
+    ''', (user_id,)).fetchone()
+    parts = [profile_at, row['total'], row['last_id'], row['updated_at'], row['completed_at']]
+    return parts, None
+
+
+def static_data_validator(*args, **kwargs):
+    """Responses built only from in-code data: the code version alone decides."""
+    return [], None
@@ -109,11 +109,14 @@ def update_user_profile(user_id, profile_data):
             (len(skills), user_id)
         )
     
+    from services.user_snapshot import invalidate
+    invalidate(db, user_id)
     db.commit()
     
-    # Refresh dependent modules
-    from services.data_sync import refresh_user_data
-    return refresh_user_data(user_id)
+    # Refresh dependent modules (debounced, off the request path)
+    from services.refresh_queue import schedule_refresh
+    schedule_refresh(user_id, 'profile')
+    return get_user_profile(user_id)
 
 
 def _get_onboarding(db, user_id):
@@ -0,0 +1,172 @@
+"""
+Debounced, coalescing scheduler for data_sync.refresh_user_data.
+
+Profile saves, resume syncs, skill updates and action completions used to
+run the full refresh cascade (roadmap, insights, actions) inline, once per
+call.  Now they call schedule_refresh(), which only marks the user dirty.
+A scheduler thread in each app process runs one refresh per dirty user
+once REFRESH_DEBOUNCE_SECONDS pass without a new mark, or at the latest
+REFRESH_MAX_DELAY_SECONDS after the first mark, so a burst of saves costs
+one cascade and the request returns without waiting for it.
+
+A user is never refreshed by two threads of one process at once; a mark
+that arrives mid-refresh schedules one more run afterwards.  Marks live in
+process memory: a restart drops pending refreshes, and the next change or
+an explicit /api/roadmap/refresh (refresh_now) rebuilds the data.
+
+Without an app (scripts, shell) or with REFRESH_DEBOUNCE_SECONDS <= 0,
+schedule_refresh() refreshes synchronously, as before.
+"""
+
+import os
+import threading
+import time
+import traceback
+from typing import Dict
+
+from config import REFRESH_DEBOUNCE_SECONDS, REFRESH_MAX_DELAY_SECONDS
+
+_app = None
+_thread = None
+_thread_pid = None
+_lock = threading.Lock()
+_wake = threading.Event()
+
+# user_id -> {'first': monotonic, 'last': monotonic, 'queued_at': wall clock, 'marks': int, 'reasons': set}
+_dirty: Dict[str, Dict] = {}
+_running = set()
+
+_stats = {'marked': 0, 'coalesced': 0, 'refreshed': 0, 'failed': 0,
+          'queue_ms_total': 0.0, 'run_ms_total': 0.0}
+
+
+def init_refresh_queue(app) -> None:
+    """Remember the app (refreshes need an app context for get_db)."""
+    global _app
+    _app = app
+
+
+def _enabled() -> bool:
+    return _app is not None and REFRESH_DEBOUNCE_SECONDS > 0
+
+
+def schedule_refresh(user_id: str, reason: str = 'update') -> bool:
+    """
+    Mark a user's derived data stale.  Returns True when the refresh was
+    queued, False when it ran synchronously (queue disabled).
+    """
+    if not user_id:
+        return False
+    if not _enabled():
+        from services.data_sync import refresh_user_data
+        refresh_user_data(user_id, sync_type=f'FULL_REFRESH:{reason}')
+        return False
+
+    now = time.monotonic()
+    with _lock:
+        _stats['marked'] += 1
+        entry = _dirty.get(user_id)
+        if entry is None:
+            _dirty[user_id] = {'first': now, 'last': now, 'queued_at': time.time(),
+                               'marks': 1, 'reasons': {reason}}
+        else:
+            _stats['coalesced'] += 1
+            entry['last'] = now
+            entry['marks'] += 1
+            entry['reasons'].add(reason)
+    _ensure_thread()
+    _wake.set()
+    return True
+
+
+def refresh_now(user_id: str, reason: str = 'manual'):
+    """Regenerate everything synchronously, absorbing any pending mark. Returns the profile."""
+    from services.data_sync import refresh_user_data
+    with _lock:
+        entry = _dirty.pop(user_id, None)
+    queued_at = entry['queued_at'] if entry else None
+    marks = entry['marks'] + 1 if entry else 1
+    return refresh_user_data(user_id, queued_at=queued_at, coalesced=marks,
+                             sync_type=f'FULL_REFRESH:{reason}', force=True)
+
+
+def get_refresh_stats() -> Dict:
+    with _lock:
+        stats = dict(_stats)
+        stats['pending'] = len(_dirty)
+        stats['running'] = len(_running)
+    done = stats['refreshed'] + stats['failed']
+    stats['avg_queue_ms'] = round(stats.pop('queue_ms_total') / done, 1) if done else 0.0
+    stats['avg_run_ms'] = round(stats.pop('run_ms_total') / done, 1) if done else 0.0
+    stats['enabled'] = _enabled()
+    return stats
+
+
+# ==================== SCHEDULER ====================
+
+def _ensure_thread() -> None:
+    """Start the scheduler in this process; threads do not survive a fork."""
+    global _thread, _thread_pid
+    pid = os.getpid()
+    with _lock:
+        if _thread_pid == pid and _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_scheduler_loop, name='refresh-queue', daemon=True)
+        _thread.start()
+        _thread_pid = pid
+
+
+def _take_due(now: float):
+    """Pop users whose debounce window (or max delay) has passed; return (due, next wake)."""
+    due = []
+    next_wake = None
+    with _lock:
+        for user_id, entry in list(_dirty.items()):
+            if user_id in _running:
+                continue
+            ready_at = min(entry['last'] + REFRESH_DEBOUNCE_SECONDS,
+                           entry['first'] + REFRESH_MAX_DELAY_SECONDS)
+            if ready_at <= now:
+                due.append((user_id, _dirty.pop(user_id)))
+                _running.add(user_id)
+            elif next_wake is None or ready_at < next_wake:
+                next_wake = ready_at
+    return due, next_wake
+
+
+def _scheduler_loop() -> None:
+    while True:
+        due, next_wake = _take_due(time.monotonic())
+        for user_id, entry in due:
+            _run(user_id, entry)
+        if due:
+            continue
+        timeout = None if next_wake is None else max(0.0, next_wake - time.monotonic())
+        _wake.wait(timeout)
+        _wake.clear()
+
+
+def _run(user_id: str, entry: Dict) -> None:
+    from services.data_sync import refresh_user_data
+
+    started = time.time()
+    ok = False
+    try:
+        with _app.app_context():
+            refresh_user_data(
+                user_id,
+                queued_at=entry['queued_at'],
+                coalesced=entry['marks'],
+                sync_type='FULL_REFRESH:' + ','.join(sorted(entry['reasons'])),
+                return_profile=False,
+            )
+        ok = True
+    except Exception as e:
+        print(f"Refresh queue error for {user_id}: {e}")
+        print(traceback.format_exc())
+    finally:
+        with _lock:
+            _running.discard(user_id)
+            _stats['refreshed' if ok else 'failed'] += 1
+            _stats['queue_ms_total'] += (started - entry['queued_at']) * 1000
+            _stats['run_ms_total'] += (time.time() - started) * 1000
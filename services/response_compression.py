@@ -0,0 +1,145 @@
+"""
+Negotiated gzip for dynamic responses.
+
+JSON endpoints such as /resume/api/extract, /api/app-state, /api/projects
+and /api/roadmap return several kilobytes of nested sections, tips and
+steps.  An after_request hook gzips a response when the client accepts
+gzip, the content type is compressible text and the body is at least
+RESPONSE_COMPRESS_MIN_BYTES.  The body runs through one zlib stream at
+RESPONSE_COMPRESS_LEVEL: buffered bodies get an exact Content-Length,
+streamed bodies are compressed chunk by chunk as they are sent.
+
+Skipped: file responses (static assets carry their own precompressed
+siblings), bodies that already have a Content-Encoding, non-200
+responses, and types that are already compressed (images, archives, PDF,
+fonts).  A compressed response's strong ETag becomes weak, since the
+bytes differ from the identity representation; conditional GETs compare
+weakly.
+
+Per-route counts and byte savings are reported by get_compression_stats()
+(admin metrics).
+"""
+
+import threading
+import zlib
+from typing import Dict, Iterable, Iterator
+
+from config import RESPONSE_COMPRESS_LEVEL, RESPONSE_COMPRESS_MIN_BYTES
+
+COMPRESSIBLE_TYPES = frozenset({
+    'application/json', 'application/javascript', 'application/xml',
+    'image/svg+xml', 'text/html', 'text/css', 'text/plain', 'text/csv',
+    'text/javascript', 'text/xml',
+})
+
+_lock = threading.Lock()
+_routes: Dict[str, Dict[str, int]] = {}
+
+
+def _record(route: str, key: str, bytes_in: int = 0, bytes_out: int = 0) -> None:
+    with _lock:
+        stats = _routes.setdefault(route, {'compressed': 0, 'too_small': 0, 'bytes_in': 0, 'bytes_out': 0})
+        stats[key] += 1
+        stats['bytes_in'] += bytes_in
+        stats['bytes_out'] += bytes_out
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = RESPONSE_COMPRESS_LEVEL) -> Iterator[bytes]:
+    """Gzip ``chunks`` incrementally, yielding compressed output as it is produced."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _counted(chunks: Iterator[bytes], route: str, source: Iterable[bytes]) -> Iterator[bytes]:
+    sent = 0
+    for chunk in chunks:
+        sent += len(chunk)
+        yield chunk
+    _record(route, 'compressed', source.total, sent)
+
+
+class _Tally:
+    """Pass-through iterable that counts the bytes read from it."""
+
+    def __init__(self, chunks: Iterable):
+        self._chunks = chunks
+        self.total = 0
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            self.total += len(chunk)
+            yield chunk
+
+
+def _weaken_etag(response) -> None:
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(response, request):
+    """after_request hook: gzip ``response`` in place when worthwhile."""
+    if RESPONSE_COMPRESS_LEVEL <= 0:
+        return response
+    if response.status_code != 200 or response.direct_passthrough:
+        return response
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    if request.accept_encodings['gzip'] <= 0:
+        return response
+
+    route = request.url_rule.rule if request.url_rule else request.endpoint or 'unknown'
+    response.vary.add('Accept-Encoding')
+
+    if response.is_streamed:
+        source = _Tally(response.response)
+        response.response = _counted(gzip_stream(source), route, source)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < RESPONSE_COMPRESS_MIN_BYTES:
+            _record(route, 'too_small')
+            return response
+        compressed = b''.join(gzip_stream((body,)))
+        if len(compressed) >= len(body):
+            return response
+        response.set_data(compressed)
+        _record(route, 'compressed', len(body), len(compressed))
+
+    response.headers['Content-Encoding'] = 'gzip'
+    _weaken_etag(response)
+    return response
+
+
+def init_response_compression(app) -> None:
+    from flask import request
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, request)
+
+
+def get_compression_stats() -> Dict:
+    """Totals plus per-route compressed counts and bytes saved."""
+    with _lock:
+        routes = {route: dict(stats) for route, stats in _routes.items()}
+    for stats in routes.values():
+        stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+        stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else None
+    total_in = sum(stats['bytes_in'] for stats in routes.values())
+    total_out = sum(stats['bytes_out'] for stats in routes.values())
+    return {
+        'level': RESPONSE_COMPRESS_LEVEL,
+        'min_bytes': RESPONSE_COMPRESS_MIN_BYTES,
+        'compressed': sum(stats['compressed'] for stats in routes.values()),
+        'bytes_saved': total_in - total_out,
+        'routes': dict(sorted(routes.items(), key=lambda item: -item[1]['bytes_saved'])),
+    }
@@ -13,8 +13,9 @@ Critical improvements:
 import os
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from database.db import get_db
+from services.resume_document import ResumeDocument
 
 try:
     from PyPDF2 import PdfReader
@@ -33,12 +34,15 @@ class ResumeTextExtractor:
     """Safe text extraction with fallback support."""
     
     @staticmethod
-    def extract_from_file(file_path: str) -> Tuple[Optional[str], List[str]]:
+    def extract_from_file(file_path: str, on_page: Optional[Callable[[int, str], None]] = None) -> Tuple[Optional[str], List[str]]:
         """
         Extract text from resume file safely.
         Returns: (text, warnings)
         - text: extracted text or None if extraction fails
         - warnings: list of issues encountered (empty if perfect)
+        
+        on_page(index, text) is called as each PDF page is extracted so a
+        caller can recover partial output if extraction is cut short.
         """
         warnings = []
         
@@ -49,7 +53,7 @@ class ResumeTextExtractor:
         text = None
         
         if file_ext == '.pdf':
-            text, pdf_warnings = ResumeTextExtractor._extract_pdf(file_path)
+            text, pdf_warnings = ResumeTextExtractor._extract_pdf(file_path, on_page)
             warnings.extend(pdf_warnings)
         elif file_ext == '.docx':
             text, docx_warnings = ResumeTextExtractor._extract_docx(file_path)
@@ -63,7 +67,7 @@ class ResumeTextExtractor:
         return text, warnings
     
     @staticmethod
-    def _extract_pdf(file_path: str) -> Tuple[Optional[str], List[str]]:
+    def _extract_pdf(file_path: str, on_page: Optional[Callable[[int, str], None]] = None) -> Tuple[Optional[str], List[str]]:
         """Extract text from PDF with error handling."""
         warnings = []
         
@@ -83,6 +87,8 @@ class ResumeTextExtractor:
                         text = page.extract_text()
                         if text and text.strip():
                             pages.append(text)
+                            if on_page:
+                                on_page(i, text)
                         else:
                             warnings.append(f"Page {i+1} returned empty text")
                     except Exception as e:
@@ -179,6 +185,14 @@ class ResumeAnalyzer:
         'word_count': 0
     }
     
+    # One resume_health row per user; shared with services.batch_analyze
+    HEALTH_UPSERT_SQL = '''
+        INSERT OR REPLACE INTO resume_health
+        (user_id, ats_score, keyword_score, formatting_score, content_completeness,
+         overall_health, suggestions, last_analyzed_at, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
     @staticmethod
     def analyze_resume(file_path: str, user_id: Optional[str] = None) -> Dict:
         """
@@ -193,20 +207,30 @@ class ResumeAnalyzer:
             'partial': bool (True if some steps failed but partial results shown)
         }
         """
+        # Step 1: Extract text safely
+        text, extraction_warnings = ResumeTextExtractor.extract_from_file(file_path)
+        return ResumeAnalyzer.analyze_text(text, user_id=user_id, warnings=extraction_warnings)
+    
+    @staticmethod
+    def analyze_text(text: Optional[str], user_id: Optional[str] = None,
+                     warnings: Optional[List[str]] = None,
+                     doc: Optional[ResumeDocument] = None) -> Dict:
+        """
+        Score already-extracted resume text (same result shape as analyze_resume).
+        
+        Pass ``doc`` to share one ResumeDocument with other scorers so the
+        text is lowercased and tokenized once per upload.
+        """
         result = {
             'success': False,
             'ats_score': 0,
             'analysis': {},
             'suggestions': [],
-            'warnings': [],
+            'warnings': list(warnings or []),
             'partial': False,
             'extracted_text_length': 0
         }
         
-        # Step 1: Extract text safely
-        text, extraction_warnings = ResumeTextExtractor.extract_from_file(file_path)
-        result['warnings'].extend(extraction_warnings)
-        
         if not text:
             result['warnings'].insert(0, "Could not extract text from resume file")
             result['suggestions'].append("Try uploading a different file format or check if the file is corrupted")
@@ -222,7 +246,9 @@ class ResumeAnalyzer:
         result['extracted_text_length'] = len(text)
         
         # Step 2: Calculate scores safely
-        analysis = ResumeAnalyzer._calculate_scores(text)
+        if doc is None or doc.text.strip() != text:
+            doc = ResumeDocument(text)
+        analysis = ResumeAnalyzer._calculate_scores(text, doc)
         
         # Ensure all required integer fields exist and are valid integers
         for key, default in ResumeAnalyzer.SAFE_DEFAULTS.items():
@@ -252,12 +278,13 @@ class ResumeAnalyzer:
         return result
     
     @staticmethod
-    def _calculate_scores(text: str) -> Dict:
+    def _calculate_scores(text: str, doc: Optional[ResumeDocument] = None) -> Dict:
         """Calculate all resume health scores safely."""
         scores = dict(ResumeAnalyzer.SAFE_DEFAULTS)
+        doc = doc or ResumeDocument(text)
         
-        text_lower = text.lower()
-        word_count = len(text.split())
+        text_lower = doc.lower
+        word_count = doc.word_count
         scores['word_count'] = word_count
         
         # ATS Score: presence of key sections + keyword density
@@ -288,8 +315,7 @@ class ResumeAnalyzer:
             scores['formatting_score'] = 40
         
         # Line/section diversity (indicates structure)
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-        scores['formatting_score'] += min(10, len(lines) // 10)
+        scores['formatting_score'] += min(10, len(doc.lines) // 10)
         
         # Completeness: presence of key sections
         completeness_items = ['education', 'experience', 'skills', 'certification', 'achievement']
@@ -353,24 +379,28 @@ class ResumeAnalyzer:
             db = get_db()
             now = datetime.utcnow().isoformat()
             
-            db.execute('''
-                INSERT OR REPLACE INTO resume_health
-                (user_id, ats_score, keyword_score, formatting_score, content_completeness,
-                 overall_health, suggestions, last_analyzed_at, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (user_id, 
-                  int(result['analysis'].get('ats_score', 0)),
-                  int(result['analysis'].get('keyword_score', 0)),
-                  int(result['analysis'].get('formatting_score', 0)),
-                  int(result['analysis'].get('completeness_score', 0)),
-                  int(result['ats_score']),  # overall_health = main ats_score
-                  json.dumps(result.get('suggestions', [])),
-                  now, now, now))
+            from services.score_history import HISTORY_INSERT_SQL, history_row_from_health, keeps_history
+            row = ResumeAnalyzer.health_row(user_id, result, now)
+            db.execute(ResumeAnalyzer.HEALTH_UPSERT_SQL, row)
+            if keeps_history(user_id):
+                db.execute(HISTORY_INSERT_SQL, history_row_from_health(row))
             db.commit()
             return True
         except Exception as e:
             print(f"Database save error: {e}")
             return False
+    
+    @staticmethod
+    def health_row(user_id: str, result: Dict, now: str) -> tuple:
+        """Parameters for HEALTH_UPSERT_SQL from an analyze_text() result."""
+        return (user_id,
+                int(result['analysis'].get('ats_score', 0)),
+                int(result['analysis'].get('keyword_score', 0)),
+                int(result['analysis'].get('formatting_score', 0)),
+                int(result['analysis'].get('completeness_score', 0)),
+                int(result['ats_score']),  # overall_health = main ats_score
+                json.dumps(result.get('suggestions', [])),
+                now, now, now)
 
 
 # Import for regex usage
@@ -5,16 +5,21 @@ Orchestrates all analysis components to provide complete, actionable resume feed
 Based on real recruiter practices and ATS behavior, not generic scoring.
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional
-from services.ats_analyzer import ATSAnalyzer
-from services.skills_experience_analyzer import SkillsAnalyzer, ExperienceAnalyzer
-from services.field_config import get_field_config, get_available_fields
+from services.ats_analyzer import get_ats_analyzer
+from services.skills_experience_analyzer import get_skills_analyzer, get_experience_analyzer
+from services.field_config import get_available_fields
+from services.field_registry import get_compiled_field
 
 
 class ResumeAnalyzer:
     """
     Comprehensive resume analysis system.
     Field-aware, experience-level calibrated, recruiter-aligned.
+    
+    Holds no per-resume state, so one instance per field and level
+    (get_resume_analyzer()) is shared across requests and threads.
     """
     
     def __init__(
@@ -31,12 +36,12 @@ class ResumeAnalyzer:
         """
         self.field_key = field_key
         self.experience_level = experience_level
-        self.field_config = get_field_config(field_key)
+        self.field_config = get_compiled_field(field_key).config
         
-        # Initialize component analyzers
-        self.ats_analyzer = ATSAnalyzer(field_key, experience_level)
-        self.skills_analyzer = SkillsAnalyzer(field_key, experience_level)
-        self.experience_analyzer = ExperienceAnalyzer(field_key, experience_level)
+        # Shared component analyzers (compiled once per field)
+        self.ats_analyzer = get_ats_analyzer(field_key, experience_level)
+        self.skills_analyzer = get_skills_analyzer(field_key, experience_level)
+        self.experience_analyzer = get_experience_analyzer(field_key, experience_level)
     
     def analyze(
         self,
@@ -406,5 +411,30 @@ def analyze_resume(
     Returns:
         Complete analysis results
     """
-    analyzer = ResumeAnalyzer(field_key, experience_level)
+    analyzer = get_resume_analyzer(field_key, experience_level)
     return analyzer.analyze(resume_text, parsed_data, skills_list)
+
+
+def analyze_best_fit_fields(
+    resume_text: str,
+    skills_list: Optional[List[str]] = None,
+    max_gaps: int = 5
+) -> List[Dict]:
+    """
+    Rank every career field by keyword fit in one pass.
+    
+    Use this to answer "which field am I closest to?" instead of running
+    analyze_resume() once per field; then run the full analysis for the
+    chosen field.
+    
+    Returns:
+        Fields sorted by score, each with matched and missing core skills
+    """
+    from services.field_fit import rank_fields
+    return rank_fields(resume_text, skills_list, max_gaps=max_gaps)
+
+
+@lru_cache(maxsize=64)
+def get_resume_analyzer(field_key: str = 'software_backend', experience_level: str = 'mid') -> ResumeAnalyzer:
+    """Shared ResumeAnalyzer for a field and experience level."""
+    return ResumeAnalyzer(field_key, experience_level)
@@ -0,0 +1,133 @@
+"""
+Content-hash cache for full resume analyses.
+
+Students re-upload the same file many times while iterating.  Results are
+keyed on SHA-256 of the uploaded bytes plus the analyzer version, so a
+byte-identical upload returns the stored analysis without extraction or
+scoring, and bumping ANALYZER_VERSION invalidates everything at once.
+
+Lookups go through a small in-process LRU first, then the resume_cache
+table (shared by every worker).  Hit/miss counters are per process.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import RESUME_CACHE_SIZE
+from database.db import get_db
+
+
+class _LRU:
+    """Thread-safe bounded LRU mapping."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(0, maxsize)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+_memory = _LRU(RESUME_CACHE_SIZE)
+_stats_lock = threading.Lock()
+_stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0, 'errors': 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def make_cache_key(kind: str, content, version: str) -> str:
+    """'<kind>:<version>:<sha256>' for raw upload bytes (or text)."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return f"{kind}:{version}:{hashlib.sha256(content).hexdigest()}"
+
+
+def get_cached_analysis(cache_key: str) -> Optional[Dict]:
+    """Stored analysis for this key, or None on a miss."""
+    cached = _memory.get(cache_key)
+    if cached is not None:
+        _count('memory_hits')
+        return json.loads(cached)
+
+    try:
+        db = get_db()
+        row = db.execute(
+            'SELECT analysis_json FROM resume_cache WHERE file_hash = ? AND analysis_json IS NOT NULL',
+            (cache_key,)
+        ).fetchone()
+        if row:
+            db.execute(
+                'UPDATE resume_cache SET hit_count = hit_count + 1, last_hit_at = ? WHERE file_hash = ?',
+                (datetime.utcnow().isoformat(), cache_key)
+            )
+            db.commit()
+            _memory.put(cache_key, row['analysis_json'])
+            _count('db_hits')
+            return json.loads(row['analysis_json'])
+    except Exception as e:
+        _count('errors')
+        print(f"Error reading resume cache: {e}")
+
+    _count('misses')
+    return None
+
+
+def store_analysis(cache_key: str, analysis: Dict, version: str) -> bool:
+    """Persist a full analysis under its content key."""
+    payload = json.dumps(analysis)
+    _memory.put(cache_key, payload)
+    try:
+        db = get_db()
+        now = datetime.utcnow().isoformat()
+        db.execute(
+            '''INSERT INTO resume_cache (file_hash, analysis_json, analyzer_version, hit_count, created_at)
+               VALUES (?, ?, ?, 0, ?)
+               ON CONFLICT(file_hash) DO UPDATE SET
+                   analysis_json = excluded.analysis_json,
+                   analyzer_version = excluded.analyzer_version''',
+            (cache_key, payload, version, now)
+        )
+        db.commit()
+        _count('stores')
+        return True
+    except Exception as e:
+        _count('errors')
+        print(f"Error writing resume cache: {e}")
+        return False
+
+
+def get_cache_stats() -> Dict:
+    """Per-process hit-rate counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+    hits = stats['memory_hits'] + stats['db_hits']
+    stats['lookups'] = lookups
+    stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+    stats['memory_entries'] = len(_memory)
+    stats['memory_capacity'] = _memory.maxsize
+    return stats
@@ -11,7 +11,11 @@ Provides the structure expected by /resume/api/extract:
 """
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from services.resume_document import ResumeDocument
+from services.skill_matcher import skill_scope
+from services.skill_registry import canonical_name
 
 
 class DetailedResumeAnalyzer:
@@ -31,6 +35,7 @@ class DetailedResumeAnalyzer:
         'rest', 'graphql', 'api', 'microservices', 'linux', 'agile', 'scrum',
         'figma', 'photoshop', 'illustrator', 'ui/ux',
     ]
+    _TECH_SCOPE = skill_scope(TECH_SKILLS)
 
     ACTION_VERBS = [
         'developed', 'designed', 'led', 'managed', 'improved', 'increased',
@@ -41,24 +46,28 @@ class DetailedResumeAnalyzer:
     ]
 
     @staticmethod
-    def analyze_resume_detailed(text: str) -> Dict:
+    def analyze_resume_detailed(text: str, doc: Optional[ResumeDocument] = None) -> Dict:
         """
         Full detailed analysis of resume text.
 
+        Pass ``doc`` to reuse a ResumeDocument already built for this text.
+
         Returns dict with:
           sections, scores, insights, evolution,
           professional_level, readiness_for_role, suggestions
         """
-        text_lower = text.lower()
-        word_count = len(text.split())
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        doc = doc or ResumeDocument(text)
+        text = doc.text
+        text_lower = doc.lower
+        word_count = doc.word_count
+        lines = doc.lines
 
         # --- Detect skills ---
         skills_found = []
+        present = doc.skill_terms & DetailedResumeAnalyzer._TECH_SCOPE
         for skill in DetailedResumeAnalyzer.TECH_SKILLS:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                skills_found.append(skill.title() if len(skill) > 3 else skill.upper())
+            if skill in present:
+                skills_found.append(canonical_name(skill))
 
         # --- Detect action verbs ---
         verbs_used = [v for v in DetailedResumeAnalyzer.ACTION_VERBS if v in text_lower]
@@ -0,0 +1,73 @@
+"""
+Shared, pre-tokenized view of one resume's text.
+
+Extraction happens once per upload; every scorer then reads from the same
+ResumeDocument instead of re-lowercasing, re-splitting or re-reading the
+file.  Derived views that not every scorer needs are computed lazily and
+memoized on the instance.
+"""
+
+import re
+from typing import Iterable, List
+
+from services.skill_matcher import SkillMatch, find_skills
+
+_WORD_RE = re.compile(r'\w+')
+
+
+class ResumeDocument:
+    """Extracted resume text plus the lowercased/tokenized views scorers share."""
+
+    def __init__(self, text: str):
+        self.text = text or ''
+        self.lower = self.text.lower()
+        self.lines: List[str] = [l.strip() for l in self.text.split('\n') if l.strip()]
+        self.words: List[str] = self.text.split()
+        self.word_count = len(self.words)
+        self._tokens = None
+        self._word_hits = {}
+        self._skill_matches = None
+        self._skill_terms = None
+
+    @property
+    def tokens(self) -> frozenset:
+        """Set of lowercase \\w+ runs, so has_word() on plain words is a set lookup."""
+        if self._tokens is None:
+            self._tokens = frozenset(_WORD_RE.findall(self.lower))
+        return self._tokens
+
+    @property
+    def skill_matches(self) -> List[SkillMatch]:
+        """All lexicon skill matches with offsets (one automaton pass, memoized)."""
+        if self._skill_matches is None:
+            self._skill_matches = find_skills(self.lower, lowered=True)
+        return self._skill_matches
+
+    @property
+    def skill_terms(self) -> frozenset:
+        """Distinct lexicon terms present in the document."""
+        if self._skill_terms is None:
+            self._skill_terms = frozenset(m.term for m in self.skill_matches)
+        return self._skill_terms
+
+    def contains(self, term: str) -> bool:
+        """Substring test against the lowercased text."""
+        return term in self.lower
+
+    def contains_any(self, terms: Iterable[str]) -> bool:
+        return any(term in self.lower for term in terms)
+
+    def count(self, term: str) -> int:
+        """Non-overlapping substring occurrences in the lowercased text."""
+        return self.lower.count(term)
+
+    def has_word(self, term: str) -> bool:
+        """Word-boundary match for a lowercase term (single or multi-word)."""
+        hit = self._word_hits.get(term)
+        if hit is None:
+            if term.isalnum():
+                hit = term in self.tokens
+            else:
+                hit = re.search(r'\b' + re.escape(term) + r'\b', self.lower) is not None
+            self._word_hits[term] = hit
+        return hit
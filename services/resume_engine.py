@@ -0,0 +1,240 @@
+"""
+Resume analysis engine - one extraction, one shared document, every scorer.
+
+The upload path used to extract the file, run the detailed analyzer, then
+hand the temp file to ResumeAnalyzer.analyze_resume() which re-opened and
+re-parsed it.  analyze_resume_text() builds a single ResumeDocument from
+already-extracted text and runs both scorers against it.
+
+Both analyses are pure functions of their input, which is what lets
+services.resume_cache key them on content.  Bump ANALYZER_VERSION whenever
+scoring output changes so cached results are not served stale.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from services.resume_analysis_enhanced import ResumeAnalyzer
+from services.resume_detailed_analyzer import DetailedResumeAnalyzer
+from services.resume_document import ResumeDocument
+from services.skill_matcher import match_skills, skill_scope
+
+ANALYZER_VERSION = '1.1'  # bump whenever analysis output changes (cached results key on it)
+
+QUICK_ANALYSIS_SKILLS = [
+    'python','java','javascript','typescript','react','angular','vue','node',
+    'sql','mysql','postgresql','mongodb','redis','aws','azure','gcp','docker',
+    'kubernetes','git','linux','machine learning','deep learning','tensorflow',
+    'pytorch','data analysis','excel','power bi','tableau','html','css',
+    'c++','c#','ruby','php','swift','kotlin','rust','go','scala',
+    'communication','leadership','project management','agile','scrum',
+    'problem solving','teamwork','analytical','critical thinking',
+]
+_QUICK_ANALYSIS_SCOPE = skill_scope(QUICK_ANALYSIS_SKILLS)
+
+
+def analyze_resume_text(text: str, warnings: Optional[List[str]] = None) -> Dict:
+    """
+    Run the detailed and ATS/health scorers over one ResumeDocument.
+
+    Pure function of the text (no database writes), so results can be
+    cached or computed off the request thread.
+
+    Returns: {
+        'response': JSON payload for /resume/api/extract,
+        'basic': ResumeAnalyzer result (resume_health scores),
+        'warnings': extraction/analysis warnings
+    }
+    """
+    doc = ResumeDocument(text.strip())
+    detailed = DetailedResumeAnalyzer.analyze_resume_detailed(doc.text, doc=doc)
+    basic = ResumeAnalyzer.analyze_text(doc.text, warnings=warnings, doc=doc)
+
+    return {
+        'response': build_extract_response(detailed),
+        'basic': basic,
+        'warnings': basic.get('warnings', []),
+    }
+
+
+def mark_truncated(analysis: Dict, warnings: List[str]) -> Dict:
+    """Copy of ``analysis`` whose response says it only covers part of the file."""
+    response = dict(analysis['response'], truncated=True, warnings=[str(w) for w in warnings])
+    return dict(analysis, response=response)
+
+
+def save_resume_analysis(user_id: Optional[str], analysis: Dict) -> None:
+    """Persist an analysis for a user: resume_health row plus profile sync."""
+    save_resume_health(user_id, analysis)
+    sync_resume_profile(user_id, analysis)
+
+
+def save_resume_health(user_id: Optional[str], analysis: Dict) -> None:
+    """Write the resume_health row for a user."""
+    if not user_id:
+        return
+
+    basic = analysis.get('basic') or {}
+    if basic.get('success'):
+        ResumeAnalyzer._save_analysis(user_id, basic)
+
+
+def sync_resume_profile(user_id: Optional[str], analysis: Dict) -> None:
+    """Push resume scores into the profile, which refreshes every dependent module."""
+    if not user_id or user_id == 'anonymous':
+        return
+
+    from services.profile_service import update_user_profile
+    response_data = analysis['response']
+    try:
+        update_user_profile(user_id, {
+            'resume_data': {
+                'ats_score': response_data['ats_score'],
+                'quality_score': response_data['quality_score'],
+                'skills': response_data['skills'],
+                'professional_level': response_data['professional_level'],
+                'last_analyzed': datetime.utcnow().isoformat()
+            }
+        })
+    except Exception as sync_err:
+        print(f"Warning: Could not sync resume data: {sync_err}")
+
+
+def build_extract_response(detailed_analysis: Dict) -> Dict:
+    """Shape DetailedResumeAnalyzer output into the /resume/api/extract payload."""
+    sections = detailed_analysis['sections']
+    return {
+        'success': True,
+
+        # Basic scores (for template compatibility)
+        'ats_score': detailed_analysis['scores']['overall'],
+        'quality_score': detailed_analysis['scores']['content_quality'],
+        'overall_score': detailed_analysis['scores']['overall'],
+
+        # Section-wise analysis
+        'sections': {
+            'education': {
+                'status': sections['education']['status'],
+                'explanation': sections['education']['explanation'],
+                'tips': sections['education']['tips'],
+                'score': sections['education']['score']
+            },
+            'skills': {
+                'status': sections['skills']['status'],
+                'count': sections['skills']['count'],
+                'list': sections['skills']['skills'],
+                'explanation': sections['skills']['explanation'],
+                'tips': sections['skills']['tips'],
+                'score': sections['skills']['score']
+            },
+            'experience': {
+                'status': sections['experience']['status'],
+                'count': sections['experience']['count'],
+                'has_dates': sections['experience']['has_dates'],
+                'has_metrics': sections['experience']['has_metrics'],
+                'explanation': sections['experience']['explanation'],
+                'tips': sections['experience']['tips'],
+                'score': sections['experience']['score']
+            },
+            'projects': {
+                'status': sections['projects']['status'],
+                'count': sections['projects']['count'],
+                'explanation': sections['projects']['explanation'],
+                'tips': sections['projects']['tips'],
+                'score': sections['projects']['score']
+            },
+            'achievements': {
+                'status': sections['achievements']['status'],
+                'count': sections['achievements']['count'],
+                'has_metrics': sections['achievements']['has_metrics'],
+                'explanation': sections['achievements']['explanation'],
+                'tips': sections['achievements']['tips'],
+                'score': sections['achievements']['score']
+            }
+        },
+
+        # Category scores breakdown
+        'scores': {
+            'format': detailed_analysis['scores']['format'],
+            'keywords': detailed_analysis['scores']['keywords'],
+            'completeness': detailed_analysis['scores']['completeness'],
+            'content_quality': detailed_analysis['scores']['content_quality'],
+            'overall': detailed_analysis['scores']['overall']
+        },
+
+        # Insights (gaps, strengths, role-based)
+        'insights': detailed_analysis['insights'],
+
+        # Evolution recommendations
+        'evolution': detailed_analysis['evolution'],
+
+        # Professional level and readiness
+        'professional_level': detailed_analysis['professional_level'],
+        'readiness_for_role': detailed_analysis.get('readiness_for_role'),
+
+        # Skills for UI display
+        'skills': sections['skills']['skills'][:15],
+        'has_experience': sections['experience']['present'],
+        'education': sections['education']['degrees'],
+
+        # Personalized suggestions
+        'suggestions': detailed_analysis['suggestions'],
+        'ats_strengths': [insight['message'] for insight in detailed_analysis['insights'] if insight.get('type') == 'strength'][:3]
+    }
+
+
+def analyze_quick_text(resume_text: str, role_text: str = '') -> Dict:
+    """Score pasted resume text for the in-page /api/analyze-resume form."""
+    from services.ats_scorer import get_ats_score
+
+    text_lower = resume_text.lower() + ' ' + role_text.lower()
+    present = set(match_skills(text_lower, scope=_QUICK_ANALYSIS_SCOPE, lowered=True))
+    found_skills = [s for s in QUICK_ANALYSIS_SKILLS if s in present]
+
+    has_experience = any(kw in text_lower for kw in
+                         ['work experience','professional experience','employment',
+                          'position','role','internship','job'])
+    education = ['degree'] if any(kw in text_lower for kw in
+                                  ['bachelor','master','phd','degree','university','college']) else []
+
+    ats_result = get_ats_score({
+        'skills': found_skills,
+        'has_experience': has_experience,
+        'education': education,
+        'text_length': len(resume_text),
+        'text': resume_text,
+    })
+
+    ats_score = int(ats_result.get('ats_score', 0))
+
+    # Score and feedback
+    word_count = len(resume_text.split()) if resume_text else 0
+    has_metrics = bool(re.search(r'\d+[%$]|\d+\s*(percent|million|billion|k\b)', resume_text, re.I))
+    has_action_verbs = any(v in text_lower for v in
+                           ['led','managed','built','designed','implemented','delivered',
+                            'improved','increased','reduced','created','developed'])
+
+    overall_score = min(100, max(10,
+        ats_score * 0.6 +
+        (20 if has_metrics else 0) +
+        (10 if has_action_verbs else 0) +
+        (10 if len(found_skills) >= 5 else len(found_skills) * 2)
+    ))
+
+    return {
+        'ats_score': ats_score,
+        'overall_score': round(overall_score),
+        'word_count': word_count,
+        'skills_found': found_skills,
+        'skills_count': len(found_skills),
+        'has_metrics': has_metrics,
+        'has_action_verbs': has_action_verbs,
+        'has_experience': has_experience,
+        'education_found': len(education) > 0,
+        'target_role': role_text,
+        'recommendations': ats_result.get('recommendations', []),
+        'strengths': ats_result.get('strengths', []),
+        'blockers': ats_result.get('blockers', []),
+        'categories': ats_result.get('categories', {}),
+    }
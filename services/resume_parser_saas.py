@@ -4,6 +4,8 @@ import json
 import hashlib
 from datetime import datetime
 from database.db import get_db
+from services.skill_matcher import match_skills, skill_scope
+from services.skill_registry import SkillSet, canonical_name
 
 
 class ResumeParser:
@@ -25,6 +27,9 @@ class ResumeParser:
         'negotiation', 'presentation', 'creativity', 'adaptability', 'time management'
     ]
     
+    _TECHNICAL_SCOPE = skill_scope(s for skills in TECHNICAL_SKILLS.values() for s in skills)
+    _SOFT_SCOPE = skill_scope(SOFT_SKILLS)
+    
     def __init__(self):
         self.extracted_data = {
             'skills': [],
@@ -44,11 +49,14 @@ class ResumeParser:
         
         text_lower = text.lower()
         
+        # One automaton pass finds every lexicon skill in the text
+        found = set(match_skills(text_lower, lowered=True))
+        
         # Extract technical skills
-        self.extracted_data['technical_skills'] = self._extract_technical_skills(text_lower)
+        self.extracted_data['technical_skills'] = self._extract_technical_skills(found)
         
         # Extract soft skills
-        self.extracted_data['soft_skills'] = self._extract_soft_skills(text_lower)
+        self.extracted_data['soft_skills'] = self._extract_soft_skills(found)
         
         # Extract experience level
         self.extracted_data['experience_years'] = self._estimate_experience(text_lower)
@@ -73,22 +81,13 @@ class ResumeParser:
         
         return self.extracted_data
     
-    def _extract_technical_skills(self, text):
-        """Extract technical skills from text."""
-        skills = []
-        for category, skill_list in self.TECHNICAL_SKILLS.items():
-            for skill in skill_list:
-                if skill in text:
-                    skills.append(skill.title())
-        return list(set(skills))
+    def _extract_technical_skills(self, found):
+        """Technical skills among the matched lexicon terms, by canonical name."""
+        return sorted({canonical_name(skill) for skill in found & self._TECHNICAL_SCOPE})
     
-    def _extract_soft_skills(self, text):
-        """Extract soft skills from text."""
-        skills = []
-        for skill in self.SOFT_SKILLS:
-            if skill in text:
-                skills.append(skill.title())
-        return list(set(skills))
+    def _extract_soft_skills(self, found):
+        """Soft skills among the matched lexicon terms, by canonical name."""
+        return sorted({canonical_name(skill) for skill in found & self._SOFT_SCOPE})
     
     def _estimate_experience(self, text):
         """Estimate years of experience from text."""
@@ -185,24 +184,20 @@ class ResumeParser:
         if not role_skills:
             return 0
         
-        matched = 0
-        for skill in self.extracted_data['skills']:
-            if any(s.lower() in skill.lower() or skill.lower() in s.lower() 
-                   for s in role_skills):
-                matched += 1
+        required = SkillSet(role_skills)
+        matched = sum(1 for skill in self.extracted_data['skills'] if required.relates(skill))
         
         return round((matched / len(role_skills) * 100)) if role_skills else 0
     
     def get_skill_gaps(self, role_skills):
         """Identify missing skills for a role."""
-        resume_skills_lower = [s.lower() for s in self.extracted_data['skills']]
-        gaps = []
-        
-        for skill in role_skills:
-            if not any(skill.lower() in rs or rs in skill.lower() for rs in resume_skills_lower):
-                gaps.append(skill)
-        
-        return gaps
+        held = SkillSet(self.extracted_data['skills'])
+        return [skill for skill in role_skills if not held.relates(skill)]
+
+
+def parse_resume_text(text):
+    """Parse already-extracted resume text."""
+    return ResumeParser().parse_text(text)
 
 
 def parse_resume_from_file(file_path):
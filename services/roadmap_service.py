@@ -317,7 +317,8 @@ def _build_specialization_phase(goal_list=None):
 
 def calculate_skill_gaps(profile_data, resume_data=None):
     """Return skills the user is missing for their chosen goals."""
-    skills = set(s.lower() for s in profile_data.get('skills', []))
+    from services.skill_registry import SkillSet
+    skills = SkillSet(profile_data.get('skills', []))
     goals = profile_data.get('goals', [])
 
     # Skills commonly needed for each goal
@@ -334,6 +335,6 @@ def calculate_skill_gaps(profile_data, resume_data=None):
     for goal in goals:
         required.update(goal_skill_requirements.get(goal, set()))
 
-    gaps = required - skills
+    gaps = [skill for skill in sorted(required) if not skills.has(skill)]
 
-    return list(gaps)
+    return gaps
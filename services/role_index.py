@@ -0,0 +1,174 @@
+"""
+TF-IDF role similarity index over ROLE_SKILL_REQUIREMENTS.
+
+Built once at import.  Every requirement string ('API Design',
+'JavaScript/TypeScript', 'SQL Optimization') is normalised into features:
+the whole phrase, each '/' alternative and each word.  Role vectors weight
+those features by tier (core > supporting > optional) and by IDF across
+roles, so a shared word like 'design' counts for little while 'pytorch'
+is decisive.  Rows are L2-normalised and stored as an inverted index
+(feature -> [(role, weight)]), so scoring a user is one sparse dot
+product per feature they have, not a nested loop over every skill.
+
+Skill matching for guidance goes through the canonical skill registry:
+a requirement matches when the user's skill IDs cover it or one of the
+user's skills is part of it ('java' no longer matches 'JavaScript', while
+'node' matches 'Node.js').
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.career_engine import CAREER_DATABASE, ROLE_SKILL_REQUIREMENTS
+from services.skill_registry import SkillSet, skill_ids
+
+TIER_WEIGHTS = {'core': 1.0, 'technical': 1.0, 'supporting': 0.6, 'optional': 0.3}
+
+_WORD_RE = re.compile(r'[a-z0-9+#]+')
+
+
+def _words(text: str) -> List[str]:
+    # Fold simple plurals so 'database' and 'Databases' share a word
+    return [w[:-1] if len(w) > 3 and w.endswith('s') and not w.endswith('ss') else w
+            for w in _WORD_RE.findall(text.lower())]
+
+
+def skill_features(skill: str) -> Set[str]:
+    """Phrase, '/' alternatives, words and canonical skill IDs, each as one feature."""
+    phrase = ' '.join(_words(skill))
+    if not phrase:
+        return set()
+    features = {phrase}
+    for part in skill.split('/'):
+        part = ' '.join(_words(part))
+        if part:
+            features.add(part)
+    features.update(phrase.split())
+    features.update(f'#{sid}' for sid in skill_ids(skill))
+    return features
+
+
+class RoleIndex:
+    """Sparse, IDF-weighted role x feature matrix."""
+
+    def __init__(self, requirements: Dict[str, Dict[str, List[str]]]):
+        self.roles = list(requirements)
+        self.requirements = requirements
+
+        # Term frequencies per role, weighted by tier
+        role_tf: List[Dict[str, float]] = []
+        for role in self.roles:
+            tf: Dict[str, float] = {}
+            for tier, skills in requirements[role].items():
+                weight = TIER_WEIGHTS.get(tier, 0.3)
+                for skill in skills:
+                    for feature in skill_features(skill):
+                        tf[feature] = tf.get(feature, 0.0) + weight
+            role_tf.append(tf)
+
+        doc_freq: Dict[str, int] = {}
+        for tf in role_tf:
+            for feature in tf:
+                doc_freq[feature] = doc_freq.get(feature, 0) + 1
+        n_roles = len(self.roles)
+        self.idf = {f: math.log((1 + n_roles) / (1 + df)) + 1.0 for f, df in doc_freq.items()}
+
+        # L2-normalised rows, stored column-wise for sparse dot products
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for r, tf in enumerate(role_tf):
+            weights = {f: w * self.idf[f] for f, w in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for feature, weight in weights.items():
+                self._postings.setdefault(feature, []).append((r, weight / norm))
+
+    def _user_vector(self, user_skills: Iterable[str]) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for skill in user_skills or ():
+            if not isinstance(skill, str):
+                continue
+            for feature in skill_features(skill):
+                if feature in self.idf:
+                    weights[feature] = self.idf[feature]
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {f: w / norm for f, w in weights.items()}
+
+    def similarities(self, user_skills: Iterable[str]) -> List[float]:
+        """Cosine similarity of the user's skills to every role, in self.roles order."""
+        scores = [0.0] * len(self.roles)
+        for feature, weight in self._user_vector(user_skills).items():
+            for r, role_weight in self._postings[feature]:
+                scores[r] += weight * role_weight
+        return scores
+
+    def match_skills(self, role: str, user_skills: Iterable[str],
+                     tiers: Optional[Iterable[str]] = None) -> Tuple[Set[str], Set[str]]:
+        """
+        (matched requirements, matched user skills) for one role.
+
+        Only requirements in ``tiers`` count (all tiers by default).
+        """
+        requirements = self.requirements.get(role)
+        if not requirements:
+            return set(), set()
+        held = user_skills if isinstance(user_skills, SkillSet) else SkillSet(user_skills)
+
+        matched_required, matched_user = set(), set()
+        for tier in (requirements if tiers is None else tiers):
+            for skill in requirements.get(tier, ()):
+                related = held.related(skill)
+                if related:
+                    matched_required.add(skill)
+                    matched_user.update(related)
+        return matched_required, matched_user
+
+
+ROLE_INDEX = RoleIndex(ROLE_SKILL_REQUIREMENTS)
+
+# Interest whose career ladder contains each indexed role
+_ROLE_INTEREST = {}
+for _interest, _levels in CAREER_DATABASE.items():
+    for _data in _levels.values():
+        if _data['role'] in ROLE_SKILL_REQUIREMENTS:
+            _ROLE_INTEREST.setdefault(_data['role'], _interest)
+
+
+def recommend_roles(user_skills: Iterable[str], k: int = 5, level: Optional[str] = None) -> List[Dict]:
+    """
+    Top-k roles across every interest by cosine similarity to the user's skills.
+
+    Returns: [{
+        'role', 'interest', 'similarity' (0-1), 'matched_skills',
+        'missing_core', 'career_path' (roles by level),
+        'role_at_level' (only when ``level`` is given and exists)
+    }, ...]
+    """
+    user_skills = [s for s in (user_skills or []) if isinstance(s, str) and s.strip()]
+    if not user_skills:
+        return []
+
+    held = SkillSet(user_skills)
+    scores = ROLE_INDEX.similarities(user_skills)
+    ranked = sorted(range(len(scores)), key=lambda r: (-scores[r], ROLE_INDEX.roles[r]))
+
+    results = []
+    for r in ranked[:max(0, k)]:
+        if scores[r] <= 0:
+            break
+        role = ROLE_INDEX.roles[r]
+        interest = _ROLE_INTEREST.get(role)
+        requirements = ROLE_SKILL_REQUIREMENTS[role]
+        matched, _ = ROLE_INDEX.match_skills(role, held)
+        levels = CAREER_DATABASE.get(interest, {})
+        item = {
+            'role': role,
+            'interest': interest,
+            'similarity': round(scores[r], 4),
+            'matched_skills': [s for tier in requirements.values() for s in tier if s in matched],
+            'missing_core': [s for s in requirements.get('core', []) if s not in matched],
+            'career_path': [data['role'] for data in levels.values()],
+        }
+        if level and level in levels:
+            item['role_at_level'] = levels[level]['role']
+        results.append(item)
+    return results
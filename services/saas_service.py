@@ -2,6 +2,7 @@
 import json
 from datetime import datetime, timedelta
 from database.db import get_db
+from database.request_cache import request_cached
 
 
 # ==================== TIER CONFIGURATION ====================
@@ -56,6 +57,7 @@ DEFAULT_TIER_CONFIG = {
 
 # ==================== USER TIER MANAGEMENT ====================
 
+@request_cached('users')
 def get_user_tier(user_id):
     """Get user's current tier."""
     db = get_db()
@@ -84,6 +86,8 @@ def upgrade_user_tier(user_id, new_tier):
             (new_tier, is_premium, now, user_id)
         )
         db.commit()
+        from services.current_user import invalidate_user
+        invalidate_user(user_id)
         return {'success': True, 'tier': new_tier}
     except Exception as e:
         db.rollback()
@@ -97,6 +101,7 @@ def get_tier_config(tier_name):
 
 # ==================== USAGE TRACKING ====================
 
+@request_cached('usage_tracking_daily')
 def get_today_usage(user_id):
     """Get user's usage today."""
     db = get_db()
@@ -121,6 +126,7 @@ def get_today_usage(user_id):
     }
 
 
+@request_cached('usage_tracking_monthly')
 def get_month_usage(user_id):
     """Get user's usage this month."""
     db = get_db()
@@ -243,6 +249,7 @@ def check_usage_limit(user_id, usage_type):
     }
 
 
+@request_cached('users', 'usage_tracking_daily', 'usage_tracking_monthly')
 def get_usage_context(user_id):
     """Get complete usage context for a user (for displaying in UI)."""
     user_tier = get_user_tier(user_id)
@@ -0,0 +1,160 @@
+"""
+Append-only resume score history.
+
+Every write path that updates resume_health (run_full_pipeline, the
+ResumeAnalyzer save, bulk scoring, data sync) also appends one compact row
+to resume_score_history: integer scores and an integer epoch-seconds
+timestamp.  resume_health and confidence_index stay the "current value"
+tables; this one keeps the series.
+
+Reads are range scans on idx_resume_score_history_user_created, so trend
+and sparkline queries cost O(points returned) however long a user's
+history grows.  Percentiles count resume_health rows on either side of a
+score through idx_resume_health_overall instead of loading every score.
+
+Logged-out analyses all share the 'anonymous' user id, so they get no
+history and, like unmapped bulk imports ('batch:<id>:<file>'), are left
+out of the percentile population.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from config import SCORE_HISTORY_MAX_POINTS, SCORE_TREND_WINDOW
+
+HISTORY_INSERT_SQL = '''
+    INSERT INTO resume_score_history
+    (user_id, overall, ats, keyword, formatting, content, source, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+ANONYMOUS_USER_ID = 'anonymous'
+BATCH_USER_PATTERN = 'batch:%'  # unmapped services.batch_analyze rows
+
+PERCENTILE_COUNT_SQL = '''
+    SELECT COUNT(*) FROM resume_health
+    WHERE overall_health {op} ? AND user_id != ? AND user_id NOT LIKE ?
+'''
+
+# A change of more than this many points counts as a trend
+TREND_THRESHOLD = 3
+
+_SPARK_BARS = '▁▂▃▄▅▆▇█'
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def keeps_history(user_id) -> bool:
+    """False for missing and shared anonymous user ids."""
+    return bool(user_id) and user_id != ANONYMOUS_USER_ID
+
+
+def history_row(user_id: str, overall, ats=None, keyword=None, formatting=None,
+                content=None, source: str = 'analysis', created_at: Optional[int] = None) -> tuple:
+    """Parameters for HISTORY_INSERT_SQL; scores are stored as integers."""
+    return (user_id, _int(overall) or 0, _int(ats), _int(keyword), _int(formatting),
+            _int(content), source, int(created_at if created_at is not None else time.time()))
+
+
+def history_row_from_health(health_row: tuple, source: str = 'analysis') -> tuple:
+    """History row for a ResumeAnalyzer.HEALTH_UPSERT_SQL parameter tuple."""
+    user_id, ats, keyword, formatting, content, overall = health_row[:6]
+    return history_row(user_id, overall, ats, keyword, formatting, content, source)
+
+
+def record_score(db, user_id: str, overall, ats=None, keyword=None, formatting=None,
+                 content=None, source: str = 'analysis') -> None:
+    """Append one history row.  Runs in the caller's transaction; does not commit."""
+    if not keeps_history(user_id):
+        return
+    db.execute(HISTORY_INSERT_SQL, history_row(user_id, overall, ats, keyword, formatting, content, source))
+
+
+def trend_direction(delta: Optional[float]) -> str:
+    if delta is None:
+        return 'stable'
+    if delta > TREND_THRESHOLD:
+        return 'improving'
+    if delta < -TREND_THRESHOLD:
+        return 'declining'
+    return 'stable'
+
+
+def recent_scores(db, user_id: str, limit: int = SCORE_TREND_WINDOW) -> List[int]:
+    """The user's last ``limit`` overall scores, oldest first."""
+    rows = db.execute(
+        '''SELECT overall FROM resume_score_history
+           WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?''',
+        (user_id, limit)
+    ).fetchall()
+    return [row['overall'] for row in reversed(rows)]
+
+
+def get_history(db, user_id: str, since: Optional[int] = None,
+                limit: int = SCORE_HISTORY_MAX_POINTS) -> List[Dict]:
+    """Newest ``limit`` rows at or after ``since`` (epoch seconds), oldest first."""
+    rows = db.execute(
+        '''SELECT overall, ats, keyword, formatting, content, source, created_at
+           FROM resume_score_history
+           WHERE user_id = ? AND created_at >= ?
+           ORDER BY created_at DESC, id DESC LIMIT ?''',
+        (user_id, int(since or 0), max(1, min(int(limit), SCORE_HISTORY_MAX_POINTS)))
+    ).fetchall()
+    return [dict(row) for row in reversed(rows)]
+
+
+def get_trend(db, user_id: str, days: int = 30) -> Dict:
+    """Change in overall score over the last ``days`` days."""
+    since = int(time.time()) - max(1, int(days)) * 86400
+    points = get_history(db, user_id, since=since)
+    if not points:
+        return {'days': days, 'points': 0, 'trend': 'stable', 'first': None,
+                'latest': None, 'change': None, 'per_week': None}
+
+    first, latest = points[0], points[-1]
+    change = latest['overall'] - first['overall']
+    span_weeks = (latest['created_at'] - first['created_at']) / (7 * 86400)
+    return {
+        'days': days,
+        'points': len(points),
+        'trend': trend_direction(change if len(points) > 1 else None),
+        'first': first['overall'],
+        'latest': latest['overall'],
+        'change': change,
+        'per_week': round(change / span_weeks, 1) if span_weeks >= 1 / 7 else None,
+    }
+
+
+def get_sparkline(db, user_id: str, points: int = 20) -> Dict:
+    """Last ``points`` overall scores plus a unicode sparkline of them."""
+    scores = [row['overall'] for row in get_history(db, user_id, limit=points)]
+    if not scores:
+        return {'scores': [], 'min': None, 'max': None, 'latest': None, 'spark': ''}
+    low, high = min(scores), max(scores)
+    span = (high - low) or 1
+    spark = ''.join(_SPARK_BARS[(s - low) * (len(_SPARK_BARS) - 1) // span] for s in scores)
+    return {'scores': scores, 'min': low, 'max': high, 'latest': scores[-1], 'spark': spark}
+
+
+def get_percentile(db, score: Optional[int]) -> Dict:
+    """Share of signed-in users whose current overall health is below ``score``."""
+    if score is None:
+        return {'score': None, 'percentile': None, 'population': 0}
+    excluded = (ANONYMOUS_USER_ID, BATCH_USER_PATTERN)
+    below = db.execute(
+        PERCENTILE_COUNT_SQL.format(op='<'), (score,) + excluded
+    ).fetchone()[0]
+    rest = db.execute(
+        PERCENTILE_COUNT_SQL.format(op='>='), (score,) + excluded
+    ).fetchone()[0]
+    population = below + rest
+    return {
+        'score': score,
+        'percentile': round(below * 100 / population) if population else None,
+        'population': population,
+    }
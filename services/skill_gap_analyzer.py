@@ -1,5 +1,6 @@
 """Skill Gap Analysis Service - Identify missing skills and explain their importance."""
 from database.db import get_db
+from services.skill_registry import SkillSet
 from datetime import datetime
 import json
 
@@ -74,6 +75,7 @@ class SkillGapAnalyzer:
         # Get relevant skills for their career goal
         career_goal = profile.get('career_goals', '').lower()
         current_skills = profile.get('current_skills', [])
+        held = SkillSet(str(s) for s in current_skills)
         
         # Determine relevant skill category
         relevant_category = SkillGapAnalyzer._find_relevant_category(career_goal)
@@ -90,14 +92,12 @@ class SkillGapAnalyzer:
             
             # Find core skill gaps
             for skill_item in skills_map.get('core', []):
-                skill = skill_item['skill'].lower()
-                if not any(skill in str(s).lower() for s in current_skills):
+                if not held.has(skill_item['skill']):
                     gaps['core_gaps'].append(skill_item)
             
             # Find supporting skill gaps
             for skill_item in skills_map.get('supporting', []):
-                skill = skill_item['skill'].lower()
-                if not any(skill in str(s).lower() for s in current_skills):
+                if not held.has(skill_item['skill']):
                     gaps['supporting_gaps'].append(skill_item)
         
         gaps['summary'] = SkillGapAnalyzer._generate_gap_summary(gaps, profile)
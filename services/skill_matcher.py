@@ -0,0 +1,239 @@
+"""
+Aho-Corasick skill matcher shared by every resume analyzer.
+
+SKILL_LEXICON is the union of the keyword lists the analyzers used to scan
+one by one (parser, detailed analyzer, field configs, gap derivation, the
+quick-analysis endpoint).  A single automaton is compiled from it at
+import; find_skills() walks the text once and reports every whole-word
+match with its offsets, so detection cost is O(len(text) + matches)
+instead of O(keywords x text).
+
+Callers that only score a subset of skills pass a ``scope`` built with
+skill_scope(), which fails loudly at import if a term is missing from the
+lexicon rather than silently never matching.
+
+SkillProximityIndex answers "is an indicator word within N tokens of this
+skill" from token positions gathered in one pass, replacing per-skill
+``indicator.*skill`` regex scans.
+"""
+
+import re
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from services.field_config import FIELD_CONFIGS
+
+
+class SkillMatch(NamedTuple):
+    start: int
+    end: int
+    term: str  # lowercase lexicon term
+
+
+# Canonical lexicon: lowercase term -> category
+SKILL_LEXICON: Dict[str, str] = {}
+
+
+def _register(category: str, terms: Iterable[str]) -> None:
+    for term in terms:
+        SKILL_LEXICON.setdefault(term.lower(), category)
+
+
+_register('programming', [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'golang',
+    'rust', 'ruby', 'php', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'bash',
+])
+_register('web', [
+    'html', 'css', 'react', 'angular', 'vue', 'next', 'next.js', 'node',
+    'node.js', 'express', 'django', 'flask', 'spring', 'rails', 'laravel',
+    'asp.net', 'fastapi',
+])
+_register('data', [
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+    'database', 'pandas', 'numpy', 'spark', 'hadoop', 'kafka', 'excel',
+    'power bi', 'tableau', 'data analysis', 'data science', 'analytics',
+    'statistics', 'analysis',
+])
+_register('ml', [
+    'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'keras',
+    'scikit-learn', 'nltk', 'spacy', 'opencv', 'nlp', 'computer vision',
+    'ml', 'ai',
+])
+_register('devops', [
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
+    'jenkins', 'ci/cd', 'devops', 'linux',
+])
+_register('tools', [
+    'git', 'github', 'gitlab', 'jira', 'confluence', 'slack', 'figma',
+    'adobe', 'photoshop', 'illustrator', 'ui/ux',
+])
+_register('architecture', [
+    'rest', 'graphql', 'api', 'microservices', 'blockchain',
+])
+_register('soft', [
+    'leadership', 'communication', 'teamwork', 'problem solving',
+    'critical thinking', 'project management', 'agile', 'scrum',
+    'analytical', 'strategic thinking', 'negotiation', 'presentation',
+    'creativity', 'adaptability', 'time management', 'management',
+])
+
+# Every field's core/supporting keywords are matchable too
+for _config in FIELD_CONFIGS.values():
+    _register('field', _config.core_keywords)
+    _register('field', _config.supporting_keywords)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class AhoCorasick:
+    """Multi-pattern automaton over lowercase terms."""
+
+    def __init__(self, terms: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for term in terms:
+            self._add(term)
+        self._build_failure_links()
+
+    def _add(self, term: str) -> None:
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(term)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, term) for every occurrence, overlaps included."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for term in out[state]:
+                    yield i - len(term) + 1, i + 1, term
+
+    def find_words(self, haystack: str) -> List[SkillMatch]:
+        """
+        Whole-word matches in already-lowercased ``haystack``.
+
+        A term edge that is a word character must not touch another word
+        character in the text, so 'go' does not match inside 'good' while
+        'c++' and 'node.js' still match before punctuation.
+        """
+        size = len(haystack)
+        matches = []
+        for start, end, term in self.iter_matches(haystack):
+            if start > 0 and _is_word_char(term[0]) and _is_word_char(haystack[start - 1]):
+                continue
+            if end < size and _is_word_char(term[-1]) and _is_word_char(haystack[end]):
+                continue
+            matches.append(SkillMatch(start, end, term))
+        return matches
+
+    def count(self, haystack: str) -> int:
+        """Number of substring occurrences (no word-boundary check)."""
+        return sum(1 for _ in self.iter_matches(haystack))
+
+
+_AUTOMATON = AhoCorasick(SKILL_LEXICON)
+
+
+def find_skills(text: str, lowered: bool = False) -> List[SkillMatch]:
+    """Every whole-word lexicon match in ``text`` with offsets, in one pass."""
+    if not text:
+        return []
+    return _AUTOMATON.find_words(text if lowered else text.lower())
+
+
+def match_skills(text: str, scope: Optional[frozenset] = None, lowered: bool = False) -> List[str]:
+    """Distinct matched terms in order of first appearance, optionally limited to ``scope``."""
+    seen = {}
+    for match in find_skills(text, lowered=lowered):
+        if match.term not in seen and (scope is None or match.term in scope):
+            seen[match.term] = match.start
+    return list(seen)
+
+
+def skill_scope(terms: Iterable[str]) -> frozenset:
+    """Lowercased set of terms for ``scope=``; raises if any is not in SKILL_LEXICON."""
+    scope = frozenset(t.lower() for t in terms)
+    unknown = sorted(scope.difference(SKILL_LEXICON))
+    if unknown:
+        raise ValueError(f"Terms missing from SKILL_LEXICON: {', '.join(unknown)}")
+    return scope
+
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+class SkillProximityIndex:
+    """
+    Token positions of every word and every lexicon skill in one text.
+
+    Built in O(len(text)); each near() query is a linear merge of two
+    sorted position lists.
+    """
+
+    def __init__(self, text: str, lowered: bool = False, matches: Optional[List[SkillMatch]] = None):
+        haystack = text if lowered else text.lower()
+        token_starts = []
+        self._word_positions: Dict[str, List[int]] = {}
+        for index, token in enumerate(_TOKEN_RE.finditer(haystack)):
+            token_starts.append(token.start())
+            self._word_positions.setdefault(token.group(), []).append(index)
+
+        if matches is None:
+            matches = find_skills(haystack, lowered=True)
+        # Skill span in token indices; 'c++' covers the token 'c'
+        self._skill_spans: Dict[str, List[tuple]] = {}
+        for match in matches:
+            first = bisect_right(token_starts, match.start) - 1
+            last = bisect_right(token_starts, match.end - 1) - 1
+            self._skill_spans.setdefault(match.term, []).append((max(first, 0), max(last, 0)))
+
+    def word_positions(self, words: Iterable[str]) -> List[int]:
+        """Sorted token indices of any of ``words`` (single lowercase words)."""
+        positions = []
+        for word in words:
+            positions.extend(self._word_positions.get(word, ()))
+        positions.sort()
+        return positions
+
+    def near(self, skill: str, positions: List[int], window: int) -> bool:
+        """True if any occurrence of ``skill`` has a position within ``window`` tokens."""
+        spans = self._skill_spans.get(skill.lower())
+        if not spans or not positions:
+            return False
+        j = 0
+        for first, last in spans:  # spans and positions both ascend
+            while j < len(positions) and positions[j] < first - window:
+                j += 1
+            if j == len(positions):
+                return False
+            if positions[j] <= last + window:
+                return True
+        return False
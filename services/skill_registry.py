@@ -0,0 +1,326 @@
+"""
+Canonical skill registry.
+
+Every skill spelling the app knows about maps to one integer ID:
+'node', 'Node.js' and 'nodejs' are all NODE_JS; 'Version Control (Git)'
+resolves to GIT.  Aliases live in a token trie built once at import from
+CANONICAL_SKILLS plus every SKILL_LEXICON term, so normalising a string is
+one longest-match walk over its tokens.
+
+Consumers turn skill lists into a SkillSet once, at ingestion, and then
+answer "does the user have X" with set operations on IDs instead of
+scanning every user skill with ``in`` for every required skill.
+
+Token runs that match no alias (e.g. 'fundamentals' in 'Programming
+Fundamentals') get a stable per-process ID derived from the text, so
+unknown skills still compare equal to themselves.  Those IDs are negative
+and never persisted; store display names, not IDs.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from services.skill_matcher import SKILL_LEXICON
+
+# Display name -> extra aliases (the display name is always an alias)
+CANONICAL_SKILLS = {
+    'Python': ['python programming', 'python3'],
+    'Java': [],
+    'JavaScript': ['js', 'ecmascript', 'es6'],
+    'TypeScript': ['ts'],
+    'C++': ['cpp'],
+    'C#': ['csharp', 'c sharp'],
+    'Go': ['golang'],
+    'R': [],
+    'SQL': [],
+    'PHP': [],
+    'MATLAB': [],
+    'HTML': ['html5'],
+    'CSS': ['css3'],
+    'React': ['react.js', 'reactjs'],
+    'Vue': ['vue.js', 'vuejs'],
+    'Angular': ['angularjs', 'angular.js'],
+    'Next.js': ['next', 'nextjs'],
+    'Node.js': ['node', 'nodejs'],
+    'Express': ['express.js', 'expressjs'],
+    'Django': [],
+    'Flask': [],
+    'FastAPI': [],
+    'Spring': ['spring boot'],
+    'Rails': ['ruby on rails'],
+    'ASP.NET': [],
+    'PostgreSQL': ['postgres'],
+    'MySQL': [],
+    'MongoDB': ['mongo'],
+    'Redis': [],
+    'Elasticsearch': ['elastic search'],
+    'Databases': ['database', 'dbms'],
+    'Power BI': ['powerbi'],
+    'Excel': ['microsoft excel', 'ms excel'],
+    'NumPy': [],
+    'Pandas': [],
+    'Scikit-learn': ['sklearn', 'scikit learn'],
+    'TensorFlow': [],
+    'PyTorch': [],
+    'Keras': [],
+    'NLTK': [],
+    'spaCy': [],
+    'OpenCV': [],
+    'XGBoost': [],
+    'MLflow': [],
+    'Machine Learning': ['ml'],
+    'Deep Learning': [],
+    'AI': ['artificial intelligence'],
+    'NLP': ['natural language processing'],
+    'Computer Vision': [],
+    'Data Science': [],
+    'Data Analysis': ['data analytics'],
+    'Statistics': ['stats'],
+    'AWS': ['amazon web services'],
+    'Azure': ['microsoft azure'],
+    'GCP': ['google cloud', 'google cloud platform'],
+    'Docker': [],
+    'Kubernetes': ['k8s'],
+    'Terraform': [],
+    'CI/CD': ['ci cd', 'cicd', 'continuous integration'],
+    'DevOps': [],
+    'Linux': [],
+    'Git': ['version control'],
+    'GitHub': [],
+    'GitLab': [],
+    'REST APIs': ['rest', 'rest api', 'restful', 'restful api'],
+    'GraphQL': [],
+    'gRPC': [],
+    'APIs': ['api'],
+    'Microservices': ['microservice architecture'],
+    'Data Structures & Algorithms': ['dsa', 'data structures and algorithms', 'data structures'],
+    'System Design': [],
+    'UI/UX': ['ux/ui', 'ui ux'],
+    'User Experience (UX)': ['user experience', 'ux', 'ux design'],
+    'User Interface (UI)': ['user interface', 'ui', 'ui design'],
+    'Figma': [],
+    'Adobe XD': [],
+    'JIRA': ['jira'],
+    'Agile': ['agile methodologies', 'agile methodology'],
+    'Scrum': [],
+    'Communication': ['communication skills'],
+    'Leadership': [],
+    'Problem Solving': ['problem-solving'],
+    'Project Management': [],
+    'SEO': ['search engine optimization'],
+    'A/B Testing': ['ab testing', 'split testing'],
+}
+
+# Tokens that join skills inside a phrase rather than name one
+_CONNECTORS = frozenset({'and', 'with', 'of', 'in', 'the', 'for'})
+_ALTERNATIVE = '/'
+
+# Words keep '.', '-', '+' and '#' ('node.js', 'scikit-learn', 'c++');
+# '/' and '&' are tokens of their own
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[.\-'][a-z0-9+#]+)*|[/&]")
+
+
+def _fold(token: str) -> str:
+    # Simple plural folding so 'databases' and 'database' share a token
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss') and token.isalpha():
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Normalised tokens of a skill string ('Node.js APIs' -> ('node.js', 'api'))."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        tokens.append('and' if token == '&' else _fold(token))
+    return tuple(tokens)
+
+
+class AliasTrie:
+    """Token trie from alias token sequences to skill IDs."""
+
+    __slots__ = ('_root',)
+
+    _ID = object()  # terminal marker key
+
+    def __init__(self):
+        self._root: Dict = {}
+
+    def add(self, tokens: Tuple[str, ...], skill_id: int) -> None:
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(self._ID, skill_id)
+
+    def get(self, tokens: Tuple[str, ...]) -> Optional[int]:
+        node = self._root
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(self._ID)
+
+    def longest(self, tokens: Tuple[str, ...], start: int) -> Tuple[Optional[int], int]:
+        """(skill ID, end index) of the longest alias starting at ``start``."""
+        node = self._root
+        best_id, best_end = None, start
+        for i in range(start, len(tokens)):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            if self._ID in node:
+                best_id, best_end = node[self._ID], i + 1
+        return best_id, best_end
+
+
+SKILL_NAMES: List[str] = []  # skill ID -> display name
+_TRIE = AliasTrie()
+
+
+def _display(term: str) -> str:
+    return ' '.join(word[:1].upper() + word[1:] for word in term.split(' '))
+
+
+def _register(name: str, aliases: Iterable[str] = ()) -> int:
+    tokens = tokenize(name)
+    skill_id = _TRIE.get(tokens)
+    if skill_id is None:
+        skill_id = len(SKILL_NAMES)
+        SKILL_NAMES.append(name)
+    for alias in (name, *aliases):
+        _TRIE.add(tokenize(alias), skill_id)
+    return skill_id
+
+
+for _name, _aliases in CANONICAL_SKILLS.items():
+    _register(_name, _aliases)
+for _term in SKILL_LEXICON:
+    _register(_display(_term))
+
+
+def _unknown_id(tokens: Tuple[str, ...]) -> int:
+    # Stable within the process, never collides with registry IDs (>= 0)
+    return -1 - (hash(' '.join(tokens)) & 0x3FFFFFFFFFFFFFFF)
+
+
+@lru_cache(maxsize=4096)
+def skill_alternatives(name: str) -> Tuple[FrozenSet[int], ...]:
+    """
+    Skill IDs named by ``name``, one set per '/'-separated alternative.
+
+    'JavaScript/TypeScript' -> ({JAVASCRIPT}, {TYPESCRIPT}); 'CI/CD' is a
+    single alias and stays whole; 'Statistics & Math' -> ({STATISTICS,
+    <math>},) since both parts are required.
+    """
+    tokens = tokenize(name)
+    whole = _TRIE.get(tokens)
+    if whole is not None:
+        return (frozenset((whole,)),)
+
+    alternatives, current, unknown = [], set(), []
+
+    def flush_unknown():
+        if unknown:
+            current.add(_unknown_id(tuple(unknown)))
+            unknown.clear()
+
+    i = 0
+    while i < len(tokens):
+        skill_id, end = _TRIE.longest(tokens, i)
+        if skill_id is not None:
+            flush_unknown()
+            current.add(skill_id)
+            i = end
+            continue
+        token = tokens[i]
+        if token == _ALTERNATIVE:
+            flush_unknown()
+            if current:
+                alternatives.append(frozenset(current))
+            current = set()
+        elif token in _CONNECTORS:
+            flush_unknown()
+        else:
+            unknown.append(token)
+        i += 1
+    flush_unknown()
+    if current:
+        alternatives.append(frozenset(current))
+    return tuple(alternatives)
+
+
+def skill_ids(name: str) -> FrozenSet[int]:
+    """Every skill ID mentioned in ``name``."""
+    return frozenset().union(*skill_alternatives(name)) if name else frozenset()
+
+
+def skill_id(name: str) -> Optional[int]:
+    """Registry ID when ``name`` is exactly one known skill, else None."""
+    ids = skill_ids(name)
+    if len(ids) == 1:
+        (only,) = ids
+        return only if only >= 0 else None
+    return None
+
+
+def canonical_name(name: str) -> str:
+    """Display spelling for a known skill ('ci/cd' -> 'CI/CD'), else ``name`` stripped."""
+    found = skill_id(name)
+    return SKILL_NAMES[found] if found is not None else name.strip()
+
+
+class SkillSet:
+    """
+    A user's skills normalised to IDs once, for repeated membership checks.
+
+    has(req): the user holds every ID of some alternative of ``req``.
+    related(req): held skills that cover ``req`` or are part of it, the
+    ID form of the old two-way ``a in b or b in a`` substring check.
+    """
+
+    __slots__ = ('skills', 'ids', '_by_id')
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills: List[str] = []
+        self._by_id: Dict[int, List[Tuple[str, FrozenSet[int]]]] = {}
+        ids = set()
+        for skill in skills or ():
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            held = skill_ids(skill)
+            if not held:
+                continue
+            self.skills.append(skill)
+            ids.update(held)
+            for held_id in held:
+                self._by_id.setdefault(held_id, []).append((skill, held))
+        self.ids: FrozenSet[int] = frozenset(ids)
+
+    def __contains__(self, requirement: str) -> bool:
+        return self.has(requirement)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def has(self, requirement: str) -> bool:
+        return any(alt <= self.ids for alt in skill_alternatives(requirement))
+
+    def related(self, requirement: str) -> List[str]:
+        found = {}
+        for alt in skill_alternatives(requirement):
+            covered = alt <= self.ids
+            for req_id in alt:
+                for skill, held in self._by_id.get(req_id, ()):
+                    if covered or held <= alt:
+                        found.setdefault(skill, None)
+        return list(found)
+
+    def relates(self, requirement: str) -> bool:
+        return bool(self.related(requirement))
+
+    def names(self) -> List[str]:
+        """Canonical display names, deduplicated by skill."""
+        seen = {}
+        for skill in self.skills:
+            seen.setdefault(skill_ids(skill), canonical_name(skill))
+        return list(seen.values())
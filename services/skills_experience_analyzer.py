@@ -6,12 +6,19 @@ Focuses on demonstrable proficiency and real-world impact.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Set
-from services.field_config import get_field_config
+from services.field_registry import get_compiled_field
+from services.skill_matcher import AhoCorasick, SkillProximityIndex, find_skills
+
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
 
 
 class SkillsAnalyzer:
-    """Analyzes skills based on field-specific requirements and depth indicators."""
+    """
+    Analyzes skills based on field-specific requirements and depth indicators.
+    Stateless per resume; get_skills_analyzer() returns a shared instance.
+    """
     
     # Proficiency indicators
     PROFICIENCY_MARKERS = {
@@ -27,8 +34,13 @@ class SkillsAnalyzer:
         r'(\d+)\s*months?'
     ]
     
+    # Project verbs that count as evidence when close to a skill
+    PROJECT_INDICATORS = ['built', 'developed', 'designed', 'implemented', 'architected']
+    EVIDENCE_WINDOW = 12  # tokens, roughly one resume bullet
+    
     def __init__(self, field_key: str, experience_level: str):
-        self.field_config = get_field_config(field_key)
+        self.field = get_compiled_field(field_key)
+        self.field_config = self.field.config
         self.experience_level = experience_level
     
     def analyze(self, resume_text: str, skills_list: List[str]) -> Dict:
@@ -52,15 +64,18 @@ class SkillsAnalyzer:
         """
         text_lower = resume_text.lower()
         skills_lower = [s.lower() for s in skills_list]
+        # Whole-word skill hits from a single automaton pass
+        skill_hits = find_skills(text_lower, lowered=True)
+        text_skills = {hit.term for hit in skill_hits}
         
         # Analyze core skills coverage
-        core_coverage, core_found = self._analyze_core_skills(text_lower, skills_lower)
+        core_coverage, core_found = self._analyze_core_skills(text_skills, skills_lower)
         
         # Analyze skill depth
-        depth_score = self._analyze_skill_depth(resume_text, core_found)
+        depth_score = self._analyze_skill_depth(resume_text, core_found, skill_hits)
         
         # Analyze supporting skills
-        supporting_score = self._analyze_supporting_skills(text_lower, skills_lower)
+        supporting_score = self._analyze_supporting_skills(text_skills, skills_lower)
         
         # Analyze recency
         recency_score = self._analyze_skill_recency(resume_text, core_found)
@@ -97,14 +112,14 @@ class SkillsAnalyzer:
         }
     
     def _analyze_core_skills(
-        self, text_lower: str, skills_lower: List[str]
+        self, text_skills: Set[str], skills_lower: List[str]
     ) -> Tuple[float, Set[str]]:
         """Analyze coverage of core skills for the field."""
-        core_keywords = self.field_config.core_keywords
+        core_keywords = self.field.core_keywords
         core_found = set()
         
         for keyword in core_keywords:
-            if keyword in text_lower or keyword in skills_lower:
+            if keyword in text_skills or keyword in skills_lower:
                 core_found.add(keyword)
         
         coverage = (len(core_found) / len(core_keywords)) * 100 if core_keywords else 0
@@ -117,7 +132,7 @@ class SkillsAnalyzer:
         
         return coverage, core_found
     
-    def _analyze_skill_depth(self, text: str, core_skills: Set[str]) -> int:
+    def _analyze_skill_depth(self, text: str, core_skills: Set[str], skill_hits=None) -> int:
         """Analyze depth of skill proficiency based on context."""
         if not core_skills:
             return 0
@@ -148,14 +163,12 @@ class SkillsAnalyzer:
                 elif years >= 1:
                     depth_score += 5
         
-        # Check for project-based evidence
-        project_indicators = ['built', 'developed', 'designed', 'implemented', 'architected']
-        for skill in list(core_skills)[:10]:  # Check top skills
-            for indicator in project_indicators:
-                pattern = f'{indicator}.*{skill}|{skill}.*{indicator}'
-                if re.search(pattern, text_lower):
-                    depth_score += 3
-                    break
+        # Check for project-based evidence: a project verb near the skill
+        evidence = SkillProximityIndex(text_lower, lowered=True, matches=skill_hits)
+        indicator_positions = evidence.word_positions(self.PROJECT_INDICATORS)
+        for skill in sorted(core_skills)[:10]:  # Check top skills
+            if evidence.near(skill, indicator_positions, self.EVIDENCE_WINDOW):
+                depth_score += 3
         
         # Check for certifications
         cert_pattern = r'certified|certification|certificate'
@@ -165,14 +178,14 @@ class SkillsAnalyzer:
         return min(100, depth_score)
     
     def _analyze_supporting_skills(
-        self, text_lower: str, skills_lower: List[str]
+        self, text_skills: Set[str], skills_lower: List[str]
     ) -> int:
         """Analyze supporting skills that complement core skills."""
-        supporting_keywords = self.field_config.supporting_keywords
+        supporting_keywords = self.field.supporting_keywords
         supporting_found = 0
         
         for keyword in supporting_keywords:
-            if keyword in text_lower or keyword in skills_lower:
+            if keyword in text_skills or keyword in skills_lower:
                 supporting_found += 1
         
         coverage = (supporting_found / len(supporting_keywords)) * 100 if supporting_keywords else 0
@@ -184,8 +197,7 @@ class SkillsAnalyzer:
             return 50  # Neutral score
         
         # Extract years from experience section
-        year_pattern = r'\b(20\d{2})\b'
-        years = [int(y) for y in re.findall(year_pattern, text)]
+        years = [int(y) for y in _YEAR_RE.findall(text)]
         
         if not years:
             return 50  # Cannot determine
@@ -205,12 +217,12 @@ class SkillsAnalyzer:
     
     def _identify_missing_core_skills(self, core_found: Set[str]) -> List[str]:
         """Identify important missing core skills."""
-        all_core = self.field_config.core_keywords
+        all_core = self.field.core_keywords
         missing = all_core - core_found
         
         # Return top 5 most important missing skills
         # In a real system, this would be ranked by job posting frequency
-        return list(missing)[:5]
+        return sorted(missing)[:5]
     
     def _identify_strengths(
         self, core_coverage: float, depth_score: int, core_found: Set[str]
@@ -264,7 +276,10 @@ class SkillsAnalyzer:
 
 
 class ExperienceAnalyzer:
-    """Analyzes work experience quality and relevance."""
+    """
+    Analyzes work experience quality and relevance.
+    Stateless per resume; get_experience_analyzer() returns a shared instance.
+    """
     
     # Strong action verbs by category
     ACTION_VERBS = {
@@ -290,8 +305,19 @@ class ExperienceAnalyzer:
         r'\d+\s*(hours|days|weeks|months)',  # Time savings
     ]
     
+    # Compiled once: metric regexes, one alternation for every strong verb,
+    # and a substring automaton for the weak phrases
+    _METRIC_RES = [re.compile(p, re.IGNORECASE) for p in METRIC_PATTERNS]
+    _ACTION_VERB_RE = re.compile(
+        r'\b(?:' + '|'.join(v for verbs in ACTION_VERBS.values() for v in verbs) + r')\b',
+        re.IGNORECASE
+    )
+    _WEAK_VERBS = AhoCorasick(WEAK_VERBS)
+    _TITLE_RE = re.compile(r'([A-Z][a-z]+\s+)*(?:Engineer|Developer|Manager|Designer|Analyst|Scientist|Lead|Senior|Junior|Associate)')
+    
     def __init__(self, field_key: str, experience_level: str):
-        self.field_config = get_field_config(field_key)
+        self.field = get_compiled_field(field_key)
+        self.field_config = self.field.config
         self.experience_level = experience_level
     
     def analyze(self, resume_text: str) -> Dict:
@@ -355,8 +381,8 @@ class ExperienceAnalyzer:
             return 30  # Partial credit if section not clearly identified
         
         # Count relevant keywords in experience
-        relevant_keywords = self.field_config.core_keywords
-        keyword_count = sum(1 for keyword in relevant_keywords if keyword in exp_section)
+        relevant_keywords = self.field.core_keywords
+        keyword_count = len(self.field.keyword_hits(exp_section).core)
         
         # Score based on keyword density
         keyword_density = keyword_count / len(relevant_keywords) if relevant_keywords else 0
@@ -384,10 +410,7 @@ class ExperienceAnalyzer:
         score = 0
         
         # Check for quantified achievements
-        metric_count = 0
-        for pattern in self.METRIC_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            metric_count += len(matches)
+        metric_count = sum(len(pattern.findall(text)) for pattern in self._METRIC_RES)
         
         # Score based on metric frequency
         if metric_count >= 10:
@@ -400,10 +423,8 @@ class ExperienceAnalyzer:
             score += 10
         
         # Check for strong action verbs
-        strong_verb_count = 0
-        for category, verbs in self.ACTION_VERBS.items():
-            for verb in verbs:
-                strong_verb_count += len(re.findall(r'\b' + verb + r'\b', text, re.IGNORECASE))
+        text_lower = text.lower()
+        strong_verb_count = len(self._ACTION_VERB_RE.findall(text))
         
         if strong_verb_count >= 15:
             score += 30
@@ -413,19 +434,12 @@ class ExperienceAnalyzer:
             score += 10
         
         # Penalize weak verbs
-        weak_verb_count = sum(
-            len(re.findall(verb, text, re.IGNORECASE))
-            for verb in self.WEAK_VERBS
-        )
+        weak_verb_count = self._WEAK_VERBS.count(text_lower)
         if weak_verb_count > 5:
             score -= 10
         
         # Check for field-specific impact metrics
-        impact_metrics = self.field_config.impact_metrics
-        impact_metric_count = sum(
-            1 for metric in impact_metrics
-            if metric.lower() in text.lower()
-        )
+        impact_metric_count = len(self.field.impact_metrics_found(text_lower))
         if impact_metric_count >= 3:
             score += 20
         elif impact_metric_count >= 1:
@@ -436,8 +450,7 @@ class ExperienceAnalyzer:
     def _analyze_career_progression(self, text: str) -> int:
         """Analyze career growth and progression."""
         # Extract job titles and years
-        title_pattern = r'([A-Z][a-z]+\s+)*(?:Engineer|Developer|Manager|Designer|Analyst|Scientist|Lead|Senior|Junior|Associate)'
-        titles = re.findall(title_pattern, text)
+        titles = self._TITLE_RE.findall(text)
         
         if len(titles) < 2:
             return 50  # Cannot assess progression with < 2 roles
@@ -464,8 +477,7 @@ class ExperienceAnalyzer:
     def _analyze_relevance(self, text: str) -> int:
         """Analyze recency and relevance of experience."""
         # Extract years
-        year_pattern = r'\b(20\d{2})\b'
-        years = [int(y) for y in re.findall(year_pattern, text)]
+        years = [int(y) for y in _YEAR_RE.findall(text)]
         
         if not years:
             return 50  # Cannot determine
@@ -536,10 +548,7 @@ class ExperienceAnalyzer:
                 "Add specific metrics to quantify your impact (e.g., '40% faster', '2M users', '$500K saved')"
             )
             
-            weak_verb_count = sum(
-                len(re.findall(verb, text, re.IGNORECASE))
-                for verb in self.WEAK_VERBS
-            )
+            weak_verb_count = self._WEAK_VERBS.count(text.lower())
             if weak_verb_count > 3:
                 improvements.append(
                     "Replace weak phrases like 'responsible for' with strong action verbs like 'led', 'built', 'optimized'"
@@ -559,3 +568,15 @@ class ExperienceAnalyzer:
             )
         
         return improvements
+
+
+@lru_cache(maxsize=64)
+def get_skills_analyzer(field_key: str = 'software_backend', experience_level: str = 'mid') -> SkillsAnalyzer:
+    """Shared, stateless SkillsAnalyzer for a field and experience level."""
+    return SkillsAnalyzer(field_key, experience_level)
+
+
+@lru_cache(maxsize=64)
+def get_experience_analyzer(field_key: str = 'software_backend', experience_level: str = 'mid') -> ExperienceAnalyzer:
+    """Shared, stateless ExperienceAnalyzer for a field and experience level."""
+    return ExperienceAnalyzer(field_key, experience_level)
@@ -0,0 +1,291 @@
+"""
+Content-fingerprinted static asset URLs.
+
+At startup every file under static/ is hashed into a manifest
+('css/career_ai.css' -> 'css/career_ai.3f2a9c1b0d.css').  A url_defaults
+hook rewrites ``url_for('static', filename=...)`` to the hashed name, so
+templates need no changes, and the static view maps hashed names back to
+the real file and serves them with ``Cache-Control: public,
+max-age=STATIC_MAX_AGE, immutable``.  A changed file gets a new hash and
+therefore a new URL, so browsers never need to revalidate.
+
+Unhashed paths (e.g. the relative ``@import`` in style.css, or old links)
+are still served, with ``no-cache`` so they revalidate.  With app.debug
+on, a file whose mtime changed is re-hashed when its URL is next built.
+
+Text assets are also precompressed once into ``.gz`` (and ``.br`` when the
+optional ``brotli`` package is installed) siblings next to the source, at
+startup or offline.  The static view negotiates Accept-Encoding and sends
+the sibling as-is with Content-Encoding, Vary and its real Content-Length,
+so no request spends CPU compressing.  Siblings are rebuilt whenever they
+are older than their source (at startup, and in debug when a file is
+re-hashed); a sibling older than its source is never sent.
+
+Static requests never read or save the session (before_request skips
+them and the session interface does not save for them), so a publicly
+cacheable asset never carries Set-Cookie or Vary: Cookie.
+
+    python -m services.static_assets               # print the manifest
+    python -m services.static_assets --compress    # (re)write .gz/.br siblings
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import Dict, FrozenSet, Tuple
+
+from config import STATIC_FINGERPRINT, STATIC_MAX_AGE, STATIC_PRECOMPRESS
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+_HASH_LENGTH = 10
+
+# Only text formats shrink; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = frozenset({'.css', '.js', '.svg', '.json', '.html', '.txt', '.map'})
+COMPRESS_MIN_BYTES = 512
+# Encodings in server preference order -> sibling suffix
+_ENCODING_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+_SIBLING_SUFFIXES = tuple(suffix for _, suffix in _ENCODING_SUFFIXES)
+
+_manifest: Dict[str, str] = {}        # real path -> hashed path
+_reverse: Dict[str, str] = {}         # hashed path -> real path
+_mtimes: Dict[str, float] = {}
+_encodings: Dict[str, FrozenSet[str]] = {}  # real path -> precompressed encodings on disk
+_lock = threading.Lock()
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:_HASH_LENGTH]
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    """'js/app-state.js' + digest -> 'js/app-state.<digest>.js'."""
+    root, ext = os.path.splitext(filename)
+    return f'{root}.{digest}{ext}'
+
+
+def _fingerprint(static_folder: str, filename: str) -> Tuple[str, float]:
+    path = os.path.join(static_folder, filename)
+    return hashed_name(filename, _file_hash(path)), os.path.getmtime(path)
+
+
+def build_manifest(static_folder: str) -> Dict[str, str]:
+    """Hash every file under ``static_folder``; keys and values use '/' separators."""
+    manifest = {}
+    for directory, _, files in os.walk(static_folder):
+        for name in files:
+            if name.startswith('.') or name.endswith(_SIBLING_SUFFIXES):
+                continue
+            relative = os.path.relpath(os.path.join(directory, name), static_folder).replace(os.sep, '/')
+            manifest[relative], _ = _fingerprint(static_folder, relative)
+    return dict(sorted(manifest.items()))
+
+
+def _load(static_folder: str) -> None:
+    manifest = build_manifest(static_folder)
+    with _lock:
+        _manifest.clear()
+        _manifest.update(manifest)
+        _reverse.clear()
+        _reverse.update({hashed: real for real, hashed in manifest.items()})
+        _mtimes.clear()
+        _mtimes.update({real: os.path.getmtime(os.path.join(static_folder, real)) for real in manifest})
+
+
+def _refresh_if_modified(static_folder: str, filename: str) -> None:
+    path = os.path.join(static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return
+    if _mtimes.get(filename) == mtime:
+        return
+    hashed, mtime = _fingerprint(static_folder, filename)
+    encodings = _precompress_file(static_folder, filename, _compressors()) if STATIC_PRECOMPRESS else None
+    with _lock:
+        _manifest[filename] = hashed
+        _reverse[hashed] = filename
+        _mtimes[filename] = mtime
+        if encodings:
+            _encodings[filename] = encodings
+        else:
+            _encodings.pop(filename, None)
+
+
+def get_manifest() -> Dict[str, str]:
+    with _lock:
+        return dict(_manifest)
+
+
+def _compressors():
+    compressors = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if BROTLI_AVAILABLE:
+        compressors['br'] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as handle:
+        handle.write(data)
+    os.replace(tmp, path)
+
+
+def _sibling_is_fresh(source: str, sibling: str) -> bool:
+    try:
+        return os.path.getmtime(sibling) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+def _precompress_file(static_folder: str, relative: str, compressors, force: bool = False) -> FrozenSet[str]:
+    """(Re)write the siblings of one asset; returns the encodings now on disk."""
+    if os.path.splitext(relative)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return frozenset()
+    path = os.path.join(static_folder, relative)
+    data = None
+    encodings = set()
+    for encoding, suffix in _ENCODING_SUFFIXES:
+        sibling = path + suffix
+        if _sibling_is_fresh(path, sibling) and not force:
+            encodings.add(encoding)
+            continue
+        if encoding not in compressors:
+            continue
+        if data is None:
+            with open(path, 'rb') as handle:
+                data = handle.read()
+        compressed = compressors[encoding](data) if len(data) >= COMPRESS_MIN_BYTES else None
+        if compressed is not None and len(compressed) < len(data):
+            try:
+                _write_atomic(sibling, compressed)
+                encodings.add(encoding)
+            except OSError as e:
+                print(f"Could not write {sibling}: {e}")
+        elif os.path.exists(sibling):
+            os.remove(sibling)
+    return frozenset(encodings)
+
+
+def precompress(static_folder: str, force: bool = False) -> Dict[str, FrozenSet[str]]:
+    """
+    Write .gz/.br siblings for compressible assets that lack an up-to-date one.
+
+    A sibling is only kept when it is smaller than the source.  Returns the
+    encodings available on disk per asset.
+    """
+    compressors = _compressors()
+    available = {}
+    for directory, _, files in os.walk(static_folder):
+        for name in files:
+            if name.startswith('.'):
+                continue
+            relative = os.path.relpath(os.path.join(directory, name), static_folder).replace(os.sep, '/')
+            encodings = _precompress_file(static_folder, relative, compressors, force)
+            if encodings:
+                available[relative] = encodings
+    with _lock:
+        _encodings.clear()
+        _encodings.update(available)
+    return available
+
+
+def _negotiate(request, static_folder: str, real: str):
+    """(encoding, sibling suffix) to send for ``real``, or (None, None)."""
+    on_disk = _encodings.get(real)
+    if not on_disk:
+        return None, None
+    accepted = request.accept_encodings
+    path = os.path.join(static_folder, real)
+    for encoding, suffix in _ENCODING_SUFFIXES:
+        # A sibling older than its source (file edited since) would send stale bytes
+        if encoding in on_disk and accepted[encoding] > 0 and _sibling_is_fresh(path, path + suffix):
+            return encoding, suffix
+    return None, None
+
+
+def _skip_static_sessions(app) -> None:
+    """Keep the session cookie (refreshed on every request) off static responses."""
+    from flask import request
+
+    class StaticlessSessionInterface(type(app.session_interface)):
+        def save_session(self, app, session, response):
+            if request.endpoint == 'static':
+                return None
+            return super().save_session(app, session, response)
+
+    app.session_interface = StaticlessSessionInterface()
+
+
+def init_static_assets(app) -> None:
+    """Build the manifest and precompressed siblings, and wire the static view to them."""
+    from flask import request, send_from_directory
+
+    _skip_static_sessions(app)
+    if not (STATIC_FINGERPRINT or STATIC_PRECOMPRESS):
+        return
+    if not app.static_folder or not os.path.isdir(app.static_folder):
+        return
+
+    if STATIC_FINGERPRINT:
+        _load(app.static_folder)
+
+        @app.url_defaults
+        def _fingerprint_static_url(endpoint, values):
+            if endpoint != 'static' or 'filename' not in values:
+                return
+            filename = values['filename']
+            if app.debug:
+                _refresh_if_modified(app.static_folder, filename)
+            values['filename'] = _manifest.get(filename, filename)
+        print(f"✓ Fingerprinted {len(_manifest)} static assets")
+
+    if STATIC_PRECOMPRESS:
+        precompress(app.static_folder)
+        print(f"✓ Precompressed {len(_encodings)} static assets"
+              f" ({'gzip, br' if BROTLI_AVAILABLE else 'gzip'})")
+
+    def serve_static(filename):
+        real = _reverse.get(filename)
+        immutable = real is not None
+        real = real or filename
+        max_age = STATIC_MAX_AGE if immutable else None
+
+        encoding, suffix = _negotiate(request, app.static_folder, real)
+        if encoding:
+            response = send_from_directory(
+                app.static_folder, real + suffix, max_age=max_age,
+                mimetype=mimetypes.guess_type(real)[0] or 'application/octet-stream',
+            )
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = send_from_directory(app.static_folder, real, max_age=max_age)
+        if real in _encodings:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = (
+            f'public, max-age={STATIC_MAX_AGE}, immutable' if immutable else 'no-cache'
+        )
+        return response
+
+    app.view_functions['static'] = serve_static
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+    static_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+    if '--compress' in sys.argv:
+        written = precompress(static_folder, force=True)
+        print(json.dumps({name: sorted(encodings) for name, encodings in sorted(written.items())}, indent=2))
+    else:
+        print(json.dumps(build_manifest(static_folder), indent=2))
@@ -0,0 +1,108 @@
+"""
+Materialized per-user app state behind /api/app-state.
+
+Building the app state costs get_user_profile (user, onboarding, stats,
+skill progress and resume queries plus JSON decoding) and a
+generate_roadmap call.  The result is stored as one JSON row per user in
+user_snapshot, so a dashboard load is a single primary-key read.
+
+Write paths that change anything in the snapshot call invalidate() inside
+their own transaction; it only flips the row's stale flag.  The next read
+(or the debounced refresh in data_sync) rebuilds the row.  ``version``
+increases only when the rebuilt payload actually differs, and the ETag is
+a hash of the payload, so clients revalidating with If-None-Match get a
+304 until something they can see changes.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+SNAPSHOT_UPSERT_SQL = '''
+    INSERT INTO user_snapshot (user_id, version, etag, payload, stale, updated_at)
+    VALUES (?, 1, ?, ?, 0, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        version = user_snapshot.version + (user_snapshot.etag != excluded.etag),
+        etag = excluded.etag,
+        payload = excluded.payload,
+        stale = 0,
+        updated_at = excluded.updated_at
+'''
+
+
+def build_app_state(user_id, profile: Optional[Dict] = None) -> Dict:
+    """The app state as /api/app-state has always returned it."""
+    from services.profile_service import get_user_profile
+    from services.roadmap_service import generate_roadmap
+
+    profile = profile or get_user_profile(user_id)
+    try:
+        roadmap = generate_roadmap(profile['profile'], profile['stats'])
+    except Exception:
+        roadmap = []
+
+    return {
+        'user': profile['user'],
+        'profile': profile['profile'],
+        'stats': profile['stats'],
+        'skills': profile['skills'],
+        'roadmap': {
+            'items': roadmap,
+        },
+    }
+
+
+def _encode(app_state: Dict) -> str:
+    return json.dumps(app_state, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _etag(payload: str) -> str:
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def invalidate(db, user_id) -> None:
+    """Mark the user's snapshot stale.  Runs in the caller's transaction; does not commit."""
+    if user_id is None:
+        return
+    db.execute('UPDATE user_snapshot SET stale = 1 WHERE user_id = ?', (str(user_id),))
+
+
+def rebuild(db, user_id, profile: Optional[Dict] = None) -> Dict:
+    """
+    Rebuild and store the user's snapshot.  Does not commit.
+
+    Returns {'version', 'etag', 'payload'}; ``payload`` is the JSON text.
+    """
+    payload = _encode(build_app_state(user_id, profile))
+    etag = _etag(payload)
+    db.execute(SNAPSHOT_UPSERT_SQL, (str(user_id), etag, payload, datetime.utcnow().isoformat()))
+    row = db.execute('SELECT version FROM user_snapshot WHERE user_id = ?', (str(user_id),)).fetchone()
+    return {'version': row['version'], 'etag': etag, 'payload': payload}
+
+
+def get_snapshot(db, user_id) -> Dict:
+    """
+    The user's current snapshot: one primary-key read when it is fresh,
+    otherwise a rebuild under BEGIN IMMEDIATE so no write can slip
+    between reading the sources and clearing the stale flag.
+    """
+    row = db.execute(
+        'SELECT version, etag, payload, stale FROM user_snapshot WHERE user_id = ?',
+        (str(user_id),)
+    ).fetchone()
+    if row and not row['stale']:
+        return {'version': row['version'], 'etag': row['etag'], 'payload': row['payload']}
+
+    owns_transaction = not db.in_transaction
+    if owns_transaction:
+        db.execute('BEGIN IMMEDIATE')
+    try:
+        snapshot = rebuild(db, user_id)
+        if owns_transaction:
+            db.commit()
+        return snapshot
+    except Exception:
+        if owns_transaction:
+            db.rollback()
+        raise